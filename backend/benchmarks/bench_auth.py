@@ -0,0 +1,48 @@
+"""Custo de autenticação por requisição: verificação completa do JWT vs cache de tokens verificados
+
+Uso (a partir de backend/): python -m benchmarks.bench_auth
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+from fastapi.security import HTTPAuthorizationCredentials
+from core.security.jwt_handler import JWTHandler
+from core.security.auth_middleware import get_current_user, token_cache
+
+async def per_request_us(credentials: list[HTTPAuthorizationCredentials], rounds: int, cached: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for creds in credentials:
+            if not cached:
+                token_cache.clear()
+            await get_current_user(creds)
+    return (time.perf_counter() - started) / (rounds * len(credentials)) * 1e6
+
+async def run(users: int, rounds: int) -> None:
+    credentials = [
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=JWTHandler.create_access_token({"sub": f"user{i}"}))
+        for i in range(users)
+    ]
+    # clear() também entra na medição sem cache; é desprezível perto da verificação
+    uncached = await per_request_us(credentials, rounds, cached=False)
+    token_cache.clear()
+    await per_request_us(credentials, 1, cached=True)
+    cached = await per_request_us(credentials, rounds, cached=True)
+    print(f"{'mode':>10} {'us/request':>11}")
+    print(f"{'verify':>10} {uncached:>11.1f}")
+    print(f"{'cached':>10} {cached:>11.1f}")
+    print(f"speedup: {uncached / cached:.1f}x  cache: {token_cache.stats()}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.rounds))
+
+if __name__ == "__main__":
+    main()
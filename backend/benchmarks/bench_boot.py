@@ -0,0 +1,105 @@
+"""Cold start: tempo até o primeiro byte de GET / e até /ready responder 200, com BOOT_MODE eager vs lazy
+
+Cada rodada sobe um processo uvicorn novo (sobre o RTDB em memória) e mede a partir
+do spawn, incluindo interpretador e imports. Por padrão os artefatos do modelo são
+reaproveitados entre rodadas, como num redeploy; --no-artifacts força o treino no boot.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_boot
+    python -m benchmarks.bench_boot --no-artifacts --repeat 3
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url: str, deadline: float, accept_status: tuple[int, ...]) -> tuple[float, dict | None]:
+    """Faz polling até a URL responder com um dos status aceitos; retorna o instante e o corpo JSON"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            body, status = e.read(), e.code
+        except (ConnectionError, urllib.error.URLError, socket.timeout):
+            time.sleep(0.005)
+            continue
+        if status in accept_status:
+            return time.perf_counter(), json.loads(body)
+        time.sleep(0.01)
+    raise TimeoutError(url)
+
+def boot_once(mode: str, workdir: str, timeout: float) -> dict:
+    port = free_port()
+    env = {**os.environ, "BOOT_MODE": mode, "BENCH_WORKDIR": workdir, "LOG_LEVEL": "WARNING"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_boot", "--serve", "--port", str(port)], env=env
+    )
+    try:
+        deadline = started + timeout
+        # Qualquer resposta conta como primeiro byte: / não depende dos serviços
+        first_byte, _ = wait_for(f"http://127.0.0.1:{port}/", deadline, (200,))
+        ready_at, status = wait_for(f"http://127.0.0.1:{port}/ready", deadline, (200,))
+    finally:
+        process.terminate()
+        process.wait(timeout)
+    return {
+        "ttfb_seconds": first_byte - started,
+        "time_to_ready_seconds": ready_at - started,
+        "server_time_to_ready_seconds": status["time_to_ready_seconds"],
+        "warmup": status["durations_seconds"],
+    }
+
+def serve(port: int) -> None:
+    import uvicorn
+    from benchmarks.harness import build_app
+
+    app, _ = build_app()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["eager", "lazy"], choices=["eager", "lazy"])
+    parser.add_argument("--no-artifacts", action="store_true", help="diretório novo a cada rodada (treino no boot)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    shared_workdir = tempfile.mkdtemp(prefix="plenimind-boot-")
+    if not args.no_artifacts:
+        # Rodada de preparo: grava o artefato do modelo que as rodadas medidas vão carregar
+        boot_once("eager", shared_workdir, args.timeout)
+
+    print(f"{'mode':<6} {'ttfb_ms':>9} {'ready_ms':>9} {'server_ready_ms':>16}  warmup")
+    for mode in args.modes:
+        runs = []
+        for _ in range(args.repeat):
+            workdir = tempfile.mkdtemp(prefix="plenimind-boot-") if args.no_artifacts else shared_workdir
+            runs.append(boot_once(mode, workdir, args.timeout))
+        ttfb = statistics.median(run["ttfb_seconds"] for run in runs) * 1000
+        ready = statistics.median(run["time_to_ready_seconds"] for run in runs) * 1000
+        server_ready = statistics.median(run["server_time_to_ready_seconds"] for run in runs) * 1000
+        print(f"{mode:<6} {ttfb:>9.1f} {ready:>9.1f} {server_ready:>16.1f}  {runs[-1]['warmup']}")
+
+if __name__ == "__main__":
+    main()
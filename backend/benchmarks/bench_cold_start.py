@@ -0,0 +1,53 @@
+"""Tempo de inicialização do modelo: treino no boot vs carga do artefato salvo
+
+Uso (a partir de backend/): python -m benchmarks.bench_cold_start
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.harness import configure_env
+
+configure_env()
+
+import pandas as pd
+from core.config import DATA_PATH
+from core.ai.model import PanicDetectionModel
+from core.ai.artifacts import data_hash, artifact_path, save_model, load_model
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_PATH)
+
+    def train() -> PanicDetectionModel:
+        model = PanicDetectionModel(data=data)
+        model.start_model()
+        return model
+
+    with tempfile.TemporaryDirectory() as directory:
+        content_hash = data_hash(data, "batch")
+        path: Path = artifact_path(directory, content_hash)
+        save_model(train(), path, content_hash)
+
+        hash_ms = timed(lambda: data_hash(data, "batch"), args.repeat)
+        train_ms = timed(train, args.repeat)
+        load_ms = timed(lambda: load_model(path, data, content_hash), args.repeat)
+
+    print(f"rows:             {len(data)}")
+    print(f"train on boot:    {train_ms:8.2f} ms")
+    print(f"artifact load:    {load_ms:8.2f} ms (+ {hash_ms:.2f} ms data hash)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Vazão sob carga mista (bcrypt + I/O bloqueante + requisições leves), no event loop vs executores
+
+Além da vazão, mede o atraso do event loop: uma sonda agenda sleeps curtos e
+registra o quanto cada um atrasa, que é o tempo que qualquer outra requisição
+esperaria para ser atendida.
+Uso (a partir de backend/): python -m benchmarks.bench_concurrency
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+import bcrypt
+from core.executors import run_io, shutdown_executors
+from core.security.password import verify_password, verify_password_async
+
+HASHED = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=10)).decode("utf-8")
+
+def blocking_io(latency: float) -> None:
+    # Simula uma ida e volta síncrona ao Firebase
+    time.sleep(latency)
+
+async def inline_request(kind: str, latency: float) -> None:
+    if kind == "login":
+        verify_password("password123", HASHED)
+    elif kind == "io":
+        blocking_io(latency)
+    else:
+        await asyncio.sleep(0)
+
+async def offloaded_request(kind: str, latency: float) -> None:
+    if kind == "login":
+        await verify_password_async("password123", HASHED)
+    elif kind == "io":
+        await run_io(blocking_io, latency)
+    else:
+        await asyncio.sleep(0)
+
+async def probe_loop_lag(lags: list[float], stop: asyncio.Event, interval: float = 0.005) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run_load(handler, total: int, concurrency: int, latency: float) -> tuple[float, float]:
+    kinds = ["login", "io", "io", "light", "light", "light"]
+    semaphore = asyncio.Semaphore(concurrency)
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(lags, stop))
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await handler(kinds[i % len(kinds)], latency)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    return total / elapsed, percentile(lags, 0.99) * 1000
+
+async def main_async(args: argparse.Namespace) -> None:
+    # Aquece os pools para não medir a criação dos processos
+    await verify_password_async("password123", HASHED)
+    await run_io(blocking_io, 0)
+
+    for name, handler in (("inline", inline_request), ("offloaded", offloaded_request)):
+        for concurrency in args.concurrency:
+            rps, lag_p99 = await run_load(handler, args.requests, concurrency, args.io_latency)
+            print(f"{name:>9} concurrency={concurrency:<4} {rps:8.1f} req/s   event loop lag p99 {lag_p99:8.2f} ms")
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--io-latency", type=float, default=0.02)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        shutdown_executors()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Latência e vazão: RTDBConnector (firebase_admin) vs AsyncRTDBConnector contra o stand-in local
+
+Uso (a partir de backend/): python -m benchmarks.bench_connectors
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+from benchmarks.rtdb_http_stub import start_stub
+
+async def bench_async(url: str, total: int, concurrency: int) -> tuple[float, float]:
+    from core.db.async_connector import AsyncRTDBConnector
+    connector = AsyncRTDBConnector(url=url, credential=None, max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await connector.get_data(f"user_personal_data/user{i % 100}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    await connector.close_connection()
+    return total / elapsed, statistics.median(latencies) * 1000
+
+async def bench_sync(host: str, total: int, concurrency: int) -> tuple[float, float]:
+    # firebase_admin fala com o stand-in pelo modo emulador
+    os.environ["FIREBASE_DATABASE_EMULATOR_HOST"] = host
+    import firebase_admin
+    from core.db.connector import RTDBConnector
+    from core.executors import run_io, shutdown_executors
+
+    connector = RTDBConnector.__new__(RTDBConnector)
+    connector._url_db = f"http://{host}?ns=bench"
+    connector._app = firebase_admin.initialize_app(options={"databaseURL": connector._url_db}, name="bench")
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            # Direto no conector (via pool de I/O), sem o cache de leitura do DBService
+            await run_io(connector.get_data, f"user_personal_data/user{i % 100}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    connector.close_connection()
+    shutdown_executors()
+    return total / elapsed, statistics.median(latencies) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--latency", type=float, default=0.01, help="latência simulada do servidor (s)")
+    args = parser.parse_args()
+
+    server = start_stub(latency=args.latency)
+    host = f"127.0.0.1:{server.server_address[1]}"
+    for i in range(100):
+        server.RequestHandlerClass.tree.set(f"user_personal_data/user{i}", {"username": f"user{i}"})
+
+    for concurrency in args.concurrency:
+        rps, p50 = asyncio.run(bench_async(f"http://{host}", args.requests, concurrency))
+        print(f"async concurrency={concurrency:<4} {rps:8.1f} req/s  p50 {p50:7.2f} ms")
+    for concurrency in args.concurrency:
+        rps, p50 = asyncio.run(bench_sync(host, args.requests, concurrency))
+        print(f" sync concurrency={concurrency:<4} {rps:8.1f} req/s  p50 {p50:7.2f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
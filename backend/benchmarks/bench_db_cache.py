@@ -0,0 +1,66 @@
+"""Idas ao banco por requisição com e sem o cache de leitura do DBService
+
+Simula o padrão de acesso das rotas de dados vitais e de /users/me.
+Uso (a partir de backend/): python -m benchmarks.bench_db_cache
+"""
+import argparse
+import asyncio
+import random
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+from benchmarks.rtdb_memory import MemoryRTDBConnector
+from core.config import USER_PERSONAL_REF, USER_SENSOR_REF
+from core.executors import shutdown_executors
+import core.services.db_service as db_module
+
+async def simulate(service, users: int, requests: int, write_ratio: float) -> None:
+    rng = random.Random(0)
+    for _ in range(requests):
+        uid = f"user{rng.randrange(users)}"
+        roll = rng.random()
+        if roll < write_ratio:
+            # POST /vital-data/{uid}
+            await service.get_user(uid)
+            await service.update_vital(uid, {"heart_rate": rng.uniform(60, 120)})
+        elif roll < 0.6:
+            # GET /vital-data/{uid}
+            await service.get_user(uid)
+            await service.get_user_vital_data(uid)
+        else:
+            # GET /users/me
+            await service.get_user(uid)
+
+async def run(ttl: float, args: argparse.Namespace) -> None:
+    db_module.DB_CACHE_TTL_SECONDS = ttl
+    connector = MemoryRTDBConnector(latency=args.latency)
+    for i in range(args.users):
+        connector.tree.set(f"{USER_PERSONAL_REF}/user{i}", {"username": f"user{i}", "email": f"u{i}@x.com"})
+        connector.tree.set(f"{USER_SENSOR_REF}/user{i}", {"heart_rate": 70.0})
+    service = db_module.DBService(connector)
+    connector.reset_counters()
+
+    started = time.perf_counter()
+    await simulate(service, args.users, args.requests, args.write_ratio)
+    elapsed = time.perf_counter() - started
+    label = f"cache ttl={ttl:g}s" if ttl else "no cache"
+    print(f"{label:<16} {connector.round_trips / args.requests:5.2f} round trips/request  "
+          f"{elapsed / args.requests * 1000:6.2f} ms/request  {service.cache_stats()}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência simulada por chamada (s)")
+    args = parser.parse_args()
+    try:
+        for ttl in (0, 30):
+            asyncio.run(run(ttl, args))
+    finally:
+        shutdown_executors()
+
+if __name__ == "__main__":
+    main()
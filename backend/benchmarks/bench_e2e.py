@@ -0,0 +1,248 @@
+"""Suíte de benchmark ponta a ponta: a aplicação FastAPI em processo sobre o RTDB em memória
+
+Mede vazão e latência p50/p95/p99 de login, /ai/predict, /feedback/ e das rotas de
+dados vitais, além do tempo de retreino em função do tamanho do dataset. Os
+resultados vão para um JSON; --compare mostra a variação contra uma execução anterior.
+
+Uso (a partir de backend/):
+    python -m benchmarks.bench_e2e --output baseline.json
+    python -m benchmarks.bench_e2e --output current.json --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+# Retreino sem debounce para medir só o ajuste; logs por requisição fora da medição
+os.environ.setdefault("RETRAIN_DEBOUNCE_SECONDS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from benchmarks.harness import build_app, configure_env
+
+configure_env()
+
+import numpy as np
+import pandas as pd
+
+RequestFactory = Callable[[int], Awaitable["httpx.Response"]]
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+    }
+
+async def measure(request: RequestFactory, requests: int, concurrency: int) -> dict:
+    """Dispara `requests` chamadas com `concurrency` clientes simultâneos"""
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await request(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+def synthetic_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "heart_rate": rng.uniform(50, 160, rows),
+        "respiration_rate": rng.uniform(10, 35, rows),
+        "accel_std": rng.uniform(0, 3, rows),
+        "spo2": rng.uniform(85, 100, rows),
+        "stress_level": rng.uniform(0, 100, rows),
+    })
+    score = (data["heart_rate"] - 100) / 30 + (data["stress_level"] - 50) / 25 - (data["spo2"] - 93) / 4
+    data["panic_attack"] = (score + rng.normal(0, 0.5, rows) > 0).astype(int)
+    return data
+
+def reading(rng: random.Random) -> dict:
+    return {
+        "heart_rate": rng.uniform(60, 140),
+        "respiration_rate": rng.uniform(12, 30),
+        "accel_std": rng.uniform(0, 2),
+        "spo2": rng.uniform(90, 100),
+        "stress_level": rng.uniform(0, 100),
+    }
+
+async def seed_users(client, count: int) -> list[dict]:
+    users = []
+    for i in range(count):
+        credentials = {"email": f"bench{i}@example.com", "password": "benchmark1"}
+        created = await client.post("/users/", json={
+            **credentials, "username": f"bench{i}", "detection_time": "10:00:00", "emergency_contact": []
+        })
+        created.raise_for_status()
+        login = await client.post("/auth/login", json=credentials)
+        login.raise_for_status()
+        token = login.json()["access_token"]
+        users.append({
+            "uid": created.json()["uid"],
+            "credentials": credentials,
+            "headers": {"Authorization": f"Bearer {token}"},
+        })
+    return users
+
+async def route_scenarios(client, users: list[dict], args: argparse.Namespace) -> dict:
+    rng = random.Random(0)
+    history_from = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0).isoformat()
+
+    def user(i: int) -> dict:
+        return users[i % len(users)]
+
+    scenarios: dict[str, RequestFactory] = {
+        "login": lambda i: client.post("/auth/login", json=user(i)["credentials"]),
+        "ai_predict": lambda i: client.post("/ai/predict", json=reading(rng), headers=user(i)["headers"]),
+        "vital_post": lambda i: client.post(
+            f"/vital-data/{user(i)['uid']}", json=reading(rng), headers=user(i)["headers"]),
+        "vital_get": lambda i: client.get(f"/vital-data/{user(i)['uid']}", headers=user(i)["headers"]),
+        "vital_put": lambda i: client.put(
+            f"/vital-data/{user(i)['uid']}", json=reading(rng), headers=user(i)["headers"]),
+        "vital_history": lambda i: client.get(
+            f"/vital-data/{user(i)['uid']}/history", params={"from": history_from}, headers=user(i)["headers"]),
+        "feedback": lambda i: client.post("/feedback/", json={
+            "uid": user(i)["uid"], "features": reading(rng), "user_feedback": i % 2
+        }, headers=user(i)["headers"]),
+    }
+    results = {}
+    for name, request in scenarios.items():
+        # Login paga o bcrypt de propósito; menos repetições mantêm a suíte curta
+        requests = max(args.concurrency, args.requests // 10) if name == "login" else args.requests
+        results[name] = await measure(request, requests, args.concurrency)
+        print(f"{name:<14} {results[name]}")
+    return results
+
+async def retrain_scenarios(client, user: dict, sizes: list[int], workdir: str) -> list[dict]:
+    """Tempo entre o POST /feedback/ e o modelo novo estar em uso, para cada tamanho de dataset"""
+    import core.dependencies as dependencies
+    import core.services.ai_service as ai_module
+
+    rng = random.Random(1)
+    results = []
+    original_service = dependencies._ai_service
+    try:
+        for rows in sizes:
+            data_path = os.path.join(workdir, f"dataset-{rows}.csv")
+            synthetic_dataset(rows).to_csv(data_path, index=False)
+            ai_module.DATA_PATH = data_path
+            ai_module.FEEDBACK_LOG_PATH = os.path.join(workdir, f"feedback-{rows}.log.jsonl")
+            service = ai_module.AIService()
+            dependencies._ai_service = service
+            try:
+                timings = []
+                for label in (0, 1, 0):
+                    started = time.perf_counter()
+                    response = await client.post("/feedback/", json={
+                        "uid": user["uid"], "features": reading(rng), "user_feedback": label
+                    }, headers=user["headers"])
+                    response.raise_for_status()
+                    await asyncio.to_thread(service.wait_for_retrain)
+                    timings.append(time.perf_counter() - started)
+            finally:
+                service.close()
+            results.append({"rows": rows, "retrain_seconds": round(statistics.median(timings), 4)})
+            print(f"retrain rows={rows:<8} {results[-1]['retrain_seconds']:.3f} s")
+    finally:
+        dependencies._ai_service = original_service
+    return results
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\n{'scenario':<14} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, metrics in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p99_ms"):
+            before, after = previous[metric], metrics[metric]
+            change = (after - before) / before * 100 if before else float("nan")
+            print(f"{name:<14} {metric:<15} {before:>10.2f} {after:>10.2f} {change:>+7.1f}%")
+    previous_retrain = {item["rows"]: item for item in baseline.get("retrain", [])}
+    for item in current["retrain"]:
+        before = previous_retrain.get(item["rows"])
+        if before:
+            change = (item["retrain_seconds"] - before["retrain_seconds"]) / before["retrain_seconds"] * 100
+            print(f"{'retrain':<14} {str(item['rows']) + ' rows':<15} "
+                  f"{before['retrain_seconds']:>10.3f} {item['retrain_seconds']:>10.3f} {change:>+7.1f}%")
+
+async def run(args: argparse.Namespace) -> dict:
+    import httpx
+
+    app, _ = build_app(latency=args.latency)
+    transport = httpx.ASGITransport(app=app)
+    # O lifespan inicializa os serviços antes das requisições e os encerra no fim, como em produção
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            users = await seed_users(client, args.users)
+            scenarios = await route_scenarios(client, users, args)
+            with tempfile.TemporaryDirectory() as workdir:
+                retrain = await retrain_scenarios(client, users[0], args.dataset_sizes, workdir)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "db_latency_seconds": args.latency,
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "users": args.users,
+        },
+        "scenarios": scenarios,
+        "retrain": retrain,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.005, help="latência simulada por chamada ao RTDB (s)")
+    parser.add_argument("--requests", type=int, default=500, help="requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--dataset-sizes", type=int, nargs="+", default=[2_000, 20_000, 100_000])
+    parser.add_argument("--output", default="bench_e2e.json")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Memória por usuário e vazão do FeatureEngine com muitos usuários simultâneos
+
+Uso (a partir de backend/): python -m benchmarks.bench_feature_engine
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from core.ai.features import FeatureEngine
+
+FEATURE_ORDER = ["heart_rate", "respiration_rate", "accel_std", "spo2", "stress_level"]
+
+def synthetic_samples(count: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    columns = {
+        "heart_rate": rng.uniform(50, 160, count),
+        "respiration_rate": rng.uniform(10, 35, count),
+        "spo2": rng.uniform(85, 100, count),
+        "stress_level": rng.uniform(0, 100, count),
+        "accel_x": rng.normal(0, 1, count),
+        "accel_y": rng.normal(0, 1, count),
+        "accel_z": rng.normal(1, 1, count),
+    }
+    return [dict(zip(columns, values)) for values in zip(*(col.tolist() for col in columns.values()))]
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--window", type=int, default=60)
+    parser.add_argument("--min-samples", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=120, help="amostras por usuário")
+    args = parser.parse_args()
+
+    uids = [f"user-{i}" for i in range(args.users)]
+    samples = synthetic_samples(args.users)
+    engine = FeatureEngine(FEATURE_ORDER, window=args.window, min_samples=args.min_samples,
+                           max_users=args.users)
+
+    # Enche todas as janelas uma vez medindo a memória alocada
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(args.window):
+        for uid, sample in zip(uids, samples):
+            engine.push(uid, sample)
+    resident = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    emitted = 0
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for uid, sample in zip(uids, samples):
+            if engine.push(uid, sample) is not None:
+                emitted += 1
+    elapsed = time.perf_counter() - started
+    pushed = args.rounds * args.users
+
+    print(f"users={args.users} window={args.window}")
+    print(f"memory: {resident / 1e6:.1f} MB total, {resident / args.users:.0f} bytes/user")
+    print(f"push: {pushed / elapsed:,.0f} samples/s ({elapsed / pushed * 1e6:.2f} us/sample), "
+          f"{emitted:,} feature vectors")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Tempo de busca de duplicatas: FeatureIndex vs varredura linha a linha com apply
+
+Uso (a partir de backend/): python -m benchmarks.bench_feature_index
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from core.ai.feature_index import FeatureIndex
+
+COLUMNS = ["heart_rate", "respiration_rate", "accel_std", "spo2", "stress_level"]
+
+def synthetic_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "heart_rate": rng.uniform(50, 160, rows),
+        "respiration_rate": rng.uniform(10, 35, rows),
+        "accel_std": rng.uniform(0, 3, rows),
+        "spo2": rng.uniform(85, 100, rows),
+        "stress_level": rng.uniform(0, 100, rows),
+    })
+
+def apply_lookup(data: pd.DataFrame, features: dict) -> list[int]:
+    input_df = pd.DataFrame([features])
+    mask = data[list(features.keys())].apply(
+        lambda row: np.all(np.isclose(row.values, input_df.values[0], atol=1e-4)),
+        axis=1
+    )
+    return np.flatnonzero(mask.to_numpy()).tolist()
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--apply-max-rows", type=int, default=100_000,
+                        help="varredura com apply só é medida até este tamanho")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'build (s)':>10} {'index (us)':>11} {'apply (us)':>11}")
+    for size in args.sizes:
+        data = synthetic_data(size)
+        started = time.perf_counter()
+        index = FeatureIndex(COLUMNS)
+        index.add_many(data.to_numpy(), range(size))
+        build = time.perf_counter() - started
+
+        rng = np.random.default_rng(1)
+        hits = data.iloc[rng.integers(0, size, args.queries // 2)].to_dict("records")
+        misses = synthetic_data(args.queries - len(hits), seed=2).to_dict("records")
+        queries = hits + misses
+
+        started = time.perf_counter()
+        for features in queries:
+            index.lookup(features)
+        index_us = (time.perf_counter() - started) / len(queries) * 1e6
+
+        apply_us = float("nan")
+        if size <= args.apply_max_rows:
+            sample = queries[:10]
+            for features in sample:
+                assert index.lookup(features) == apply_lookup(data, features)
+            started = time.perf_counter()
+            for features in sample:
+                apply_lookup(data, features)
+            apply_us = (time.perf_counter() - started) / len(sample) * 1e6
+
+        print(f"{size:>10} {build:>10.3f} {index_us:>11.1f} {apply_us:>11.1f}")
+
+if __name__ == "__main__":
+    main()
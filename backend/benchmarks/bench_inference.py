@@ -0,0 +1,59 @@
+"""Confere o kernel fundido contra o pipeline sklearn e mede a latência de inferência
+
+Uso (a partir de backend/): python -m benchmarks.bench_inference
+"""
+import argparse
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+import numpy as np
+import pandas as pd
+from core.config import DATA_PATH
+from core.ai.model import PanicDetectionModel
+
+def per_call_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def check_equivalence(model: PanicDetectionModel, X: np.ndarray) -> None:
+    kernel, pipeline = model.kernel, model.pipeline
+    assert np.array_equal(kernel.predict(X), pipeline.predict(X)), "predictions differ"
+    assert np.allclose(kernel.predict_proba(X), pipeline.predict_proba(X)[:, 1], rtol=1e-9, atol=1e-12), \
+        "probabilities differ"
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    data = pd.read_csv(DATA_PATH)
+    results = {}
+    for online in (False, True):
+        model = PanicDetectionModel(data=data, online=online)
+        model.start_model()
+        X = data.iloc[:, :-1].to_numpy(dtype=np.float64)
+        check_equivalence(model, X)
+
+        infos = data.iloc[:args.batch, :-1].to_dict("records")
+        single = infos[0]
+        legacy_single = lambda: model.pipeline.predict(pd.DataFrame([single])[list(single)].to_numpy())
+        results["online" if online else "batch"] = {
+            "pipeline single (us)": per_call_us(legacy_single, args.repeat),
+            "kernel single (us)": per_call_us(lambda: model.predict_information(single), args.repeat),
+            "pipeline batch/row (us)": per_call_us(lambda: model.pipeline.predict(model.to_matrix(infos)), 50) / len(infos),
+            "kernel batch/row (us)": per_call_us(lambda: model.predict_batch(infos), 50) / len(infos),
+        }
+
+    print("kernel output matches sklearn pipeline for both training modes")
+    for mode, timings in results.items():
+        print(f"[{mode}]")
+        for name, value in timings.items():
+            print(f"  {name:<26} {value:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Custo de logging no caminho da requisição: StreamHandler síncrono vs fila com listener
+
+Mede o tempo gasto pela thread que loga (o que a requisição paga), com a saída
+redirecionada para um arquivo. --sink-latency-us simula um stderr lento (pipe cheio,
+driver de log do container). Uso (a partir de backend/): python -m benchmarks.bench_logging
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+import core.logger as core_logger
+
+PAYLOAD = {"heart_rate": 121.5, "respiration_rate": 25.0, "accel_std": 1.2, "spo2": 92.0, "stress_level": 80.0}
+
+class SlowSink:
+    """Arquivo cujo write demora um tempo fixo, como um pipe com o leitor atrasado"""
+
+    def __init__(self, stream, latency: float) -> None:
+        self._stream = stream
+        self._latency = latency
+
+    def write(self, text: str) -> int:
+        if self._latency:
+            time.sleep(self._latency)
+        return self._stream.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+def per_call_us(logger: logging.Logger, calls: int, lazy: bool, level: int = logging.INFO) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        if lazy:
+            logger.log(level, "Prediction for reading %s: %s", i, PAYLOAD)
+        else:
+            logger.log(level, f"Prediction for reading {i}: {PAYLOAD}")
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--sink-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        sink = SlowSink(open(os.path.join(workdir, "log.txt"), "w"), args.sink_latency_us / 1e6)
+        root = logging.getLogger()
+
+        # Antes: basicConfig com StreamHandler síncrono e mensagens em f-string
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(core_logger.LOG_FORMAT))
+        root.handlers[:] = [handler]
+        root.setLevel(logging.INFO)
+        logger = logging.getLogger("bench.sync")
+        sync_info = per_call_us(logger, args.calls, lazy=False)
+        sync_debug = per_call_us(logger, args.calls, lazy=False, level=logging.DEBUG)
+
+        # Depois: fila + listener (mesmo arquivo de saída), formatação preguiçosa
+        root.handlers[:] = []
+        core_logger.setup_logging()
+        core_logger._listener.handlers = (handler,)
+        logger = logging.getLogger("bench.queue")
+        queue_info = per_call_us(logger, args.calls, lazy=True)
+        queue_debug = per_call_us(logger, args.calls, lazy=True, level=logging.DEBUG)
+        stats = core_logger.logging_stats()
+        core_logger.shutdown_logging()
+        sink.flush()
+
+    print(f"{'pipeline':>22} {'info (us)':>10} {'debug off (us)':>15}")
+    print(f"{'sync + f-string':>22} {sync_info:>10.2f} {sync_debug:>15.2f}")
+    print(f"{'queue + lazy':>22} {queue_info:>10.2f} {queue_debug:>15.2f}")
+    print(f"queue stats: {stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Custo da instrumentação: middleware de métricas por requisição e cronômetros por chamada
+
+Uso (a partir de backend/): python -m benchmarks.bench_metrics
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.harness import configure_env
+
+configure_env()
+
+from fastapi import FastAPI
+from benchmarks.rtdb_memory import MemoryRTDBConnector
+from core.db.instrumented import InstrumentedConnector
+from core.metrics import Histogram, MetricsMiddleware
+
+def make_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str) -> dict:
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+async def asgi_request_us(app: FastAPI, requests: int) -> float:
+    """Chama a aplicação direto pela interface ASGI, sem cliente HTTP no meio"""
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        pass
+
+    started = time.perf_counter()
+    for i in range(requests):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/items/{i}", "raw_path": f"/items/{i}".encode(), "root_path": "",
+            "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+def call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    plain = asyncio.run(asgi_request_us(make_app(False), args.requests))
+    instrumented = asyncio.run(asgi_request_us(make_app(True), args.requests))
+    print(f"request  plain={plain:.1f} us  instrumented={instrumented:.1f} us  overhead={instrumented - plain:.1f} us")
+
+    histogram = Histogram("bench_seconds", "bench", ("operation",))
+    observe = call_us(lambda: histogram.observe(0.003, "get_data"), args.calls)
+    print(f"histogram.observe  {observe:.2f} us")
+
+    connector = MemoryRTDBConnector()
+    connector.tree.set("users/u1", {"name": "x"})
+    wrapped = InstrumentedConnector(connector)
+    raw = call_us(lambda: connector.get_data("users/u1"), args.calls)
+    timed = call_us(lambda: wrapped.get_data("users/u1"), args.calls)
+    print(f"connector.get_data  raw={raw:.2f} us  instrumented={timed:.2f} us  overhead={timed - raw:.2f} us")
+
+if __name__ == "__main__":
+    main()
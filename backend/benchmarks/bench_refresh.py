@@ -0,0 +1,70 @@
+"""Latência do /auth/refresh (p50/p99) com e sem o cache de existência de usuários
+
+Chama a aplicação em processo via ASGI, sobre o RTDB em memória com latência simulada.
+Antes desta mudança cada refresh ainda criava um RTDBConnector novo (credenciais +
+initialize_app), custo que não aparece aqui; a linha "no cache" mostra o piso de
+uma ida ao banco por refresh.
+Uso (a partir de backend/): python -m benchmarks.bench_refresh
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from benchmarks.harness import build_app
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+async def run(app, connector, cached: bool, args: argparse.Namespace) -> None:
+    import httpx
+    import core.dependencies as dependencies
+    import core.services.db_service as db_module
+    from core.config import USER_PERSONAL_REF
+    from core.security.jwt_handler import JWTHandler
+
+    ttl = db_module.USER_EXISTS_CACHE_TTL_SECONDS if cached else 0
+    db_module.USER_EXISTS_CACHE_TTL_SECONDS = ttl
+    db_module.DB_CACHE_TTL_SECONDS = 30 if cached else 0
+    dependencies._db_service = None
+
+    for i in range(args.users):
+        connector.tree.set(f"{USER_PERSONAL_REF}/user{i}", {"username": f"user{i}", "email": f"u{i}@x.com"})
+    tokens = [JWTHandler.create_refresh_token({"sub": f"user{i}"}) for i in range(args.users)]
+    rng = random.Random(0)
+
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Regime permanente: cada usuário já fez login/refresh uma vez
+        for token in tokens:
+            await client.post("/auth/refresh", json={"refresh_token": token})
+        connector.reset_counters()
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            response = await client.post("/auth/refresh", json={"refresh_token": rng.choice(tokens)})
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.text
+
+    label = "exists cache" if cached else "no cache"
+    print(f"{label:<13} p50={statistics.median(latencies):6.2f} ms  p99={percentile(latencies, 0.99):6.2f} ms  "
+          f"{connector.round_trips / args.requests:.2f} round trips/refresh")
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.02, help="latência simulada por chamada (s)")
+    args = parser.parse_args()
+
+    app, connector = build_app(latency=args.latency)
+    from core.executors import shutdown_executors
+    try:
+        for cached in (False, True):
+            asyncio.run(run(app, connector, cached, args))
+    finally:
+        shutdown_executors()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Teste de carga do streaming via WebSocket: leituras/s sustentadas por worker
+
+Sobe um servidor uvicorn real (um worker) em processo, com o RTDB em memória,
+e abre N conexões concorrentes enviando leituras continuamente.
+Uso (a partir de backend/): python -m benchmarks.bench_ws_stream
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from benchmarks.harness import build_app
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(app, port: int):
+    import uvicorn
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws="websockets"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+def reading(rng: random.Random) -> dict:
+    return {
+        "heart_rate": rng.uniform(60, 140),
+        "respiration_rate": rng.uniform(12, 30),
+        "accel_std": rng.uniform(0, 2),
+        "spo2": rng.uniform(90, 100),
+        "stress_level": rng.uniform(0, 100),
+    }
+
+async def client(port: int, token: str, messages: int, batch: int, seed: int) -> None:
+    from websockets.asyncio.client import connect
+    rng = random.Random(seed)
+    async with connect(f"ws://127.0.0.1:{port}/ai/stream", additional_headers={"Authorization": f"Bearer {token}"}) as ws:
+        for _ in range(messages):
+            if batch == 1:
+                await ws.send(json.dumps(reading(rng)))
+            else:
+                await ws.send(json.dumps({"readings": [reading(rng) for _ in range(batch)]}))
+            json.loads(await ws.recv())
+
+async def run(port: int, args: argparse.Namespace) -> float:
+    from core.security.jwt_handler import JWTHandler
+    tokens = [JWTHandler.create_access_token({"sub": f"user{i}"}) for i in range(args.connections)]
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, token, args.messages, args.batch, seed) for seed, token in enumerate(tokens)
+    ))
+    elapsed = time.perf_counter() - started
+    return args.connections * args.messages * args.batch / elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=200, help="mensagens por conexão")
+    parser.add_argument("--batch", type=int, default=1, help="leituras por mensagem")
+    parser.add_argument("--latency", type=float, default=0.02, help="latência simulada do Firebase (s)")
+    args = parser.parse_args()
+
+    app, connector = build_app(latency=args.latency)
+    from core.config import USER_PERSONAL_REF
+    for i in range(args.connections):
+        # O stream recusa tokens de usuários que não existem
+        connector.tree.set(f"{USER_PERSONAL_REF}/user{i}", {"username": f"user{i}"})
+    port = free_port()
+    server = start_server(app, port)
+    try:
+        rate = asyncio.run(run(port, args))
+        # Aguarda o flush final das sessões para contar as gravações
+        time.sleep(0.5)
+        print(f"{args.connections} connections x {args.messages} messages x {args.batch} readings")
+        print(f"sustained throughput: {rate:,.0f} readings/s on one worker")
+        print(f"firebase writes: {connector.calls.get('multi_update', 0)}")
+    finally:
+        server.should_exit = True
+
+if __name__ == "__main__":
+    main()
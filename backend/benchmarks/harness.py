@@ -0,0 +1,50 @@
+"""Monta a aplicação FastAPI em processo, sobre o RTDB em memória, para os benchmarks"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Tuple
+
+# Valores padrão para que core.config carregue sem um .env (não sobrescrevem o ambiente)
+_BENCH_ENV = {
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "JWT_SECRET_KEY": "benchmark-secret",
+    "JWT_ALGORITHM": "HS256",
+    "USER_PERSONAL_REF": "user_personal_data",
+    "USER_SENSOR_REF": "vital_data",
+}
+
+# Dataset versionado no repositório; os benchmarks treinam sobre uma cópia
+_REPO_DATASET = Path(__file__).resolve().parent.parent / "panic_attack_data_improved.csv"
+
+def configure_env() -> str:
+    """Aplica o ambiente dos benchmarks; dataset, artefatos e log de feedback vão para um diretório temporário
+
+    A compactação do log de feedback regrava o CSV, então DATA_PATH aponta para uma
+    cópia: um benchmark nunca altera os dados de treino do repositório.
+    """
+    for key, value in _BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+    workdir = os.environ.setdefault("BENCH_WORKDIR", tempfile.mkdtemp(prefix="plenimind-bench-"))
+    data_path = os.path.join(workdir, _REPO_DATASET.name)
+    if "DATA_PATH" not in os.environ:
+        if not os.path.exists(data_path):
+            shutil.copyfile(_REPO_DATASET, data_path)
+        os.environ["DATA_PATH"] = data_path
+    os.environ.setdefault("FEEDBACK_LOG_PATH", os.path.join(workdir, "feedback.log.jsonl"))
+    os.environ.setdefault("MODEL_ARTIFACT_DIR", os.path.join(workdir, "artifacts"))
+    return workdir
+
+def build_app(latency: float = 0.0) -> Tuple["FastAPI", "MemoryRTDBConnector"]:
+    """Importa main.app com o conector do Firebase trocado por MemoryRTDBConnector"""
+    configure_env()
+    import core.dependencies as dependencies
+    from benchmarks.rtdb_memory import MemoryRTDBConnector
+
+    connector = MemoryRTDBConnector(latency=latency)
+    dependencies._firebase_connector = connector
+    dependencies._db_service = None
+
+    from main import app
+    return app, connector
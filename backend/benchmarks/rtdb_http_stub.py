@@ -0,0 +1,114 @@
+"""Stand-in HTTP local da API REST do Realtime Database, sobre MemoryTree
+
+Atende GET/PUT/POST/PATCH/DELETE em /<caminho>.json como o RTDB (e o emulador,
+aceitando ?ns= e qualquer autenticação). Pode servir tanto AsyncRTDBConnector
+quanto firebase_admin via FIREBASE_DATABASE_EMULATOR_HOST.
+
+Uso (a partir de backend/): python -m benchmarks.rtdb_http_stub --port 9000
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from benchmarks.rtdb_memory import MemoryTree
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeçalhos e corpo saem em escritas separadas; sem isso o Nagle adiciona ~40 ms
+    disable_nagle_algorithm = True
+    tree: MemoryTree
+    latency: float = 0.0
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _path(self) -> Tuple[str, dict]:
+        parsed = urlparse(self.path)
+        path = parsed.path
+        if path.endswith(".json"):
+            path = path[:-len(".json")]
+        return path, {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _reply(self, payload, status: int = 200, silent: bool = False) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if silent:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path, params = self._path()
+        value = self.tree.get(path)
+        if params.get("shallow") == "true" and isinstance(value, dict):
+            value = {key: True for key in value}
+        elif isinstance(value, dict) and params.get("orderBy") == '"$key"':
+            keys = sorted(value)
+            if "startAt" in params:
+                keys = [k for k in keys if k >= json.loads(params["startAt"])]
+            if "endAt" in params:
+                keys = [k for k in keys if k <= json.loads(params["endAt"])]
+            if "limitToFirst" in params:
+                keys = keys[:int(params["limitToFirst"])]
+            if "limitToLast" in params:
+                keys = keys[-int(params["limitToLast"]):]
+            value = {k: value[k] for k in keys}
+        self._reply(value)
+
+    def do_PUT(self) -> None:
+        path, params = self._path()
+        body = self._body()
+        self.tree.set(path, body)
+        self._reply(body, silent=params.get("print") == "silent")
+
+    def do_POST(self) -> None:
+        path, _ = self._path()
+        self._reply({"name": self.tree.push(path, self._body())})
+
+    def do_PATCH(self) -> None:
+        path, params = self._path()
+        body = self._body() or {}
+        self.tree.update(path, body)
+        self._reply(body, silent=params.get("print") == "silent")
+
+    def do_DELETE(self) -> None:
+        path, _ = self._path()
+        self.tree.delete(path)
+        self._reply(None)
+
+def start_stub(port: int = 0, latency: float = 0.0, tree: Optional[MemoryTree] = None) -> ThreadingHTTPServer:
+    """Sobe o stand-in em uma thread e devolve o servidor (server.server_address tem a porta)"""
+    handler = type("RTDBStubHandler", (_Handler,), {"tree": tree or MemoryTree(), "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="rtdb-stub", daemon=True).start()
+    return server
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="latência artificial por requisição (s)")
+    args = parser.parse_args()
+    server = start_stub(args.port, args.latency)
+    print(f"RTDB stand-in listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
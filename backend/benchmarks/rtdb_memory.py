@@ -0,0 +1,141 @@
+"""Árvore JSON em memória com a semântica de caminhos do Realtime Database"""
+import copy
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+def _split(path: str) -> List[str]:
+    return [part for part in path.strip("/").split("/") if part]
+
+class MemoryTree:
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._push_counter = 0
+
+    def _node(self, parts: List[str]) -> Optional[Any]:
+        node: Any = self._root
+        for part in parts:
+            if not isinstance(node, dict) or part not in node:
+                return None
+            node = node[part]
+        return node
+
+    def _set(self, parts: List[str], value: Any) -> None:
+        if not parts:
+            self._root = copy.deepcopy(value) if isinstance(value, dict) else {}
+            return
+        node = self._root
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        if value is None:
+            node.pop(parts[-1], None)
+            self._prune(parts[:-1])
+        else:
+            node[parts[-1]] = copy.deepcopy(value)
+
+    def _prune(self, parts: List[str]) -> None:
+        # O RTDB não guarda nós vazios
+        while parts:
+            parent = self._node(parts[:-1])
+            if isinstance(parent, dict) and parent.get(parts[-1]) == {}:
+                parent.pop(parts[-1])
+                parts = parts[:-1]
+            else:
+                break
+
+    def get(self, path: str) -> Any:
+        with self._lock:
+            return copy.deepcopy(self._node(_split(path)))
+
+    def set(self, path: str, value: Any) -> None:
+        with self._lock:
+            self._set(_split(path), value)
+
+    def update(self, path: str, updates: Dict[str, Any]) -> None:
+        """Atualização multi-caminho: cada chave pode conter '/'"""
+        with self._lock:
+            base = _split(path)
+            for key, value in updates.items():
+                self._set(base + _split(key), value)
+
+    def delete(self, path: str) -> None:
+        self.set(path, None)
+
+    def push(self, path: str, value: Any) -> str:
+        with self._lock:
+            # Chaves crescentes, ordenáveis como os push IDs do Firebase
+            self._push_counter += 1
+            key = f"-{self._push_counter:019d}"
+            self._set(_split(path) + [key], value)
+            return key
+
+class MemoryRTDBConnector:
+    """Substituto em memória de RTDBConnector, com latência artificial e contagem de chamadas"""
+
+    def __init__(self, tree: Optional[MemoryTree] = None, latency: float = 0.0) -> None:
+        self.tree = tree or MemoryTree()
+        self.latency = latency
+        self.calls: Dict[str, int] = {}
+
+    def _round_trip(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_counters(self) -> None:
+        self.calls.clear()
+
+    def add_data(self, db_ref: str, user_data: dict, uid: Optional[str] = None) -> Dict[str, str]:
+        self._round_trip("add_data")
+        if uid:
+            self.tree.set(f"{db_ref}/{uid}", user_data)
+        else:
+            uid = self.tree.push(db_ref, user_data)
+        return {"message": "Data saved successfully", "uid": uid}
+
+    def get_data(self, db_ref: str) -> Optional[Any]:
+        self._round_trip("get_data")
+        return self.tree.get(db_ref)
+
+    def query_data(
+        self,
+        db_ref: str,
+        start_at: Optional[str] = None,
+        end_at: Optional[str] = None,
+        limit_to_first: Optional[int] = None
+    ) -> Dict[str, Any]:
+        self._round_trip("query_data")
+        node = self.tree.get(db_ref)
+        if not isinstance(node, dict):
+            return {}
+        keys = [k for k in sorted(node)
+                if (start_at is None or k >= start_at) and (end_at is None or k <= end_at)]
+        if limit_to_first is not None:
+            keys = keys[:limit_to_first]
+        return {k: node[k] for k in keys}
+
+    def update_data(self, db_ref: str, updates: dict) -> bool:
+        self._round_trip("update_data")
+        self.tree.update(db_ref, {k: v for k, v in updates.items() if k != "uid"})
+        return True
+
+    def multi_update(self, updates: dict) -> bool:
+        self._round_trip("multi_update")
+        self.tree.update("", updates)
+        return True
+
+    def delete_data(self, db_ref: str) -> Dict[str, str]:
+        self._round_trip("delete_data")
+        self.tree.delete(db_ref)
+        return {"message": "Data deleted successfully"}
+
+    def close_connection(self) -> Dict[str, str]:
+        return {"message": "Connection closed"}
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import joblib
+import pandas as pd
+import sklearn
+from core.ai.model import PanicDetectionModel
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Incrementar sempre que o formato salvo por PanicDetectionModel.to_artifact mudar
+ARTIFACT_VERSION = 1
+# Versão escolhida pelo administrador: artefato e hash dos dados na ativação
+ACTIVE_POINTER = "active.json"
+
+def data_hash(data: pd.DataFrame, *extra: str) -> str:
+    """Hash do conteúdo dos dados de treino (independente do formato em disco)"""
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, data.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    for item in extra:
+        digest.update(item.encode("utf-8"))
+    return digest.hexdigest()
+
+def artifact_path(directory: str, content_hash: str) -> Path:
+    return Path(directory) / f"panic-model-v{ARTIFACT_VERSION}-{content_hash[:16]}.joblib"
+
+def save_model(model: PanicDetectionModel, path: Path, content_hash: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "artifact_version": ARTIFACT_VERSION,
+        "sklearn_version": sklearn.__version__,
+        "data_hash": content_hash,
+        **model.to_artifact(),
+    }
+    temp_path = path.with_suffix(".tmp")
+    joblib.dump(payload, temp_path)
+    os.replace(temp_path, path)
+    logger.info("Model artifact saved to %s", path.name)
+
+def read_artifact(path: Path) -> Optional[Dict[str, Any]]:
+    """Conteúdo do artefato se ele existir e tiver formato e versão do sklearn compatíveis"""
+    if not path.exists():
+        return None
+    try:
+        payload = joblib.load(path)
+    except Exception as e:
+        logger.warning("Could not load model artifact %s: %s", path.name, e)
+        return None
+
+    if (payload.get("artifact_version") != ARTIFACT_VERSION
+            or payload.get("sklearn_version") != sklearn.__version__):
+        logger.info("Model artifact %s is incompatible, ignoring it", path.name)
+        return None
+    return payload
+
+def load_model(
+    path: Path, data: pd.DataFrame, content_hash: str, full_refit_every: int = 500
+) -> Optional[PanicDetectionModel]:
+    """Carrega o artefato se existir e for compatível com estes dados; caso contrário retorna None"""
+    payload = read_artifact(path)
+    if payload is None:
+        return None
+    if payload.get("data_hash") != content_hash:
+        logger.info("Model artifact %s is stale, ignoring it", path.name)
+        return None
+
+    logger.info("Model artifact loaded from %s", path.name)
+    return PanicDetectionModel.from_artifact(payload, data, full_refit_every)
+
+def list_artifacts(directory: str) -> List[Path]:
+    return list(Path(directory).glob("panic-model-v*.joblib"))
+
+def write_active_pointer(directory: str, artifact: str, content_hash: str) -> None:
+    """Grava atomicamente o ponteiro para o artefato ativado, válido enquanto os dados tiverem este hash"""
+    pointer_path = Path(directory) / ACTIVE_POINTER
+    pointer_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = pointer_path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps({"artifact": artifact, "data_hash": content_hash}), encoding="utf-8")
+    os.replace(temp_path, pointer_path)
+
+def read_active_pointer(directory: str) -> Optional[Dict[str, str]]:
+    try:
+        return json.loads((Path(directory) / ACTIVE_POINTER).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read active model pointer: %s", e)
+        return None
+
+def prune_artifacts(directory: str, keep: int) -> None:
+    """Remove os artefatos mais antigos, mantendo os `keep` mais recentes e o apontado por ACTIVE_POINTER"""
+    pointer = read_active_pointer(directory) or {}
+    artifacts = sorted(
+        (path for path in list_artifacts(directory) if path.name != pointer.get("artifact")),
+        key=lambda p: p.stat().st_mtime
+    )
+    for stale in artifacts[:-keep] if keep > 0 else artifacts:
+        try:
+            stale.unlink()
+        except OSError as e:
+            logger.warning("Could not remove model artifact %s: %s", stale.name, e)
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import pandas as pd
+from typing import Any, Dict, List
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TrainingDataStore:
+    """Dados de treino persistidos como snapshot imutável + log append-only
+
+    O snapshot é o CSV completo; cada feedback vira uma linha JSON no log
+    ("append" de nova linha ou "label" sobrescrevendo o rótulo de uma linha).
+    Na inicialização o log é reaplicado sobre o snapshot. A compactação grava
+    um novo snapshot com os dados atuais e esvazia o log.
+    """
+
+    def __init__(self, snapshot_path: str, log_path: str, fsync: bool = True) -> None:
+        self._snapshot_path = snapshot_path
+        self._log_path = log_path
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        # round_trip: o parser padrão erra o último dígito de alguns floats, e um snapshot
+        # compactado e relido teria outro data_hash que os dados que o geraram
+        self._data = pd.read_csv(snapshot_path, float_precision="round_trip")
+        self._label_column = self._data.columns[-1]
+        self._pending: List[Dict[str, Any]] = []
+        self._log_entries = self._replay()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+
+    @property
+    def label_column(self) -> str:
+        return self._label_column
+
+    @property
+    def log_entries(self) -> int:
+        return self._log_entries
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._pending)
+
+    def _replay(self) -> int:
+        if not os.path.exists(self._log_path):
+            return 0
+
+        entries = 0
+        with open(self._log_path, "r", encoding="utf-8") as log:
+            for line_number, line in enumerate(log, start=1):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Linha truncada por uma queda durante a escrita: descartada
+                    logger.warning("Skipping corrupt feedback log line %s", line_number)
+                    continue
+                try:
+                    applied = self._apply(entry)
+                except (AttributeError, KeyError, TypeError, ValueError) as e:
+                    logger.warning("Skipping malformed feedback log line %s: %s", line_number, e)
+                    continue
+                if not applied:
+                    logger.warning("Skipping feedback log line %s: %s", line_number, entry)
+                    continue
+                entries += 1
+
+        logger.info("Replayed %s feedback log entries", entries)
+        return entries
+
+    def _apply(self, entry: Dict[str, Any]) -> bool:
+        """Reaplica uma entrada do log; False se ela não cabe nos dados atuais (posição ou rótulo inválidos)"""
+        position = entry["position"]
+        if not isinstance(position, int) or position < 0:
+            return False
+        if entry["op"] == "append":
+            row = dict(entry["row"])
+            if position < len(self):
+                # Já presente no snapshot (queda entre compactação e limpeza do log)
+                self._set_row(position, row)
+            elif position == len(self):
+                self._pending.append(row)
+            else:
+                return False
+        elif entry["op"] == "label":
+            if position >= len(self) or entry["label"] not in (0, 1):
+                return False
+            self._set_label(position, entry["label"])
+        else:
+            return False
+        return True
+
+    def _set_row(self, position: int, row: Dict[str, Any]) -> None:
+        if position >= len(self._data):
+            self._pending[position - len(self._data)] = dict(row)
+            return
+        for column, value in row.items():
+            self._data.iat[position, self._data.columns.get_loc(column)] = value
+
+    def _set_label(self, position: int, label: int) -> None:
+        if position >= len(self._data):
+            self._pending[position - len(self._data)][self._label_column] = label
+        else:
+            self._data.iat[position, self._data.columns.get_loc(self._label_column)] = label
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+        if self._fsync:
+            os.fsync(self._log.fileno())
+        self._log_entries += 1
+
+    def append(self, row: Dict[str, Any]) -> int:
+        """Registra uma nova linha de treino e retorna sua posição"""
+        with self._lock:
+            position = len(self)
+            self._write({"op": "append", "position": position, "row": row})
+            self._pending.append(dict(row))
+            return position
+
+    def set_label(self, position: int, label: int) -> None:
+        with self._lock:
+            self._write({"op": "label", "position": position, "label": label})
+            self._set_label(position, label)
+
+    def _materialize(self) -> pd.DataFrame:
+        if self._pending:
+            self._data = pd.concat([self._data, pd.DataFrame(self._pending)], ignore_index=True)
+            self._pending = []
+        return self._data
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame com todas as linhas, incorporando as adições pendentes"""
+        with self._lock:
+            return self._materialize()
+
+    def compact(self) -> None:
+        """Grava um novo snapshot atômico com os dados atuais e esvazia o log"""
+        with self._lock:
+            data = self._materialize()
+            temp_path = f"{self._snapshot_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8", newline="") as snapshot:
+                data.to_csv(snapshot, index=False)
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp_path, self._snapshot_path)
+
+            self._log.close()
+            self._log = open(self._log_path, "w", encoding="utf-8")
+            if self._fsync:
+                os.fsync(self._log.fileno())
+            logger.info("Compacted %s feedback log entries into snapshot", self._log_entries)
+            self._log_entries = 0
+
+    def maybe_compact(self, max_entries: int) -> bool:
+        if self._log_entries < max_entries:
+            return False
+        self.compact()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
@@ -0,0 +1,105 @@
+import itertools
+import math
+import numpy as np
+from typing import Dict, Iterable, List, Sequence
+
+# Módulo máximo aceito para uma feature; valores maiores são recusados antes do índice
+FEATURE_MAX_ABS = 1e6
+
+class FeatureIndex:
+    """Mapa hash de chaves quantizadas para localizar linhas equivalentes a np.isclose
+
+    Cada linha é indexada pela célula da grade (largura cell_size) em que cai. Uma
+    busca visita apenas as células vizinhas dentro da tolerância e confirma os
+    candidatos com a mesma regra de np.isclose(linha, consulta, atol, rtol).
+
+    Com valores grandes a tolerância relativa cobre muitas células; acima de
+    max_cells a busca vira uma varredura vetorizada das linhas indexadas.
+    Valores não finitos ou com módulo acima de max_abs são recusados (ValueError).
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        atol: float = 1e-4,
+        rtol: float = 1e-5,
+        cell_size: float = 0.01,
+        max_cells: int = 4096,
+        max_abs: float = FEATURE_MAX_ABS
+    ) -> None:
+        self._columns = list(columns)
+        self._atol = atol
+        self._rtol = rtol
+        self._cell_size = cell_size
+        self._max_cells = max_cells
+        self._max_abs = max_abs
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._rows = np.empty((1024, len(self._columns)), dtype=np.float64)
+        self._positions = np.empty(1024, dtype=np.int64)
+        self._size = 0
+
+    @property
+    def columns(self) -> list[str]:
+        return self._columns
+
+    def __len__(self) -> int:
+        return self._size
+
+    def accepts(self, values: Dict[str, float]) -> bool:
+        """Indica se os valores podem ser indexados (finitos e dentro de ±max_abs)"""
+        return all(math.isfinite(values[col]) and abs(values[col]) <= self._max_abs for col in self._columns)
+
+    def _check_range(self, matrix: np.ndarray) -> None:
+        if not np.all(np.isfinite(matrix)) or np.any(np.abs(matrix) > self._max_abs):
+            raise ValueError(f"Feature values must be finite and within ±{self._max_abs:g}")
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._rows):
+            return
+        capacity = max(needed, 2 * len(self._rows))
+        rows = np.empty((capacity, len(self._columns)), dtype=np.float64)
+        rows[:self._size] = self._rows[:self._size]
+        positions = np.empty(capacity, dtype=np.int64)
+        positions[:self._size] = self._positions[:self._size]
+        self._rows, self._positions = rows, positions
+
+    def add(self, position: int, values: Dict[str, float]) -> None:
+        self.add_many(np.array([[values[col] for col in self._columns]], dtype=np.float64), [position])
+
+    def add_many(self, matrix: np.ndarray, positions: Iterable[int]) -> None:
+        """Indexa várias linhas de uma vez (matriz na ordem de columns)"""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self._check_range(matrix)
+        positions = np.fromiter(positions, dtype=np.int64, count=len(matrix))
+        self._ensure_capacity(len(matrix))
+
+        start = self._size
+        self._rows[start:start + len(matrix)] = matrix
+        self._positions[start:start + len(matrix)] = positions
+        self._size += len(matrix)
+
+        keys = np.floor(matrix / self._cell_size).astype(np.int64)
+        for slot, key in enumerate(map(tuple, keys.tolist()), start=start):
+            self._buckets.setdefault(key, []).append(slot)
+
+    def lookup(self, values: Dict[str, float]) -> List[int]:
+        """Retorna as posições de todas as linhas próximas (np.isclose) aos valores dados"""
+        query = np.array([values[col] for col in self._columns], dtype=np.float64)
+        self._check_range(query)
+        tolerance = self._atol + self._rtol * np.abs(query)
+        low = np.floor((query - tolerance) / self._cell_size).astype(np.int64)
+        high = np.floor((query + tolerance) / self._cell_size).astype(np.int64)
+
+        if math.prod((high - low + 1).tolist()) > self._max_cells:
+            candidates = np.arange(self._size, dtype=np.int64)
+        else:
+            slots: List[int] = []
+            for key in itertools.product(*(range(lo, hi + 1) for lo, hi in zip(low.tolist(), high.tolist()))):
+                slots.extend(self._buckets.get(key, ()))
+            if not slots:
+                return []
+            candidates = np.array(slots, dtype=np.int64)
+
+        close = np.all(np.abs(self._rows[candidates] - query) <= tolerance, axis=1)
+        return sorted(self._positions[candidates[close]].tolist())
@@ -0,0 +1,161 @@
+import math
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+# Colunas do ring buffer de amostras brutas
+_HR, _RR, _ACCEL, _SPO2, _STRESS = range(5)
+_CHANNELS = 5
+
+class _UserWindow:
+    """Janela deslizante de um usuário com somas correntes para atualização O(1)
+
+    As somas ponderadas pela posição usam j = posição dentro da janela (0 a n-1), não o
+    índice absoluto da amostra, e a aceleração é somada como desvio de accel_shift (a
+    primeira amostra do usuário): as somas não crescem com o tempo de conexão e a
+    variância não perde precisão com a gravidade (~9,8) somada a variações pequenas.
+    """
+
+    __slots__ = (
+        "samples", "count", "sum_hr", "sum_rr", "sum_stress", "accel_shift", "sum_accel", "sum_accel_sq",
+        "sum_j_hr", "sum_j_rr", "spo2_min"
+    )
+
+    def __init__(self, window: int) -> None:
+        self.samples = np.empty((window, _CHANNELS), dtype=np.float64)
+        self.count = 0
+        self.sum_hr = self.sum_rr = self.sum_stress = 0.0
+        self.accel_shift: Optional[float] = None
+        self.sum_accel = self.sum_accel_sq = 0.0
+        self.sum_j_hr = self.sum_j_rr = 0.0
+        # Fila monotônica (índice, valor) para o mínimo da janela em O(1) amortizado
+        self.spo2_min: deque = deque()
+
+class FeatureEngine:
+    """Extrai features em janelas deslizantes a partir de amostras brutas dos sensores
+
+    Cada usuário tem um ring buffer NumPy de tamanho fixo. A cada amostra as somas
+    correntes são atualizadas (entra a nova, sai a mais antiga), de modo que média
+    e inclinação de FC e respiração, desvio padrão da aceleração e mínimo de SpO2
+    custam O(1) por amostra, independentemente do tamanho da janela.
+    """
+
+    def __init__(
+        self,
+        feature_order: Sequence[str],
+        window: int = 60,
+        min_samples: int = 10,
+        max_users: int = 20000
+    ) -> None:
+        self._feature_order = list(feature_order)
+        self._window = window
+        self._min_samples = max(2, min(min_samples, window))
+        self._max_users = max_users
+        self._users: "OrderedDict[str, _UserWindow]" = OrderedDict()
+
+    @property
+    def feature_order(self) -> list[str]:
+        return self._feature_order
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def _state(self, uid: str) -> _UserWindow:
+        state = self._users.get(uid)
+        if state is None:
+            state = self._users[uid] = _UserWindow(self._window)
+            while len(self._users) > self._max_users:
+                # Descarta o usuário inativo há mais tempo
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(uid)
+        return state
+
+    def push(self, uid: str, sample: Dict[str, float]) -> Optional[Dict[str, float]]:
+        """Acrescenta uma amostra e retorna as features da janela, ou None se ainda curta"""
+        state = self._state(uid)
+        accel = sample.get("accel")
+        if accel is None:
+            accel = math.sqrt(sample["accel_x"] ** 2 + sample["accel_y"] ** 2 + sample["accel_z"] ** 2)
+        hr, rr, spo2, stress = sample["heart_rate"], sample["respiration_rate"], sample["spo2"], sample["stress_level"]
+
+        k = state.count
+        slot = k % self._window
+        if state.accel_shift is None:
+            state.accel_shift = accel
+        j = k
+        if k >= self._window:
+            old = state.samples[slot]
+            old_k = k - self._window
+            old_accel = old[_ACCEL] - state.accel_shift
+            state.sum_hr -= old[_HR]
+            state.sum_rr -= old[_RR]
+            state.sum_stress -= old[_STRESS]
+            state.sum_accel -= old_accel
+            state.sum_accel_sq -= old_accel * old_accel
+            # A mais antiga (j=0) sai e as demais recuam uma posição
+            state.sum_j_hr -= state.sum_hr
+            state.sum_j_rr -= state.sum_rr
+            j = self._window - 1
+            if state.spo2_min and state.spo2_min[0][0] <= old_k:
+                state.spo2_min.popleft()
+
+        state.samples[slot] = (hr, rr, accel, spo2, stress)
+        accel_offset = accel - state.accel_shift
+        state.sum_hr += hr
+        state.sum_rr += rr
+        state.sum_stress += stress
+        state.sum_accel += accel_offset
+        state.sum_accel_sq += accel_offset * accel_offset
+        state.sum_j_hr += j * hr
+        state.sum_j_rr += j * rr
+        while state.spo2_min and state.spo2_min[-1][1] >= spo2:
+            state.spo2_min.pop()
+        state.spo2_min.append((k, spo2))
+        state.count = k + 1
+
+        if state.count % self._window == 0:
+            self._resync(state)
+        if min(state.count, self._window) < self._min_samples:
+            return None
+        return self._features(state)
+
+    def _resync(self, state: _UserWindow) -> None:
+        """Recalcula as somas a partir do buffer uma vez por janela, limitando o erro acumulado"""
+        n = min(state.count, self._window)
+        first_k = state.count - n
+        rows = state.samples[np.arange(first_k, state.count) % self._window]
+        js = np.arange(n, dtype=np.float64)
+        accel = rows[:, _ACCEL] - state.accel_shift
+        state.sum_hr, state.sum_rr, state.sum_stress = (float(v) for v in rows[:, [_HR, _RR, _STRESS]].sum(axis=0))
+        state.sum_accel = float(accel.sum())
+        state.sum_accel_sq = float(np.dot(accel, accel))
+        state.sum_j_hr = float(np.dot(js, rows[:, _HR]))
+        state.sum_j_rr = float(np.dot(js, rows[:, _RR]))
+
+    def _features(self, state: _UserWindow) -> Dict[str, float]:
+        n = min(state.count, self._window)
+        # Somas fechadas de j e j² para as posições 0..n-1 da janela
+        sum_j = n * (n - 1) / 2
+        sum_j_sq = (n - 1) * n * (2 * n - 1) / 6
+        denominator = n * sum_j_sq - sum_j ** 2
+
+        accel_offset_mean = state.sum_accel / n
+        accel_var = max(state.sum_accel_sq / n - accel_offset_mean ** 2, 0.0)
+        return {
+            "heart_rate": state.sum_hr / n,
+            "respiration_rate": state.sum_rr / n,
+            "accel_std": math.sqrt(accel_var),
+            "spo2": state.spo2_min[0][1],
+            "stress_level": state.sum_stress / n,
+            # Inclinações por amostra (regressão linear sobre a janela)
+            "heart_rate_slope": (n * state.sum_j_hr - sum_j * state.sum_hr) / denominator,
+            "respiration_rate_slope": (n * state.sum_j_rr - sum_j * state.sum_rr) / denominator,
+        }
+
+    def to_vector(self, features: Dict[str, float]) -> np.ndarray:
+        """Vetor de features na ordem esperada por PanicDetectionModel"""
+        return np.array([features[name] for name in self._feature_order], dtype=np.float64)
+
+    def drop(self, uid: str) -> None:
+        self._users.pop(uid, None)
@@ -0,0 +1,47 @@
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+class LinearKernel:
+    """StandardScaler + classificador linear fundidos em um único vetor de pesos e viés
+
+    Para z = coef · (x - mean) / scale + intercept, os pesos efetivos são
+    coef / scale e o viés é intercept - coef · (mean / scale). A inferência
+    fica reduzida a um produto matriz-vetor e uma sigmoide, sem pandas nem sklearn.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, classes: np.ndarray) -> None:
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.classes = np.asarray(classes)
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline) -> "LinearKernel":
+        scaler = pipeline.named_steps["scaler"]
+        classifier = pipeline.named_steps["classifier"]
+
+        coef = classifier.coef_[0].astype(np.float64)
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros_like(coef)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones_like(coef)
+
+        weights = coef / scale
+        bias = classifier.intercept_[0] - np.dot(weights, mean)
+        return cls(weights, bias, classifier.classes_)
+
+    def to_array(self) -> np.ndarray:
+        """Pesos, viés e classes num único vetor float64 (formato dos arquivos .npy compartilhados)"""
+        return np.concatenate([self.weights, [self.bias], self.classes.astype(np.float64)])
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, n_features: int) -> "LinearKernel":
+        """Inverso de to_array; com um array mapeado em memória os pesos não são copiados"""
+        return cls(array[:n_features], array[n_features], array[n_features + 1:].astype(np.int64))
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.weights + self.bias
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidade da classe positiva (sigmoide numericamente estável)"""
+        return np.exp(-np.logaddexp(0.0, -self.decision_function(X)))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[(self.decision_function(X) > 0).astype(np.intp)]
@@ -1,36 +1,168 @@
+import copy
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
+from core.ai.kernel import LinearKernel
+from core.metrics import MODEL_INFERENCE_DURATION, MODEL_TRAINING_DURATION
 
 class PanicDetectionModel:
-    def __init__(self, data: pd.DataFrame) -> None:
+    def __init__(self, data: pd.DataFrame, online: bool = False, full_refit_every: int = 500) -> None:
         self._data = data
+        self._online = online
+        self._full_refit_every = full_refit_every
         self._pipeline: Pipeline = Pipeline([
             ("scaler", StandardScaler()),
-            ("classifier", LogisticRegression())
+            ("classifier", self._build_classifier())
         ])
         self._feature_order: list[str] = []
+        self._classes: np.ndarray = np.array([0, 1])
+        self._updates_since_refit = 0
+        self._kernel: Optional[LinearKernel] = None
+        # Linhas de treino, acurácia no holdout etc.; o AIService completa com hash e origem
+        self.metadata: Dict[str, Any] = {}
+
+    def _build_classifier(self):
+        if self._online:
+            # Regressão logística ajustada por SGD, que suporta partial_fit
+            return SGDClassifier(loss="log_loss", random_state=42)
+        return LogisticRegression()
 
     def start_model(self) -> None:
+        # Em treinos no pool de processos esta medição fica no processo filho;
+        # o AIService mede esses treinos do lado de quem os dispara
+        with MODEL_TRAINING_DURATION.time("start"):
+            self._fit_pipeline()
+
+    def _fit_pipeline(self) -> None:
         X_df = self._data.iloc[:, :-1]
         y = self._data.iloc[:, -1].values
 
         self._feature_order = X_df.columns.tolist()
+        self._classes = np.unique(y)
 
-        X_train, _, y_train, _ = train_test_split(
-            X_df, y, test_size=0.2, stratify=y, random_state=42
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_df.to_numpy(dtype=np.float64), y, test_size=0.2, stratify=y, random_state=42
         )
 
         self._pipeline.fit(X_train, y_train)
+        self._updates_since_refit = 0
+        self._kernel = LinearKernel.from_pipeline(self._pipeline)
+        # Atualizações incrementais mantêm a acurácia medida no último ajuste completo
+        self.metadata = {
+            "rows": len(self._data),
+            "holdout_accuracy": round(float(np.mean(self._kernel.predict(X_test) == y_test)), 4),
+        }
+
+    @property
+    def online(self) -> bool:
+        return self._online
+
+    @property
+    def needs_full_refit(self) -> bool:
+        """Indica se o número de atualizações incrementais atingiu o limite de deriva"""
+        return self._online and self._updates_since_refit >= self._full_refit_every
+
+    def partial_update(self, infos: Sequence[Dict[str, float]], labels: Sequence[int]) -> None:
+        """Atualiza as estatísticas do scaler e os pesos do classificador apenas com as novas linhas"""
+        if not self._online:
+            raise RuntimeError("Incremental updates require the model in online mode")
+        if not infos:
+            return
+
+        X = self.to_matrix(infos)
+        y = np.asarray(labels)
+        scaler = self._pipeline.named_steps["scaler"]
+        classifier = self._pipeline.named_steps["classifier"]
+
+        scaler.partial_fit(X)
+        classifier.partial_fit(scaler.transform(X), y, classes=self._classes)
+        self._updates_since_refit += len(infos)
+        self._kernel = LinearKernel.from_pipeline(self._pipeline)
+
+    def to_artifact(self) -> Dict[str, Any]:
+        """Estado aprendido do modelo, serializável com joblib
+
+        Parâmetros operacionais como full_refit_every não entram no artefato: vêm da
+        configuração atual de quem carrega.
+        """
+        return {
+            "pipeline": self._pipeline,
+            "feature_order": self._feature_order,
+            "classes": self._classes,
+            "online": self._online,
+            "updates_since_refit": self._updates_since_refit,
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_artifact(
+        cls, payload: Dict[str, Any], data: pd.DataFrame, full_refit_every: int = 500
+    ) -> "PanicDetectionModel":
+        model = cls(data=data, online=payload["online"], full_refit_every=full_refit_every)
+        model._pipeline = payload["pipeline"]
+        model._feature_order = list(payload["feature_order"])
+        model._classes = payload["classes"]
+        model._updates_since_refit = payload["updates_since_refit"]
+        model._kernel = LinearKernel.from_pipeline(model._pipeline)
+        model.metadata = dict(payload.get("metadata", {}))
+        return model
+
+    def copy(self) -> "PanicDetectionModel":
+        """Cópia com pipeline independente, compartilhando os dados de treino"""
+        clone = copy.copy(self)
+        clone._pipeline = copy.deepcopy(self._pipeline)
+        clone.metadata = dict(self.metadata)
+        return clone
+
+    def to_matrix(self, infos: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Empacota as leituras em uma matriz contígua na ordem de _feature_order"""
+        matrix = np.empty((len(infos), len(self._feature_order)), dtype=np.float64)
+        for row, info in enumerate(infos):
+            matrix[row] = [info[col] for col in self._feature_order]
+        return matrix
 
     def predict_information(self, info: Dict[str, float]) -> Any:
-        final_df = pd.DataFrame([[info[col] for col in self._feature_order]],
-                                columns=self._feature_order)
-        return self._pipeline.predict(final_df)[0]
+        with MODEL_INFERENCE_DURATION.time("predict"):
+            return self._kernel.predict(self.to_matrix([info]))[0]
+
+    def predict_batch(self, infos: Sequence[Dict[str, float]]) -> np.ndarray:
+        if not infos:
+            return np.empty(0, dtype=np.int64)
+        with MODEL_INFERENCE_DURATION.time("predict_batch"):
+            return self._kernel.predict(self.to_matrix(infos))
+
+    def predict_probability(self, info: Dict[str, float]) -> float:
+        return float(self.predict_proba_batch([info])[0])
+
+    def predict_proba_batch(self, infos: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Probabilidade de ataque de pânico para cada leitura"""
+        if not infos:
+            return np.empty(0, dtype=np.float64)
+        with MODEL_INFERENCE_DURATION.time("predict_proba"):
+            return self._kernel.predict_proba(self.to_matrix(infos))
+
+    @property
+    def feature_order(self) -> list[str]:
+        return self._feature_order
+
+    @property
+    def kernel(self) -> Optional[LinearKernel]:
+        return self._kernel
+
+    @property
+    def pipeline(self) -> Pipeline:
+        return self._pipeline
 
     def update_data(self, new_data: pd.DataFrame) -> None:
-        self._data = new_data
\ No newline at end of file
+        self._data = new_data
+
+
+def fit_model_state(data: pd.DataFrame, online: bool) -> Dict[str, Any]:
+    """Treina um modelo completo e devolve seu estado; alvo serializável para o pool de processos"""
+    model = PanicDetectionModel(data=data, online=online)
+    model.start_model()
+    return model.to_artifact()
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+from core.ai.model import PanicDetectionModel
+
+class ModelVersion:
+    __slots__ = ("version", "model")
+
+    def __init__(self, version: int, model: PanicDetectionModel) -> None:
+        self.version = version
+        self.model = model
+
+    def describe(self) -> dict:
+        return {"version": self.version, **self.model.metadata}
+
+class ModelRegistry:
+    """Versões recentes do modelo mantidas em memória; a ativa é a que responde às predições
+
+    Ativar uma versão é só trocar uma referência, então o rollback é instantâneo e
+    não interrompe predições em andamento. Versões além de `keep` são descartadas,
+    exceto a ativa.
+    """
+
+    def __init__(self, keep: int) -> None:
+        self._keep = max(1, keep)
+        self._versions: "OrderedDict[int, ModelVersion]" = OrderedDict()
+        self._active: Optional[ModelVersion] = None
+        self._next_version = 1
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> ModelVersion:
+        return self._active
+
+    def register(self, model: PanicDetectionModel, activate: bool = True) -> ModelVersion:
+        """Adiciona o modelo como nova versão e, por padrão, o torna ativo"""
+        with self._lock:
+            entry = ModelVersion(self._next_version, model)
+            self._next_version += 1
+            self._versions[entry.version] = entry
+            if activate or self._active is None:
+                self._active = entry
+            self._prune()
+            return entry
+
+    def activate(self, version: int) -> ModelVersion:
+        """Torna ativa uma versão registrada; KeyError se ela não existe (ou já foi descartada)"""
+        with self._lock:
+            entry = self._versions[version]
+            self._active = entry
+            return entry
+
+    def list(self) -> List[dict]:
+        """Metadados das versões, da mais recente à mais antiga"""
+        with self._lock:
+            active = self._active
+            return [
+                {**entry.describe(), "active": entry is active}
+                for entry in reversed(self._versions.values())
+            ]
+
+    def _prune(self) -> None:
+        for version in list(self._versions)[:max(0, len(self._versions) - self._keep)]:
+            if self._versions[version] is not self._active:
+                del self._versions[version]
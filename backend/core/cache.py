@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+MISSING = object()
+
+class TTLCache:
+    """Cache LRU limitado com expiração por entrada e contadores de uso
+
+    Para preencher o cache a partir de uma leitura lenta sem reinstalar um valor
+    invalidado durante ela, tire generation() antes de ler e passe-a a set().
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Relógio de invalidações e, por chave, o instante da última; chaves esquecidas
+        # (além de max_entries) contam como invalidadas no instante _forgotten
+        self._clock = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._forgotten = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Any:
+        """Retorna o valor ou MISSING se ausente/expirado"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        """Marca a ser tirada antes de uma leitura cujo resultado irá para set()"""
+        return self._clock
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        generation: Optional[int] = None
+    ) -> None:
+        """Grava o valor; com generation, descarta-o se a chave foi invalidada desde a marca"""
+        if not self.enabled:
+            return
+        ttl = self._ttl_seconds if ttl_seconds is None else min(ttl_seconds, self._ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._forgotten) > generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > max(self._max_entries, 1):
+                _, stamp = self._invalidated.popitem(last=False)
+                self._forgotten = stamp
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._clock += 1
+            self._invalidated.clear()
+            self._forgotten = self._clock
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,24 @@
+"""Reconstrói o índice email/username -> uid a partir dos usuários existentes
+
+Uso (a partir de backend/): python -m core.commands.backfill_user_index
+"""
+import asyncio
+from core.dependencies import get_db_service
+from core.executors import shutdown_executors
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+async def backfill() -> None:
+    db_service = get_db_service()
+    try:
+        indexed = await db_service.backfill_user_index()
+        logger.info("User index rebuilt for %s users", indexed)
+    finally:
+        await db_service.close_connection()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(backfill())
+    finally:
+        shutdown_executors()
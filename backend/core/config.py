@@ -19,4 +19,100 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS"))
 
-DATA_PATH = str(BASE_DIR / "panic_attack_data_improved.csv")
\ No newline at end of file
+DATA_PATH = os.getenv("DATA_PATH", str(BASE_DIR / "panic_attack_data_improved.csv"))
+
+RETRAIN_DEBOUNCE_SECONDS = float(os.getenv("RETRAIN_DEBOUNCE_SECONDS", "5"))
+RETRAIN_MAX_BATCH = int(os.getenv("RETRAIN_MAX_BATCH", "50"))
+
+# "batch" refaz o ajuste completo a cada lote de feedback; "online" atualiza incrementalmente
+MODEL_TRAINING_MODE = os.getenv("MODEL_TRAINING_MODE", "batch")
+ONLINE_FULL_REFIT_EVERY = int(os.getenv("ONLINE_FULL_REFIT_EVERY", "500"))
+
+FEEDBACK_LOG_PATH = os.getenv("FEEDBACK_LOG_PATH", str(BASE_DIR / "panic_attack_feedback.log.jsonl"))
+FEEDBACK_LOG_COMPACT_ENTRIES = int(os.getenv("FEEDBACK_LOG_COMPACT_ENTRIES", "1000"))
+FEEDBACK_LOG_FSYNC = os.getenv("FEEDBACK_LOG_FSYNC", "true").lower() == "true"
+
+MODEL_ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR", str(BASE_DIR / "artifacts"))
+MODEL_ARTIFACT_KEEP = int(os.getenv("MODEL_ARTIFACT_KEEP", "5"))
+# Versões do modelo mantidas em memória para rollback, e intervalo de varredura de
+# MODEL_ARTIFACT_DIR em busca de artefatos novos gravados por outro processo (0 desativa)
+MODEL_REGISTRY_KEEP = int(os.getenv("MODEL_REGISTRY_KEEP", "10"))
+MODEL_ARTIFACT_WATCH_SECONDS = float(os.getenv("MODEL_ARTIFACT_WATCH_SECONDS", "5"))
+
+# "standalone": cada processo treina seu próprio modelo; "shared": vários workers do uvicorn,
+# um único treinador eleito publica versões em MODEL_SHARED_DIR e os demais as mapeiam só para leitura
+MODEL_SERVING_MODE = os.getenv("MODEL_SERVING_MODE", "standalone")
+MODEL_SHARED_DIR = os.getenv("MODEL_SHARED_DIR", str(BASE_DIR / "shared_model"))
+MODEL_SHARED_POLL_SECONDS = float(os.getenv("MODEL_SHARED_POLL_SECONDS", "1"))
+MODEL_SHARED_WAIT_SECONDS = float(os.getenv("MODEL_SHARED_WAIT_SECONDS", "120"))
+MODEL_SHARED_KEEP = int(os.getenv("MODEL_SHARED_KEEP", "5"))
+
+# Pool de threads para I/O bloqueante (Firebase) e pool de processos para CPU (bcrypt, treino).
+# Cada processo do pool é um spawn que reimporta core (com seu próprio listener de logging) e
+# existe em cada worker do uvicorn: um por worker basta, pois os retreinos são serializados
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "16"))
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", "1"))
+
+# "sync" usa firebase_admin; "async" usa a API REST do RTDB com httpx e conexões keep-alive
+DB_CONNECTOR = os.getenv("DB_CONNECTOR", "sync")
+DB_HTTP_MAX_CONNECTIONS = int(os.getenv("DB_HTTP_MAX_CONNECTIONS", "50"))
+DB_HTTP_TIMEOUT_SECONDS = float(os.getenv("DB_HTTP_TIMEOUT_SECONDS", "10"))
+
+USER_INDEX_REF = os.getenv("USER_INDEX_REF", "user_index")
+
+# Cache de leitura de usuários e dados vitais (DB_CACHE_TTL_SECONDS=0 desativa)
+DB_CACHE_TTL_SECONDS = float(os.getenv("DB_CACHE_TTL_SECONDS", "30"))
+DB_CACHE_MAX_ENTRIES = int(os.getenv("DB_CACHE_MAX_ENTRIES", "10000"))
+
+# Cache de access tokens já verificados (AUTH_TOKEN_CACHE_TTL_SECONDS=0 desativa)
+AUTH_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "300"))
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# Logging: nível padrão, níveis por módulo ("core.services.db_service=WARNING,core.routes=DEBUG"),
+# tamanho da fila do handler assíncrono e limite de mensagens repetidas por segundo (0 desativa)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "%(levelname)s:     %(message)s")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_RATE_LIMIT_PER_SECOND = float(os.getenv("LOG_RATE_LIMIT_PER_SECOND", "20"))
+
+# "eager": conexão com o Firebase e modelo prontos antes de abrir a porta; "lazy": a porta abre
+# logo e ambos sobem em segundo plano (acompanhe em /ready), útil para cold starts curtos
+BOOT_MODE = os.getenv("BOOT_MODE", "eager")
+
+# Métricas no formato do Prometheus em /metrics (middleware + cronômetros do banco e do modelo)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# UIDs com acesso às rotas /admin (separados por vírgula)
+ADMIN_UIDS = {uid.strip() for uid in os.getenv("ADMIN_UIDS", "").split(",") if uid.strip()}
+
+# Profiling de requisições: fração amostrada, cabeçalho X-Profile para administradores,
+# e diretório/quantidade de perfis mantidos em disco
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_ALLOW_HEADER = os.getenv("PROFILING_ALLOW_HEADER", "true").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", str(BASE_DIR / "profiles"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+# Listagens paginadas: tamanho padrão/máximo da página e das páginas lidas ao transmitir tudo
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "100"))
+LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+LIST_STREAM_PAGE_SIZE = int(os.getenv("LIST_STREAM_PAGE_SIZE", "500"))
+
+# UIDs sabidamente existentes (alimentado por criação/remoção/leituras), usado no /auth/refresh;
+# remoções feitas em outro processo demoram até este TTL para recusar o refresh
+USER_EXISTS_CACHE_TTL_SECONDS = float(os.getenv("USER_EXISTS_CACHE_TTL_SECONDS", "300"))
+USER_EXISTS_CACHE_MAX_ENTRIES = int(os.getenv("USER_EXISTS_CACHE_MAX_ENTRIES", "100000"))
+
+USER_VITAL_HISTORY_REF = os.getenv("USER_VITAL_HISTORY_REF", "vital_history")
+VITAL_HISTORY_MAX_RANGE_DAYS = int(os.getenv("VITAL_HISTORY_MAX_RANGE_DAYS", "31"))
+
+# Streaming de leituras via WebSocket: intervalo e tamanho máximo do lote gravado no Firebase
+STREAM_FLUSH_INTERVAL_SECONDS = float(os.getenv("STREAM_FLUSH_INTERVAL_SECONDS", "5"))
+STREAM_MAX_BUFFER = int(os.getenv("STREAM_MAX_BUFFER", "500"))
+# Prazo para o primeiro frame {"token": ...} quando o cliente não envia o cabeçalho Authorization
+STREAM_AUTH_TIMEOUT_SECONDS = float(os.getenv("STREAM_AUTH_TIMEOUT_SECONDS", "10"))
+
+# Extração de features no servidor: janela (amostras) por usuário e limite de usuários ativos
+FEATURE_WINDOW_SIZE = int(os.getenv("FEATURE_WINDOW_SIZE", "60"))
+FEATURE_MIN_SAMPLES = int(os.getenv("FEATURE_MIN_SAMPLES", "10"))
+FEATURE_ENGINE_MAX_USERS = int(os.getenv("FEATURE_ENGINE_MAX_USERS", "20000"))
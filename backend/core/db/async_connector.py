@@ -0,0 +1,140 @@
+import asyncio
+import json
+import httpx
+from typing import Dict, Any, Optional
+from google.oauth2 import service_account
+from google.auth.transport.requests import Request
+from core.config import DATABASE_URL, CREDENTIAL_FIREBASE, DB_HTTP_MAX_CONNECTIONS, DB_HTTP_TIMEOUT_SECONDS
+
+_SCOPES = [
+    "https://www.googleapis.com/auth/firebase.database",
+    "https://www.googleapis.com/auth/userinfo.email",
+]
+
+class AsyncRTDBConnector:
+    """Conector assíncrono para a API REST do Realtime Database
+
+    Mesma interface de RTDBConnector, mas com corrotinas sobre um cliente httpx
+    com pool de conexões keep-alive, permitindo requisições concorrentes.
+    Com credential=None nenhuma autenticação é enviada (emulador ou stand-in local).
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        credential: Optional[str] = CREDENTIAL_FIREBASE,
+        max_connections: int = DB_HTTP_MAX_CONNECTIONS,
+        timeout: float = DB_HTTP_TIMEOUT_SECONDS
+    ) -> None:
+        try:
+            self._url_db = (url or DATABASE_URL).rstrip("/")
+            self._cred = self._load_credentials(credential) if credential else None
+            self._token_lock = asyncio.Lock()
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections
+                ),
+                timeout=timeout
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize AsyncRTDBConnector: {e}")
+
+    def _load_credentials(self, cred_str: str):
+        try:
+            if cred_str.strip().startswith("{"):
+                return service_account.Credentials.from_service_account_info(json.loads(cred_str), scopes=_SCOPES)
+            return service_account.Credentials.from_service_account_file(cred_str, scopes=_SCOPES)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid credential JSON: {e}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load credentials: {e}")
+
+    async def _access_token(self) -> Optional[str]:
+        if self._cred is None:
+            return None
+        async with self._token_lock:
+            if not self._cred.valid:
+                # O refresh do token OAuth é síncrono; roda em thread à parte
+                await asyncio.to_thread(self._cred.refresh, Request())
+            return self._cred.token
+
+    async def _request(self, method: str, db_ref: str, body: Any = None, **params: Any) -> Any:
+        token = await self._access_token()
+        if token:
+            params["access_token"] = token
+        url = f"{self._url_db}/{db_ref.strip('/')}.json"
+        content = json.dumps(body) if body is not None else None
+        response = await self._client.request(method, url, params=params, content=content)
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    async def add_data(self, db_ref: str, user_data: dict, uid: Optional[str] = None) -> Dict[str, str]:
+        try:
+            if uid:
+                await self._request("PUT", f"{db_ref}/{uid}", user_data, print="silent")
+                return {"message": "Data saved successfully", "uid": uid}
+            result = await self._request("POST", db_ref, user_data)
+            return {"message": "Data saved successfully", "uid": result["name"]}
+        except Exception as e:
+            raise RuntimeError(f"Failed to add data at '{db_ref}': {e}")
+
+    async def get_data(self, db_ref: str) -> Optional[Any]:
+        try:
+            return await self._request("GET", db_ref)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read data at '{db_ref}': {e}")
+
+    async def query_data(
+        self,
+        db_ref: str,
+        start_at: Optional[str] = None,
+        end_at: Optional[str] = None,
+        limit_to_first: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Filhos de db_ref ordenados pela chave, dentro do intervalo [start_at, end_at]"""
+        params: Dict[str, Any] = {"orderBy": json.dumps("$key")}
+        if start_at is not None:
+            params["startAt"] = json.dumps(start_at)
+        if end_at is not None:
+            params["endAt"] = json.dumps(end_at)
+        if limit_to_first is not None:
+            params["limitToFirst"] = limit_to_first
+        try:
+            result = await self._request("GET", db_ref, **params) or {}
+            # A API REST não garante a ordem no JSON retornado
+            return dict(sorted(result.items()))
+        except Exception as e:
+            raise RuntimeError(f"Failed to query data at '{db_ref}': {e}")
+
+    async def update_data(self, db_ref: str, updates: dict) -> bool:
+        try:
+            clean_updates = {k: v for k, v in updates.items() if k != 'uid'}
+            await self._request("PATCH", db_ref, clean_updates, print="silent")
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to update data at '{db_ref}': {e}")
+
+    async def multi_update(self, updates: dict) -> bool:
+        """Atualização atômica de vários caminhos a partir da raiz (None remove o caminho)"""
+        try:
+            await self._request("PATCH", "", updates, print="silent")
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to apply multi-path update: {e}")
+
+    async def delete_data(self, db_ref: str) -> Dict[str, str]:
+        try:
+            await self._request("DELETE", db_ref)
+            return {"message": "Data deleted successfully"}
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete data at '{db_ref}': {e}")
+
+    async def close_connection(self) -> Dict[str, str]:
+        if not self._client.is_closed:
+            try:
+                await self._client.aclose()
+                return {"message": "Connection closed"}
+            except Exception as e:
+                raise RuntimeError(f"Error closing HTTP connection pool: {e}")
+        return {"message": "No active connection to close"}
@@ -64,6 +64,28 @@ class RTDBConnector:
         except Exception as e:
             raise RuntimeError(f"Failed to read data at '{db_ref}': {e}")
         
+    def query_data(
+        self,
+        db_ref: str,
+        start_at: Optional[str] = None,
+        end_at: Optional[str] = None,
+        limit_to_first: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Filhos de db_ref ordenados pela chave, dentro do intervalo [start_at, end_at]"""
+        if not self._app:
+            raise RuntimeError("Database not connected. Call connect_db() first.")
+        try:
+            query = db.reference(db_ref, app=self._app).order_by_key()
+            if start_at is not None:
+                query = query.start_at(start_at)
+            if end_at is not None:
+                query = query.end_at(end_at)
+            if limit_to_first is not None:
+                query = query.limit_to_first(limit_to_first)
+            return dict(query.get() or {})
+        except Exception as e:
+            raise RuntimeError(f"Failed to query data at '{db_ref}': {e}")
+
     def update_data(self, db_ref: str, updates: dict) -> bool:
         if not self._app:
             raise RuntimeError("Database not connected. Call connect_db() first.")
@@ -75,6 +97,17 @@ class RTDBConnector:
         except Exception as e:
             raise RuntimeError(f"Failed to update data at '{db_ref}': {e}")
 
+    def multi_update(self, updates: dict) -> bool:
+        """Atualização atômica de vários caminhos a partir da raiz (None remove o caminho)"""
+        if not self._app:
+            raise RuntimeError("Database not connected. Call connect_db() first.")
+        try:
+            ref = db.reference("/", app=self._app)
+            ref.update(updates)
+            return True
+        except Exception as e:
+            raise RuntimeError(f"Failed to apply multi-path update: {e}")
+
     def delete_data(self, db_ref: str) -> Dict[str, str]:
         if not self._app:
             raise RuntimeError("Database not connected. Call connect_db() first.")
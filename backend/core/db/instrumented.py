@@ -0,0 +1,61 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable
+from core.metrics import DB_CALL_DURATION, DB_CALL_ERRORS, DB_IN_PROGRESS
+
+def _timed(operation: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        DB_IN_PROGRESS.inc(operation)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        except Exception:
+            DB_CALL_ERRORS.inc(operation)
+            raise
+        finally:
+            DB_CALL_DURATION.observe(time.perf_counter() - started, operation)
+            DB_IN_PROGRESS.dec(operation)
+    return wrapper
+
+def _timed_async(operation: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        DB_IN_PROGRESS.inc(operation)
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        except Exception:
+            DB_CALL_ERRORS.inc(operation)
+            raise
+        finally:
+            DB_CALL_DURATION.observe(time.perf_counter() - started, operation)
+            DB_IN_PROGRESS.dec(operation)
+    return wrapper
+
+class InstrumentedConnector:
+    """Proxy que cronometra cada método público de um conector (síncrono ou assíncrono)
+
+    Num conector síncrono o tempo medido é o da chamada em si, dentro da thread
+    do pool de I/O, sem a espera na fila do pool.
+    """
+
+    def __init__(self, connector: Any) -> None:
+        self._connector = connector
+
+    @property
+    def wrapped(self) -> Any:
+        return self._connector
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._connector, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        if inspect.iscoroutinefunction(attr):
+            wrapper = _timed_async(name, attr)
+        else:
+            wrapper = _timed(name, attr)
+        # Guarda o wrapper na instância: __getattr__ só roda na primeira vez
+        setattr(self, name, wrapper)
+        return wrapper
@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+from urllib.parse import quote
+
+_PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+
+_lock = threading.Lock()
+_last_push_time = 0
+_last_rand_chars = [0] * 12
+
+def generate_push_id() -> str:
+    """Gera localmente um push ID no formato do Firebase (ordenável pelo tempo de criação)
+
+    Permite conhecer a chave antes da escrita e incluí-la numa atualização multi-caminho.
+    """
+    global _last_push_time
+    with _lock:
+        now = int(time.time() * 1000)
+        if now == _last_push_time:
+            # Mesmo milissegundo: incrementa o sufixo aleatório para manter a ordem
+            for i in range(11, -1, -1):
+                if _last_rand_chars[i] != 63:
+                    _last_rand_chars[i] += 1
+                    break
+                _last_rand_chars[i] = 0
+        else:
+            _last_push_time = now
+            for i, byte in enumerate(os.urandom(12)):
+                _last_rand_chars[i] = byte % 64
+
+        time_chars = []
+        for _ in range(8):
+            time_chars.append(_PUSH_CHARS[now % 64])
+            now //= 64
+        return "".join(reversed(time_chars)) + "".join(_PUSH_CHARS[c] for c in _last_rand_chars)
+
+def encode_key(value: str) -> str:
+    """Codifica um valor arbitrário (ex.: email) como chave válida do RTDB
+
+    Chaves não podem conter '.', '$', '#', '[', ']' nem '/'; a codificação
+    percent-encoding é reversível e preserva a igualdade exata.
+    """
+    return quote(value, safe="").replace(".", "%2E")
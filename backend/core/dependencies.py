@@ -1,10 +1,23 @@
+import threading
 from fastapi import Depends
-from core.db.connector import RTDBConnector
+from typing import TYPE_CHECKING, Union
+from core.config import (
+    DB_CONNECTOR, FEATURE_WINDOW_SIZE, FEATURE_MIN_SAMPLES, FEATURE_ENGINE_MAX_USERS,
+    PROFILE_DIR, PROFILE_MAX_FILES, MODEL_SERVING_MODE
+)
+from core.db.instrumented import InstrumentedConnector
 from core.services.db_service import DBService
-from core.services.ai_service import AIService
+from core.ai.features import FeatureEngine
+from core.profiling import ProfileStore
 from core.logger import get_logger
 from core.security.auth_middleware import get_current_user
 
+if TYPE_CHECKING:
+    from core.db.connector import RTDBConnector
+    from core.db.async_connector import AsyncRTDBConnector
+    from core.services.ai_service import AIService
+    from core.services.shared_model import SharedAIService
+
 logger = get_logger(__name__)
 
 # Conexão única com o Firebase
@@ -13,31 +26,89 @@ _firebase_connector = None
 _db_service = None
 # Serviço de IA
 _ai_service = None
+# Extração de features por usuário (janelas deslizantes)
+_feature_engine = None
+# Perfis de requisições guardados em disco
+_profile_store = None
+
+# Dependências síncronas rodam no threadpool: sem os locks, requisições que chegam
+# durante o warmup criariam uma segunda instância de cada serviço
+_connector_lock = threading.Lock()
+_db_lock = threading.Lock()
+_ai_lock = threading.Lock()
+_feature_lock = threading.Lock()
 
-def get_firebase_connector() -> RTDBConnector:
+def get_firebase_connector() -> Union["RTDBConnector", "AsyncRTDBConnector"]:
     global _firebase_connector
     if _firebase_connector is None:
-        logger.info("Initializing DB connection")
-        _firebase_connector = RTDBConnector()
+        with _connector_lock:
+            if _firebase_connector is None:
+                logger.info("Initializing DB connection (%s connector)", DB_CONNECTOR)
+                # Imports tardios: firebase_admin e httpx só são carregados quando a conexão é criada
+                if DB_CONNECTOR == "async":
+                    from core.db.async_connector import AsyncRTDBConnector
+                    _firebase_connector = AsyncRTDBConnector()
+                else:
+                    from core.db.connector import RTDBConnector
+                    _firebase_connector = RTDBConnector()
     return _firebase_connector
 
 
 def get_db_service() -> DBService:
     global _db_service
     if _db_service is None:
-        connector = get_firebase_connector()
-        _db_service = DBService(connector)
-        logger.info("DB Service initialized")
+        with _db_lock:
+            if _db_service is None:
+                connector = get_firebase_connector()
+                _db_service = DBService(InstrumentedConnector(connector))
+                _db_service.export_cache_metrics()
+                logger.info("DB Service initialized")
     return _db_service
 
 
-def get_ai_service() -> AIService:
+def get_ai_service() -> Union["AIService", "SharedAIService"]:
     global _ai_service
     if _ai_service is None:
-        _ai_service = AIService()
-        logger.info("AI Service initialized")
+        with _ai_lock:
+            if _ai_service is None:
+                # Imports tardios: pandas e sklearn só são carregados junto com o modelo
+                if MODEL_SERVING_MODE == "shared":
+                    from core.services.shared_model import SharedAIService
+                    _ai_service = SharedAIService(profile_store=get_profile_store())
+                else:
+                    from core.services.ai_service import AIService
+                    _ai_service = AIService(profile_store=get_profile_store())
+                logger.info("AI Service initialized")
     return _ai_service
 
+def get_feature_engine() -> FeatureEngine:
+    global _feature_engine
+    if _feature_engine is None:
+        with _feature_lock:
+            if _feature_engine is None:
+                _feature_engine = FeatureEngine(
+                    get_ai_service().feature_order,
+                    window=FEATURE_WINDOW_SIZE,
+                    min_samples=FEATURE_MIN_SAMPLES,
+                    max_users=FEATURE_ENGINE_MAX_USERS
+                )
+                logger.info("Feature engine initialized")
+    return _feature_engine
+
+async def close_services() -> None:
+    """Encerra os serviços que chegaram a ser criados (no boot lazy o warmup pode não ter terminado)"""
+    if _ai_service is not None:
+        _ai_service.close()
+    if _db_service is not None:
+        await _db_service.close_connection()
+        logger.info("Firebase connection closed")
+
+def get_profile_store() -> ProfileStore:
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = ProfileStore(PROFILE_DIR, PROFILE_MAX_FILES)
+    return _profile_store
+
 # Dependência para autenticação (mantida separada)
 async def get_current_user_dependency():
     return await get_current_user()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+from core.config import IO_POOL_SIZE, CPU_POOL_SIZE
+from core.logger import get_logger
+from core.profiling import wrap_for_worker
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Pool de threads para chamadas de I/O bloqueantes
+_io_executor = None
+# Pool de processos para trabalho de CPU (bcrypt, treino do modelo)
+_cpu_executor = None
+# Criação e troca do pool: o retreino (thread) e o event loop podem pedi-lo ao mesmo tempo
+_cpu_lock = threading.Lock()
+
+def get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=max(1, IO_POOL_SIZE), thread_name_prefix="io")
+        logger.info("I/O thread pool started with %s workers", IO_POOL_SIZE)
+    return _io_executor
+
+def get_cpu_executor() -> Executor:
+    """Pool de processos; com CPU_POOL_SIZE <= 0 o trabalho de CPU usa o pool de I/O"""
+    global _cpu_executor
+    if CPU_POOL_SIZE <= 0:
+        return get_io_executor()
+    with _cpu_lock:
+        if _cpu_executor is None:
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=CPU_POOL_SIZE,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("CPU process pool started with %s workers", CPU_POOL_SIZE)
+        return _cpu_executor
+
+def _discard_broken_cpu_executor(broken: Executor) -> None:
+    """Descarta o pool cujo processo morreu; o próximo get_cpu_executor cria outro"""
+    global _cpu_executor
+    with _cpu_lock:
+        if _cpu_executor is broken:
+            _cpu_executor = None
+            logger.warning("CPU process pool broken (a worker process died), starting a new one")
+    broken.shutdown(wait=False, cancel_futures=True)
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Executa uma função de I/O bloqueante sem travar o event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(wrap_for_worker(fn), *args, **kwargs))
+
+async def run_cpu(fn: Callable[..., T], *args: Any) -> T:
+    """Executa uma função de CPU no pool de processos (fn e args devem ser serializáveis)
+
+    Se um processo do pool morrer (ex.: OOM), o pool é recriado e a chamada repetida uma vez.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_cpu_executor()
+    try:
+        return await loop.run_in_executor(executor, fn, *args)
+    except BrokenProcessPool:
+        _discard_broken_cpu_executor(executor)
+        return await loop.run_in_executor(get_cpu_executor(), fn, *args)
+
+def run_cpu_sync(fn: Callable[..., T], *args: Any) -> T:
+    """Versão bloqueante de run_cpu, para threads de segundo plano"""
+    executor = get_cpu_executor()
+    try:
+        return executor.submit(fn, *args).result()
+    except BrokenProcessPool:
+        _discard_broken_cpu_executor(executor)
+        return get_cpu_executor().submit(fn, *args).result()
+
+def shutdown_executors() -> None:
+    global _io_executor, _cpu_executor
+    with _cpu_lock:
+        cpu_executor, _cpu_executor = _cpu_executor, None
+    if cpu_executor is not None:
+        cpu_executor.shutdown(wait=True, cancel_futures=True)
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True, cancel_futures=True)
+        _io_executor = None
+    logger.info("Executors shut down")
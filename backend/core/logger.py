@@ -1,5 +1,148 @@
+import atexit
 import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+from core.config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_QUEUE_SIZE, LOG_RATE_LIMIT_PER_SECOND
+from core.metrics import LOG_RECORDS_DROPPED, LOG_RECORDS_SUPPRESSED
+
+_listener: Optional[QueueListener] = None
+_handler: Optional["_DroppingQueueHandler"] = None
+_setup_lock = threading.Lock()
+_atexit_registered = False
+
+class _DroppingQueueHandler(QueueHandler):
+    """Enfileira registros sem bloquear; com a fila cheia o registro é descartado e contado"""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A formatação da mensagem fica para a thread do listener; só exceções
+        # e stack precisam ser capturadas aqui, enquanto ainda existem
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RateLimitFilter(logging.Filter):
+    """Limita mensagens repetidas abaixo de WARNING a N por segundo por (logger, template)
+
+    O template é o msg ainda não formatado, então chamadas como
+    logger.debug("Getting user %s", uid) contam como uma mesma mensagem.
+    A contagem de suprimidas é anexada ao próximo registro que passar.
+    """
+
+    def __init__(self, per_second: float) -> None:
+        super().__init__()
+        self._per_second = per_second
+        self._buckets: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self._per_second <= 0 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                # [tokens, último reabastecimento, suprimidas desde o último registro]
+                bucket = self._buckets[key] = [self._per_second, now, 0]
+            tokens = min(self._per_second, bucket[0] + (now - bucket[1]) * self._per_second)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1
+            if bucket[2]:
+                record.msg = f"{record.msg} [{bucket[2]} similar messages suppressed]"
+                bucket[2] = 0
+        return True
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    """"core.services.db_service=WARNING,uvicorn.access=ERROR" -> {logger: nível}"""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging() -> None:
+    """Configura o logging do processo uma única vez
+
+    Os handlers do root só enfileiram; a escrita no stderr acontece numa thread
+    do QueueListener, fora do caminho das requisições.
+    """
+    global _listener, _handler, _atexit_registered
+    with _setup_lock:
+        if _listener is not None:
+            return
+        log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        _handler = _DroppingQueueHandler(log_queue)
+        _handler.addFilter(RateLimitFilter(LOG_RATE_LIMIT_PER_SECOND))
+
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_handler)
+        root.setLevel(LOG_LEVEL.upper())
+        for name, level in _parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+
+def shutdown_logging() -> None:
+    """Esvazia a fila, para a thread do listener e volta a escrever direto no stderr
+
+    Sem a troca, o que for logado depois (outros handlers de atexit, finalizadores)
+    iria para uma fila que ninguém mais consome.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        root = logging.getLogger()
+        root.removeHandler(_handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+        _listener = None
+
+def logging_stats() -> Dict[str, int]:
+    if _handler is None:
+        return {"queued": 0, "dropped": 0, "suppressed": 0}
+    rate_limit = next(f for f in _handler.filters if isinstance(f, RateLimitFilter))
+    return {
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+        "suppressed": rate_limit.suppressed,
+    }
+
+LOG_RECORDS_DROPPED.set_function(lambda: {(): logging_stats()["dropped"]})
+LOG_RECORDS_SUPPRESSED.set_function(lambda: {(): logging_stats()["suppressed"]})
 
 def get_logger(name: str):
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
-    return logging.getLogger(name)
\ No newline at end of file
+    setup_logging()
+    return logging.getLogger(name)
@@ -0,0 +1,281 @@
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Buckets padrão (segundos): de 0,5 ms a 10 s
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_label_text(self.labelnames, labels)} {value}" for labels, value in values
+        ]
+
+class CounterFunction(_Metric):
+    """Contador mantido por outro componente (ex.: hits do TTLCache), lido só na coleta
+
+    Evita um segundo lock no caminho quente de quem já conta os eventos. A fonte,
+    definida por set_function, devolve {rótulos: valor}; a última definida vale.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def set_function(self, function: Callable[[], Dict[Tuple[str, ...], float]]) -> None:
+        self._function = function
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        function = self._function
+        return function() if function is not None else {}
+
+    def render(self) -> List[str]:
+        return self._header() + [
+            f"{self.name}{_label_text(self.labelnames, labels)} {value}" for labels, value in self.values().items()
+        ]
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_label_text(self.labelnames, labels)} {value}" for labels, value in values
+        ]
+
+class Histogram(_Metric):
+    """Histograma de buckets fixos; observe() é um bisect e um incremento sob lock"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._buckets = tuple(sorted(buckets))
+        # labels -> [contagens por bucket (+Inf no fim), soma, total]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        position = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self._buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def time(self, *labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+        lines = self._header()
+        bounds = [repr(bound) for bound in self._buckets] + ["+Inf"]
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {count}")
+        return lines
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: Histogram, labels: Tuple[str, ...]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, *self._labels)
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Todas as métricas no formato texto de exposição do Prometheus (0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "Requisições HTTP concluídas", ("method", "route", "status")
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ("method", "route")
+))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento", ("method",)
+))
+DB_CALL_DURATION = REGISTRY.register(Histogram(
+    "db_call_duration_seconds", "Latência das chamadas ao Realtime Database", ("operation",)
+))
+DB_CALL_ERRORS = REGISTRY.register(Counter(
+    "db_call_errors_total", "Chamadas ao Realtime Database com erro", ("operation",)
+))
+DB_IN_PROGRESS = REGISTRY.register(Gauge(
+    "db_calls_in_progress", "Chamadas ao Realtime Database em andamento", ("operation",)
+))
+AUTH_VERIFY_DURATION = REGISTRY.register(Histogram(
+    "auth_token_verify_duration_seconds", "Verificação de assinatura de JWT (falhas do cache de tokens)"
+))
+MODEL_INFERENCE_DURATION = REGISTRY.register(Histogram(
+    "model_inference_duration_seconds", "Latência de inferência do modelo", ("operation",),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+))
+MODEL_TRAINING_DURATION = REGISTRY.register(Histogram(
+    "model_training_duration_seconds", "Duração dos treinos do modelo", ("kind",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+))
+DB_CACHE_HITS = REGISTRY.register(CounterFunction(
+    "db_cache_hits_total", "Leituras do banco servidas pelo cache", ("cache",)
+))
+DB_CACHE_MISSES = REGISTRY.register(CounterFunction(
+    "db_cache_misses_total", "Leituras do banco sem entrada válida no cache", ("cache",)
+))
+DB_CACHE_EVICTIONS = REGISTRY.register(CounterFunction(
+    "db_cache_evictions_total", "Entradas descartadas pelo limite de tamanho do cache", ("cache",)
+))
+AUTH_TOKEN_CACHE_HITS = REGISTRY.register(CounterFunction(
+    "auth_token_cache_hits_total", "Access tokens aceitos sem verificar a assinatura de novo"
+))
+AUTH_TOKEN_CACHE_MISSES = REGISTRY.register(CounterFunction(
+    "auth_token_cache_misses_total", "Access tokens ausentes ou expirados no cache de tokens"
+))
+AUTH_TOKEN_CACHE_EVICTIONS = REGISTRY.register(CounterFunction(
+    "auth_token_cache_evictions_total", "Entradas descartadas pelo limite de tamanho do cache de tokens"
+))
+LOG_RECORDS_DROPPED = REGISTRY.register(CounterFunction(
+    "log_records_dropped_total", "Registros de log descartados com a fila do handler cheia"
+))
+LOG_RECORDS_SUPPRESSED = REGISTRY.register(CounterFunction(
+    "log_records_suppressed_total", "Registros de log repetidos suprimidos pelo limite por segundo"
+))
+APP_READY = REGISTRY.register(Gauge(
+    "app_ready", "1 quando o warmup dos serviços terminou"
+))
+APP_TIME_TO_READY = REGISTRY.register(Gauge(
+    "app_time_to_ready_seconds", "Tempo do início do processo até o fim do warmup"
+))
+APP_WARMUP_DURATION = REGISTRY.register(Gauge(
+    "app_warmup_duration_seconds", "Duração do warmup de cada componente", ("component",)
+))
+
+class MetricsMiddleware:
+    """Middleware ASGI: contagem, latência e requisições em andamento por rota
+
+    O rótulo de rota é o template (/vital-data/{uid}), não o caminho, para manter
+    a cardinalidade limitada; caminhos sem rota caem em "unmatched".
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_PROGRESS.dec(method)
+            route = scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            HTTP_REQUEST_DURATION.observe(elapsed, method, route_label)
+            HTTP_REQUESTS.inc(method, route_label, str(status_code))
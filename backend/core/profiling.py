@@ -0,0 +1,222 @@
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_PROFILE_ID = re.compile(r"^\d+-[0-9a-f]{8}$")
+_SORT_KEYS = {"cumulative", "tottime", "calls", "ncalls"}
+
+class RequestProfile:
+    """Perfil de uma requisição: o thread do event loop mais o trabalho enviado ao pool de I/O"""
+
+    def __init__(self) -> None:
+        self.main = cProfile.Profile()
+        self._workers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add_worker_profile(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self._workers.append(profile)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            for profile in self._workers:
+                stats.add(profile)
+        return stats
+
+# Perfil ativo na requisição atual; propagado ao pool de I/O por run_io
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+# cProfile é um hook por thread: só uma requisição por vez é perfilada no event loop
+_event_loop_busy = threading.Lock()
+
+def wrap_for_worker(fn: Callable[..., T]) -> Callable[..., T]:
+    """Se a requisição atual está sendo perfilada, perfila também fn na thread do pool"""
+    request_profile = _current_profile.get()
+    if request_profile is None:
+        return fn
+
+    def profiled(*args: Any, **kwargs: Any) -> T:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            request_profile.add_worker_profile(profile)
+    return profiled
+
+class ProfileStore:
+    """Perfis em disco (.prof do pstats + metadados .json), mantendo só os max_files mais recentes"""
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        self._directory = Path(directory)
+        self._max_files = max_files
+        self._lock = threading.Lock()
+
+    def _paths(self, profile_id: str) -> tuple[Path, Path]:
+        if not _PROFILE_ID.match(profile_id):
+            raise KeyError(profile_id)
+        return self._directory / f"{profile_id}.prof", self._directory / f"{profile_id}.json"
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, stats: pstats.Stats, metadata: dict) -> None:
+        prof_path, meta_path = self._paths(profile_id)
+        with self._lock:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(str(prof_path))
+            meta_path.write_text(json.dumps({"id": profile_id, **metadata}), encoding="utf-8")
+            self._rotate()
+
+    def _rotate(self) -> None:
+        profiles = sorted(self._directory.glob("*.prof"))
+        for stale in profiles[:max(0, len(profiles) - self._max_files)]:
+            for path in (stale, stale.with_suffix(".json")):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[dict]:
+        """Metadados dos perfis guardados, do mais recente ao mais antigo"""
+        entries = []
+        for meta_path in sorted(self._directory.glob("*.json"), reverse=True):
+            try:
+                entries.append(json.loads(meta_path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def path(self, profile_id: str) -> Path:
+        prof_path, _ = self._paths(profile_id)
+        if not prof_path.exists():
+            raise KeyError(profile_id)
+        return prof_path
+
+    def summary(self, profile_id: str, sort: str = "cumulative", limit: int = 40) -> str:
+        """As funções mais caras do perfil, no formato texto do pstats"""
+        output = io.StringIO()
+        stats = pstats.Stats(str(self.path(profile_id)), stream=output)
+        stats.strip_dirs().sort_stats(sort if sort in _SORT_KEYS else "cumulative").print_stats(limit)
+        return output.getvalue()
+
+@contextmanager
+def profile_block(store: Optional[ProfileStore], sample_rate: float, kind: str, **metadata: Any) -> Iterator[None]:
+    """Perfila um bloco fora de requisições (ex.: o retreino na thread de segundo plano) por amostragem"""
+    if store is None or sample_rate <= 0 or random.random() >= sample_rate:
+        yield
+        return
+    profile = RequestProfile()
+    started = time.perf_counter()
+    profile.main.enable()
+    try:
+        yield
+    finally:
+        profile.main.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+        try:
+            store.save(ProfileStore.new_id(), profile.stats(), {
+                "kind": kind, "created": time.time(), "duration_ms": round(duration_ms, 3), **metadata
+            })
+        except Exception as e:
+            logger.error("Error saving %s profile: %s", kind, e)
+
+class ProfilingMiddleware:
+    """Middleware ASGI que perfila requisições amostradas ou pedidas por um administrador
+
+    Uma requisição é perfilada se o sorteio cair abaixo de sample_rate, ou se trouxer
+    o cabeçalho X-Profile: 1 com um token de administrador. O perfil cobre o thread
+    do event loop e o trabalho enviado via run_io; corrotinas de outras requisições
+    que rodarem no loop ao mesmo tempo também aparecem nele, e o trabalho no pool
+    de processos não. O id do perfil volta no cabeçalho X-Profile-Id.
+    """
+
+    def __init__(
+        self,
+        app,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        allow_header: bool = True,
+        is_admin_token: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        self.app = app
+        self._store = store
+        self._sample_rate = sample_rate
+        self._allow_header = allow_header
+        self._is_admin_token = is_admin_token
+
+    def _requested_by_admin(self, scope) -> bool:
+        if not self._allow_header or self._is_admin_token is None:
+            return False
+        headers = dict(scope.get("headers") or [])
+        if headers.get(b"x-profile", b"").strip() not in (b"1", b"true"):
+            return False
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        if not authorization.lower().startswith("bearer "):
+            return False
+        return self._is_admin_token(authorization[len("bearer "):])
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sampled = self._sample_rate > 0 and random.random() < self._sample_rate
+        if not (sampled or self._requested_by_admin(scope)) or not _event_loop_busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = ProfileStore.new_id()
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        profile.main.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.main.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+            _current_profile.reset(token)
+            _event_loop_busy.release()
+            route = scope.get("route")
+            metadata = {
+                "kind": "request",
+                "created": time.time(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "sampled": sampled,
+            }
+            try:
+                # Import tardio: core.executors usa wrap_for_worker deste módulo
+                from core.executors import run_io
+                await run_io(self._store.save, profile_id, profile.stats(), metadata)
+            except Exception as e:
+                logger.error("Error saving request profile: %s", e)
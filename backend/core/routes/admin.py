@@ -0,0 +1,70 @@
+from typing import TYPE_CHECKING
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from core.logger import get_logger
+from core.profiling import ProfileStore
+from core.security.auth_middleware import get_admin_user
+from core.dependencies import get_profile_store, get_ai_service
+from core.executors import run_io
+
+if TYPE_CHECKING:
+    from core.services.ai_service import AIService
+
+logger = get_logger(__name__)
+router = APIRouter(tags=["admin"])
+
+@router.get("/profiles")
+async def list_profiles(
+    admin_user: str = Depends(get_admin_user),
+    store: ProfileStore = Depends(get_profile_store)
+):
+    """Perfis guardados, do mais recente ao mais antigo"""
+    return {"profiles": await run_io(store.list)}
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    admin_user: str = Depends(get_admin_user),
+    store: ProfileStore = Depends(get_profile_store)
+):
+    """Arquivo .prof (pstats), para abrir com pstats, snakeviz etc."""
+    try:
+        path = store.path(profile_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+@router.get("/profiles/{profile_id}/summary", response_class=PlainTextResponse)
+async def profile_summary(
+    profile_id: str,
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls|ncalls)$"),
+    limit: int = Query(40, ge=1, le=500),
+    admin_user: str = Depends(get_admin_user),
+    store: ProfileStore = Depends(get_profile_store)
+):
+    """Funções mais caras do perfil em texto, sem precisar baixar o arquivo"""
+    try:
+        return await run_io(store.summary, profile_id, sort, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+@router.get("/models")
+async def list_models(
+    admin_user: str = Depends(get_admin_user),
+    ai_service: "AIService" = Depends(get_ai_service)
+):
+    """Versões do modelo em memória (linhas, hash dos dados, tempo de ajuste, acurácia no holdout)"""
+    return {"models": ai_service.models()}
+
+@router.post("/models/{version}/activate")
+async def activate_model(
+    version: int,
+    admin_user: str = Depends(get_admin_user),
+    ai_service: "AIService" = Depends(get_ai_service)
+):
+    """Rollback: passa a servir uma versão anterior imediatamente, sem retreinar"""
+    try:
+        model = await run_io(ai_service.activate_model, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Model version not found")
+    return model
@@ -1,9 +1,22 @@
-from fastapi import APIRouter, Depends
-from core.services.ai_service import AIService
-from core.schemas.user import UserVitalData
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from core.config import STREAM_FLUSH_INTERVAL_SECONDS, STREAM_MAX_BUFFER, STREAM_AUTH_TIMEOUT_SECONDS
+from core.services.db_service import DBService
+from core.services.stream_service import VitalStreamSession
+from core.schemas.user import UserVitalData, UserVitalDataBatch, StreamVitalReading, RawSensorSample
 from core.logger import get_logger
-from core.security.auth_middleware import get_current_user
-from core.dependencies import get_ai_service
+from core.security.auth_middleware import get_current_user, authenticate_token
+from core.security.jwt_handler import JWTHandler
+from core.ai.features import FeatureEngine
+from core.dependencies import get_ai_service, get_db_service, get_feature_engine
+from core.executors import run_io
+
+if TYPE_CHECKING:
+    from core.services.ai_service import AIService
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -12,8 +25,138 @@ logger = get_logger(__name__)
 async def predict(
     vitals: UserVitalData, 
     current_user: str = Depends(get_current_user),
-    ai_service: AIService = Depends(get_ai_service)
+    ai_service: "AIService" = Depends(get_ai_service)
 ):
     """Faz predição baseada apenas nos dados vitais"""
     result = ai_service.predict(vitals.model_dump())
     return {"panic_attack_detected": bool(result)}
+
+@router.post("/predict/batch")
+async def predict_batch(
+    batch: UserVitalDataBatch,
+    current_user: str = Depends(get_current_user),
+    ai_service: "AIService" = Depends(get_ai_service)
+):
+    """Faz predição em lote para várias leituras de uma só vez"""
+    results = ai_service.predict_many([vitals.model_dump() for vitals in batch.readings])
+    return {"panic_attack_detected": results}
+
+def _verify_token(token: object) -> tuple[str, float | None] | None:
+    """(uid, exp) de um token válido; None caso contrário"""
+    if not isinstance(token, str) or not token:
+        return None
+    try:
+        return authenticate_token(token), JWTHandler.get_expiry(token)
+    except HTTPException:
+        return None
+
+async def _authenticate_websocket(websocket: WebSocket) -> tuple[str, float | None] | None:
+    """Valida o token uma única vez por conexão e aceita o socket; (uid, exp) ou None se recusado (já fechado)
+
+    O token vem do cabeçalho Authorization ou, para clientes que não enviam cabeçalhos
+    no handshake (navegadores), de um primeiro frame {"token": "..."} respondido com
+    {"authenticated": true}. Nunca da URL, que acaba nos logs de acesso e de proxies.
+    """
+    authorization = websocket.headers.get("authorization")
+    if authorization is not None:
+        scheme, _, token = authorization.partition(" ")
+        claims = _verify_token(token) if scheme.lower() == "bearer" else None
+        if claims is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return None
+        await websocket.accept()
+        return claims
+
+    await websocket.accept()
+    try:
+        frame = json.loads(await asyncio.wait_for(websocket.receive_text(), STREAM_AUTH_TIMEOUT_SECONDS))
+        token = frame.get("token") if isinstance(frame, dict) else None
+    except WebSocketDisconnect:
+        return None
+    except (asyncio.TimeoutError, ValueError):
+        token = None
+    claims = _verify_token(token)
+    if claims is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return None
+    await websocket.send_json({"authenticated": True})
+    return claims
+
+async def _session_rejection(db_service: DBService, uid: str, expires_at: float | None) -> str | None:
+    """Motivo para encerrar a conexão (token expirado, usuário removido) ou None se ela segue válida"""
+    if expires_at is not None and time.time() >= expires_at:
+        return "Token expired"
+    if not await db_service.user_exists(uid):
+        return "User not found"
+    return None
+
+def _stream_services() -> tuple["AIService", DBService, FeatureEngine]:
+    return get_ai_service(), get_db_service(), get_feature_engine()
+
+def _parse_message(message: str) -> tuple[list[StreamVitalReading] | list[RawSensorSample], str]:
+    """Aceita uma leitura ({...}), um lote ({"readings": [...]}) ou amostras brutas ({"samples": [...]})"""
+    payload = json.loads(message)
+    for field, model, kind in (("samples", RawSensorSample, "samples"), ("readings", StreamVitalReading, "batch")):
+        if isinstance(payload, dict) and field in payload:
+            # ValueError vira o frame de erro do protocolo; um TypeError fecharia o socket com 1011
+            if not isinstance(payload[field], list):
+                raise ValueError(f'"{field}" must be a list')
+            return [model.model_validate(item) for item in payload[field]], kind
+    return [StreamVitalReading.model_validate(payload)], "single"
+
+@router.websocket("/stream")
+async def stream_vitals(websocket: WebSocket):
+    """Recebe um fluxo contínuo de leituras, devolve a predição de cada uma e grava em lotes
+
+    Amostras brutas ({"samples": [...]}) passam pelo extrator de features do servidor
+    e só geram predição quando a janela do usuário tem amostras suficientes.
+    """
+    claims = await _authenticate_websocket(websocket)
+    if claims is None:
+        return
+    uid, expires_at = claims
+    # Só depois da autenticação: um cliente sem token não dispara a inicialização lazy dos serviços
+    ai_service, db_service, feature_engine = await run_io(_stream_services)
+    rejection = await _session_rejection(db_service, uid, expires_at)
+    if rejection is not None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=rejection)
+        return
+
+    session = VitalStreamSession(
+        uid, ai_service, db_service,
+        flush_interval=STREAM_FLUSH_INTERVAL_SECONDS,
+        max_buffer=STREAM_MAX_BUFFER
+    )
+    session.start()
+    logger.info("Vital stream opened for user %s", uid)
+
+    try:
+        while True:
+            message = await websocket.receive_text()
+            # A conexão dura mais que o token: expiração e remoção do usuário são conferidas a cada mensagem
+            rejection = await _session_rejection(db_service, uid, expires_at)
+            if rejection is not None:
+                logger.info("Closing vital stream for user %s: %s", uid, rejection)
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=rejection)
+                break
+            try:
+                readings, kind = _parse_message(message)
+            except (ValueError, ValidationError) as e:
+                await websocket.send_json({"error": f"Invalid reading: {e}"})
+                continue
+
+            values = [reading.model_dump(exclude={"ts"}) for reading in readings]
+            timestamps = [reading.ts for reading in readings]
+            if kind == "samples":
+                results = await session.ingest_samples(feature_engine, values, timestamps)
+            else:
+                results = await session.ingest(values, timestamps)
+            await websocket.send_json({
+                "seq": session.received,
+                "panic_attack_detected": results[0] if kind == "single" else results
+            })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
+        logger.info("Vital stream closed for user %s after %s readings", uid, session.received)
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from core.services.db_service import DBService
-from core.db.connector import RTDBConnector
 from core.security.jwt_handler import JWTHandler
-from core.security.password import verify_password
+from core.security.password import verify_password_async
 from core.schemas.dto.user_dto import UserLoginDTO
 from core.schemas.auth import Token, RefreshTokenRequest
 from core.logger import get_logger
@@ -17,25 +16,14 @@ async def login(
     db_service: DBService = Depends(get_db_service)
 ):
     try:
-        logger.info(f"Login attempt for email: {credentials.email}")
+        logger.info("Login attempt for email: %s", credentials.email)
         
-        # Buscar usuário por email - CORREÇÃO: Busca mais robusta
-        users = db_service.get_all_users() or {}
-        logger.info(f"Available users: {list(users.keys())}")
-        
-        user_data = None
-        user_uid = None
-        
-        for uid, user in users.items():
-            logger.info(f"Checking user {uid}: {user.get('email')}")
-            if user.get("email") == credentials.email:
-                user_data = user
-                user_uid = uid
-                logger.info(f"User found with UID: {user_uid}")
-                break
+        # Buscar usuário pelo índice email -> uid (leitura pontual)
+        user_uid = await db_service.find_uid_by_email(credentials.email)
+        user_data = await db_service.get_user(user_uid) if user_uid else None
         
         if not user_data:
-            logger.warning(f"Login attempt with non-existent email: {credentials.email}")
+            logger.warning("Login attempt with non-existent email: %s", credentials.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
@@ -43,14 +31,14 @@ async def login(
         
         # CORREÇÃO CRÍTICA: Verificar se a senha existe no usuário
         if 'password' not in user_data:
-            logger.error(f"User {user_uid} has no password stored")
+            logger.error("User %s has no password stored", user_uid)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="User configuration error"
             )
         
-        if not verify_password(credentials.password, user_data["password"]):
-            logger.warning(f"Invalid password attempt for user: {credentials.email}")
+        if not await verify_password_async(credentials.password, user_data["password"]):
+            logger.warning("Invalid password attempt for user: %s", credentials.email)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
@@ -60,7 +48,7 @@ async def login(
         access_token = JWTHandler.create_access_token({"sub": user_uid})
         refresh_token = JWTHandler.create_refresh_token({"sub": user_uid})
         
-        logger.info(f"User {user_uid} logged in successfully")
+        logger.info("User %s logged in successfully", user_uid)
         return Token(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -70,7 +58,7 @@ async def login(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error during login: {e}")
+        logger.error("Error during login: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error during authentication"
@@ -78,7 +66,8 @@ async def login(
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-    request: RefreshTokenRequest
+    request: RefreshTokenRequest,
+    db_service: DBService = Depends(get_db_service)
 ):
     try:
         payload = JWTHandler.decode_token(request.refresh_token)
@@ -96,26 +85,24 @@ async def refresh_token(
                 detail="Invalid token"
             )
         
-        # CORREÇÃO: Verificar se o usuário ainda existe
+        # Verificar se o usuário ainda existe (normalmente sem ida ao banco)
         try:
-            connector = RTDBConnector()
-            db_service = DBService(connector)
-            user = db_service.get_user(user_id)
-            if user is None:
-                logger.warning(f"Refresh token for non-existent user: {user_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User no longer exists"
-                )
+            exists = await db_service.user_exists(user_id)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid user"
             )
+        if not exists:
+            logger.warning("Refresh token for non-existent user: %s", user_id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User no longer exists"
+            )
         
         new_access_token = JWTHandler.create_access_token({"sub": user_id})
         
-        logger.info(f"Token refreshed for user: {user_id}")
+        logger.info("Token refreshed for user: %s", user_id)
         return Token(
             access_token=new_access_token,
             token_type="bearer"
@@ -124,7 +111,7 @@ async def refresh_token(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error refreshing token: {e}")
+        logger.error("Error refreshing token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
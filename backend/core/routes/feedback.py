@@ -1,9 +1,13 @@
+from typing import TYPE_CHECKING
 from fastapi import APIRouter, Depends, status, HTTPException
 from core.schemas.feedback import FeedbackInput
-from core.services.ai_service import AIService
 from core.logger import get_logger
 from core.security.auth_middleware import get_current_user
 from core.dependencies import get_ai_service
+
+if TYPE_CHECKING:
+    from core.services.ai_service import AIService
+
 router = APIRouter()
 logger = get_logger(__name__)
 
@@ -11,7 +15,7 @@ logger = get_logger(__name__)
 async def send_feedback(
     feedback: FeedbackInput, 
     current_user: str = Depends(get_current_user),
-    ai_service: AIService = Depends(get_ai_service)
+    ai_service: "AIService" = Depends(get_ai_service)
 ):
     if feedback.uid != current_user:
         raise HTTPException(
@@ -19,8 +23,11 @@ async def send_feedback(
             detail="Not authorized to send feedback for this user"
         )
         
-    logger.info(f"Feedback received for UID={feedback.uid}")
+    logger.info("Feedback received for UID=%s", feedback.uid)
     
-    ai_service.set_feedback(feedback.features, feedback.user_feedback)
+    try:
+        ai_service.set_feedback(feedback.features, feedback.user_feedback)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
     
     return {"status": "success"}
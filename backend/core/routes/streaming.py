@@ -0,0 +1,35 @@
+import json
+from typing import Any, AsyncIterator, Callable, Optional
+from fastapi.responses import StreamingResponse
+
+async def _object_chunks(
+    first: Optional[dict],
+    pages: AsyncIterator[dict],
+    transform: Optional[Callable[[Any], Any]]
+) -> AsyncIterator[bytes]:
+    yield b"{"
+    separator = b""
+    page = first
+    while page is not None:
+        # Uma página vazia não pode gerar vírgulas seguidas
+        if page:
+            members = ",".join(
+                f"{json.dumps(key)}:{json.dumps(transform(value) if transform else value)}"
+                for key, value in page.items()
+            )
+            yield separator + members.encode("utf-8")
+            separator = b","
+        page = await anext(pages, None)
+    yield b"}"
+
+async def json_object_response(
+    pages: AsyncIterator[dict],
+    transform: Optional[Callable[[Any], Any]] = None
+) -> StreamingResponse:
+    """Serializa um objeto JSON página a página; só uma página fica em memória por vez
+
+    A primeira página é lida antes da resposta começar, para que falhas do banco
+    ainda virem um erro HTTP em vez de uma resposta truncada.
+    """
+    first = await anext(pages, None)
+    return StreamingResponse(_object_chunks(first, pages, transform), media_type="application/json")
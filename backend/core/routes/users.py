@@ -1,35 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from core.config import LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE, LIST_STREAM_PAGE_SIZE
 from core.services.db_service import DBService
 from core.logger import get_logger
 from core.schemas.dto.user_dto import UserCreateDTO, UserResponseDTO, UserUpdateDTO, UserPublicDTO
-from core.security.password import hash_password
-from core.security.auth_middleware import get_current_user
+from core.security.password import hash_password_async
+from core.security.auth_middleware import get_current_user, token_cache
 from datetime import datetime
 from core.dependencies import get_db_service
+from core.routes.streaming import json_object_response
 
 logger = get_logger(__name__)
 router = APIRouter(prefix='', tags=['users'])
 
-@router.get("/", response_model=dict)
+def _without_password(user: dict) -> dict:
+    return {field: value for field, value in user.items() if field != 'password'}
+
+@router.get("/")
 async def get_all_users(
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    shallow: bool = False,
     current_user: str = Depends(get_current_user),
     db_service: DBService = Depends(get_db_service)
 ):
     """
     Apenas para administradores - retorna todos os usuários
+
+    Sem parâmetros, transmite o objeto completo página a página. Com limit/cursor
+    devolve uma página e o cursor da próxima; com shallow=true, apenas os UIDs.
     """
     try:
-        users = db_service.get_all_users() or {}
-        logger.info(f"Found {len(users)} users in database")
-        
-        # Remover senhas dos dados retornados
-        for uid in users:
-            if 'password' in users[uid]:
-                del users[uid]['password']
-                
-        return users
+        if shallow:
+            uids, next_cursor = await db_service.get_user_ids(limit or LIST_PAGE_SIZE, cursor)
+            return {"uids": uids, "next_cursor": next_cursor}
+
+        if limit is not None or cursor is not None:
+            users, next_cursor = await db_service.get_users_page(limit or LIST_PAGE_SIZE, cursor)
+            logger.debug("Found %s users in page", len(users))
+            return {
+                "items": {uid: _without_password(user) for uid, user in users.items()},
+                "next_cursor": next_cursor
+            }
+
+        return await json_object_response(db_service.iter_users(LIST_STREAM_PAGE_SIZE), _without_password)
     except Exception as e:
-        logger.error(f"Error getting all users: {e}")
+        logger.error("Error getting all users: %s", e)
         raise HTTPException(status_code=500, detail="Error getting users")
 
 @router.get("/me", response_model=UserResponseDTO)
@@ -39,14 +55,14 @@ async def get_current_user_info(
 ):
     """Retorna informações do usuário atual"""
     try:
-        logger.info(f"Searching for user with UID: {current_user}")
-        user = db_service.get_user(current_user)
+        logger.debug("Searching for user with UID: %s", current_user)
+        user = await db_service.get_user(current_user)
         
         if user is None:
-            logger.warning(f"User not found with UID: {current_user}")
+            logger.warning("User not found with UID: %s", current_user)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        logger.info(f"User found: {user.get('username')} - {user.get('email')}")
+        logger.debug("User found: %s - %s", user.get('username'), user.get('email'))
         
         # Remover senha antes de retornar
         if 'password' in user:
@@ -56,7 +72,7 @@ async def get_current_user_info(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting user: {e}")
+        logger.error("Error getting user: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error getting user")
 
 @router.get("/{uid}", response_model=UserPublicDTO)
@@ -67,15 +83,15 @@ async def get_user_public(
 ):
     """Retorna informações públicas de um usuário (sem dados sensíveis)"""
     try:
-        logger.info(f"Searching for public user data with UID: {uid}")
+        logger.debug("Searching for public user data with UID: %s", uid)
         
         # Verificar se usuário existe
-        user = db_service.get_user(uid)
+        user = await db_service.get_user(uid)
         if user is None:
-            logger.warning(f"User not found with UID: {uid}")
+            logger.warning("User not found with UID: %s", uid)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        logger.info(f"Public user data found for: {user.get('username')}")
+        logger.debug("Public user data found for: %s", user.get('username'))
         
         # Remover dados sensíveis
         user_public = {
@@ -89,7 +105,7 @@ async def get_user_public(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting user: {e}")
+        logger.error("Error getting user: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error getting user")
 
 @router.post("/", response_model=UserResponseDTO)
@@ -98,23 +114,20 @@ async def create_user(
     db_service: DBService = Depends(get_db_service)
 ):
     try:
-        logger.info(f"Attempting to create user: {user_data.email}")
+        logger.info("Attempting to create user: %s", user_data.email)
         
-        all_users = db_service.get_all_users() or {}
-
-        for _, user in all_users.items():
-            if user.get("email") == user_data.email:
-                logger.warning(f"Attempt to create user with existing email: {user_data.email}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="User with this email already exists"
-                )
-            if user.get("username") == user_data.username:
-                logger.warning(f"Attempt to create user with existing username: {user_data.username}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="User with this username already exists"
-                )
+        if await db_service.find_uid_by_email(user_data.email):
+            logger.warning("Attempt to create user with existing email: %s", user_data.email)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this email already exists"
+            )
+        if await db_service.find_uid_by_username(user_data.username):
+            logger.warning("Attempt to create user with existing username: %s", user_data.username)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this username already exists"
+            )
         
         # Preparar dados
         data_copy = user_data.model_dump()
@@ -124,11 +137,11 @@ async def create_user(
             data_copy['detection_time'] = data_copy['detection_time'].strftime('%H:%M:%S')
         
         # CORREÇÃO CRÍTICA: Salvar a senha hasheada
-        data_copy['password'] = hash_password(data_copy['password'])
+        data_copy['password'] = await hash_password_async(data_copy['password'])
         logger.info("Password hashed successfully")
         
-        # ✅ Firebase gera UID automaticamente - passar None
-        result = db_service.create_user(None, data_copy)
+        # ✅ UID gerado no formato push ID do Firebase - passar None
+        result = await db_service.create_user(None, data_copy)
         generated_uid = result.get("uid")
         
         if not generated_uid:
@@ -143,13 +156,13 @@ async def create_user(
         if 'password' in data_copy_without_password:
             del data_copy_without_password['password']
             
-        logger.info(f"User created successfully with UID: {generated_uid}")
+        logger.info("User created successfully with UID: %s", generated_uid)
         return UserResponseDTO(uid=generated_uid, **data_copy_without_password)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating user: {e}")
+        logger.error("Error creating user: %s", e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error creating user: {str(e)}")
 
 @router.put("/{uid}", response_model=UserResponseDTO)
@@ -168,7 +181,7 @@ async def update_user(
             )
             
         # Verificar se usuário existe
-        existing_user = db_service.get_user(uid)
+        existing_user = await db_service.get_user(uid)
         if existing_user is None:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -181,23 +194,33 @@ async def update_user(
         
         # Atualizar hash da senha se for fornecida
         if 'password' in update_data:
-            update_data['password'] = hash_password(update_data['password'])
+            update_data['password'] = await hash_password_async(update_data['password'])
         
         # Verificar se está tentando alterar email para um que já existe
-        if 'email' in update_data:
-            all_users = db_service.get_all_users() or {}
-            for existing_uid, user in all_users.items():
-                if user.get("email") == update_data['email'] and existing_uid != uid:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Email already in use by another user"
-                    )
+        if 'email' in update_data and update_data['email'] != existing_user.get('email'):
+            email_owner = await db_service.find_uid_by_email(update_data['email'])
+            if email_owner and email_owner != uid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already in use by another user"
+                )
+
+        # O índice exige username único também na atualização
+        if 'username' in update_data and update_data['username'] != existing_user.get('username'):
+            username_owner = await db_service.find_uid_by_username(update_data['username'])
+            if username_owner and username_owner != uid:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Username already in use by another user"
+                )
         
-        # Atualizar no Firebase
-        db_service.update_user(uid, update_data)
+        # Atualizar no Firebase (uma única escrita multi-caminho)
+        await db_service.update_user(uid, update_data, previous=existing_user)
+        if 'password' in update_data:
+            token_cache.invalidate_subject(uid)
         
-        # Buscar usuário atualizado
-        updated_user = db_service.get_user(uid)
+        # Montar a resposta localmente, sem reler o usuário
+        updated_user = {**existing_user, **update_data}
         
         # Remover senha antes de retornar
         if 'password' in updated_user:
@@ -208,7 +231,7 @@ async def update_user(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating user: {e}")
+        logger.error("Error updating user: %s", e)
         raise HTTPException(status_code=500, detail="Error updating user")
 
 @router.delete("/{uid}")
@@ -226,23 +249,18 @@ async def delete_user(
             )
             
         # Verificar se usuário existe
-        existing_user = db_service.get_user(uid)
+        existing_user = await db_service.get_user(uid)
         if existing_user is None:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Deletar usuário e seus dados vitais
-        db_service.delete_user(uid)
-        
-        # Também deletar dados vitais associados
-        try:
-            db_service._connector.delete_data(f"vital_data/{uid}")
-        except Exception as e:
-            logger.warning(f"Could not delete vital data for user {uid}: {e}")
+        # Deletar usuário, dados vitais e índice numa única escrita
+        await db_service.delete_user(uid, user=existing_user)
+        token_cache.invalidate_subject(uid)
         
         return {"message": "User deleted successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting user: {e}")
+        logger.error("Error deleting user: %s", e)
         raise HTTPException(status_code=500, detail="Error deleting user")
\ No newline at end of file
@@ -1,26 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from core.config import VITAL_HISTORY_MAX_RANGE_DAYS, LIST_PAGE_SIZE, LIST_MAX_PAGE_SIZE, LIST_STREAM_PAGE_SIZE
 from core.services.db_service import DBService
 from core.logger import get_logger
 from core.schemas.user import UserVitalData
 from core.schemas.dto.user_dto import VitalResponseDTO
 from core.security.auth_middleware import get_current_user
 from core.dependencies import get_db_service
+from core.routes.streaming import json_object_response
+from core.services.vital_history import downsample, to_millis
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="", tags=["vitals"])
 # Buscar todos os dados vitais (apenas para administradores)
 @router.get("/")
 async def get_all_vital_data(
+    limit: Optional[int] = Query(None, ge=1, le=LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    shallow: bool = False,
     current_user: str = Depends(get_current_user),
     db_service: DBService = Depends(get_db_service)
 ):
     try:
-        vital_data = db_service._connector.get_data("vital_data") or {}
-        return vital_data
+        # Mesmos modos de GET /users/: página com cursor, só UIDs ou objeto completo transmitido
+        if shallow:
+            uids, next_cursor = await db_service.get_vital_data_ids(limit or LIST_PAGE_SIZE, cursor)
+            return {"uids": uids, "next_cursor": next_cursor}
+
+        if limit is not None or cursor is not None:
+            vital_data, next_cursor = await db_service.get_vital_data_page(limit or LIST_PAGE_SIZE, cursor)
+            return {"items": vital_data, "next_cursor": next_cursor}
+
+        return await json_object_response(db_service.iter_vital_data(LIST_STREAM_PAGE_SIZE))
     except Exception as e:
-        logger.error(f"Error getting all vital data: {e}")
+        logger.error("Error getting all vital data: %s", e)
         raise HTTPException(status_code=500, detail="Error getting vital data")
 
+# Histórico de dados vitais, com downsampling opcional
+@router.get("/{uid}/history")
+async def get_user_vital_history(
+    uid: str,
+    start: datetime = Query(..., alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    step: Optional[int] = Query(None, gt=0, description="Intervalo de agregação em segundos"),
+    current_user: str = Depends(get_current_user),
+    db_service: DBService = Depends(get_db_service)
+):
+    try:
+        # Verificar autorização
+        if uid != current_user:
+            raise HTTPException(
+                status_code=403,
+                detail="Not authorized to access this user's vital data"
+            )
+
+        end = end or datetime.now(timezone.utc)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        if end < start:
+            raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+        if end - start > timedelta(days=VITAL_HISTORY_MAX_RANGE_DAYS):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Range must be at most {VITAL_HISTORY_MAX_RANGE_DAYS} days"
+            )
+
+        readings = await db_service.get_vital_history(uid, start, end)
+        if step is None:
+            return {"uid": uid, "readings": readings}
+        return {"uid": uid, "step": step, "points": downsample(readings, to_millis(start), step)}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error getting vital history: %s", e)
+        raise HTTPException(status_code=500, detail="Error getting vital history")
+
 # Buscar dados vitais do usuário
 @router.get("/{uid}", response_model=VitalResponseDTO)
 async def get_user_vital_data(
@@ -35,14 +93,13 @@ async def get_user_vital_data(
                 status_code=403,
                 detail="Not authorized to access this user's vital data"
             )
-            
-        # Verificar se usuário existe
-        user = db_service.get_user(uid)
-        if user is None:
+
+        # Verificar se usuário existe (cache de usuários conhecidos antes do banco)
+        if not await db_service.user_exists(uid):
             raise HTTPException(status_code=404, detail="User not found")
-        
+
         # Buscar dados vitais
-        vital_data = db_service.get_user_vital_data(uid)
+        vital_data = await db_service.get_user_vital_data(uid)
         if vital_data is None:
             raise HTTPException(status_code=404, detail="Vital data not found")
         
@@ -51,7 +108,7 @@ async def get_user_vital_data(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting vital data: {e}")
+        logger.error("Error getting vital data: %s", e)
         raise HTTPException(status_code=500, detail="Error getting vital data")
 
 # Criar/atualizar dados vitais
@@ -69,30 +126,16 @@ async def create_vital_data(
                 status_code=403,
                 detail="Not authorized to update this user's vital data"
             )
-            
-        # Verificar se usuário existe
-        user = db_service.get_user(uid)
-        if user is None:
+
+        # Upsert cego: uma única escrita, com a existência do usuário conferida em paralelo
+        if not await db_service.upsert_vital_if_user_exists(uid, vital_data.model_dump()):
             raise HTTPException(status_code=404, detail="User not found")
-        
-        vital_dict = vital_data.model_dump()
-        
-        # Verificar se dados já existem
-        existing_data = db_service.get_user_vital_data(uid)
-        
-        if existing_data:
-            # Atualizar dados existentes
-            db_service.update_vital(uid, vital_dict)
-            return {"message": "Vital data updated successfully"}
-        else:
-            # Criar novos dados
-            db_service.set_vital(uid, vital_dict)
-            return {"message": "Vital data created successfully"}
+        return {"message": "Vital data saved successfully"}
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating/updating vital data: {e}")
+        logger.error("Error creating/updating vital data: %s", e)
         raise HTTPException(status_code=500, detail="Error saving vital data")
 
 # Atualizar dados vitais
@@ -103,6 +146,7 @@ async def update_vital_data(
     current_user: str = Depends(get_current_user),
     db_service: DBService = Depends(get_db_service)
 ):
+    """Mesma semântica do POST: upsert do snapshot, criado se ainda não existir"""
     try:
         # Verificar autorização
         if uid != current_user:
@@ -110,24 +154,15 @@ async def update_vital_data(
                 status_code=403,
                 detail="Not authorized to update this user's vital data"
             )
-            
-        # Verificar se usuário existe
-        user = db_service.get_user(uid)
-        if user is None:
+
+        # Upsert cego: uma única escrita, com a existência do usuário conferida em paralelo
+        if not await db_service.upsert_vital_if_user_exists(uid, vital_data.model_dump()):
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Verificar se dados vitais existem
-        existing_data = db_service.get_user_vital_data(uid)
-        if existing_data is None:
-            raise HTTPException(status_code=404, detail="Vital data not found")
-        
-        vital_dict = vital_data.model_dump()
-        db_service.update_vital(uid, vital_dict)
-        
         return {"message": "Vital data updated successfully"}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating vital data: {e}")
+        logger.error("Error updating vital data: %s", e)
         raise HTTPException(status_code=500, detail="Error updating vital data")
\ No newline at end of file
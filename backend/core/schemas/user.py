@@ -1,5 +1,6 @@
 import re
 from datetime import datetime, time
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from .emergency_contact import EmergencyContact
 
@@ -39,5 +40,22 @@ class UserVitalData(BaseModel):
     spo2: float
     stress_level: float
 
+class UserVitalDataBatch(BaseModel):
+    readings: list[UserVitalData] = Field(..., min_length=1, max_length=1000)
+
+class StreamVitalReading(UserVitalData):
+    ts: Optional[int] = None  # Epoch em milissegundos; ausente usa o horário de recebimento
+
+class RawSensorSample(BaseModel):
+    """Amostra bruta do relógio; as features da janela são calculadas no servidor"""
+    heart_rate: float
+    respiration_rate: float
+    spo2: float
+    stress_level: float
+    accel_x: float
+    accel_y: float
+    accel_z: float
+    ts: Optional[int] = None
+
 class UserVitalDataResponse(UserVitalData):
     uid: str
\ No newline at end of file
@@ -1,31 +1,67 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from core.config import AUTH_TOKEN_CACHE_MAX_ENTRIES, AUTH_TOKEN_CACHE_TTL_SECONDS, ADMIN_UIDS
 from core.security.jwt_handler import JWTHandler
+from core.security.token_cache import VerifiedTokenCache
+from core.metrics import (
+    AUTH_VERIFY_DURATION, AUTH_TOKEN_CACHE_HITS, AUTH_TOKEN_CACHE_MISSES, AUTH_TOKEN_CACHE_EVICTIONS
+)
 from core.logger import get_logger
 
 logger = get_logger(__name__)
 security = HTTPBearer()
+token_cache = VerifiedTokenCache(AUTH_TOKEN_CACHE_MAX_ENTRIES, AUTH_TOKEN_CACHE_TTL_SECONDS)
+for metric, field in (
+    (AUTH_TOKEN_CACHE_HITS, "hits"), (AUTH_TOKEN_CACHE_MISSES, "misses"), (AUTH_TOKEN_CACHE_EVICTIONS, "evictions")
+):
+    metric.set_function(lambda field=field: {(): token_cache.stats()[field]})
+
+def authenticate_token(token: str) -> str:
+    """Subject de um access token; a assinatura só é verificada na primeira vez"""
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    with AUTH_VERIFY_DURATION.time():
+        payload = JWTHandler.decode_token(token)
+    user_id = payload.get("sub")
+    if user_id is None:
+        logger.warning("Token without subject")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    if payload.get("exp") is not None:
+        token_cache.set(token, user_id, payload["exp"])
+    return user_id
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        token = credentials.credentials
-        payload = JWTHandler.decode_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            logger.warning("Token without subject")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        
-        logger.info(f"User {user_id} authenticated successfully")
+        user_id = authenticate_token(credentials.credentials)
+        logger.debug("User %s authenticated successfully", user_id)
         return user_id
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error validating token: {e}")
+        logger.error("Error validating token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
-        )
\ No newline at end of file
+        )
+
+def is_admin_token(token: str) -> bool:
+    try:
+        return authenticate_token(token) in ADMIN_UIDS
+    except HTTPException:
+        return False
+
+async def get_admin_user(current_user: str = Depends(get_current_user)):
+    """Como get_current_user, mas só para UIDs listados em ADMIN_UIDS"""
+    if current_user not in ADMIN_UIDS:
+        logger.warning("Non-admin user %s tried to access an admin route", current_user)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -21,6 +21,11 @@ class JWTHandler:
         to_encode = {**data, "exp": expire, "iat": JWTHandler._now(), "type": "refresh"}
         return jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
     
+    @staticmethod
+    def get_expiry(token: str) -> float | None:
+        """exp do token sem verificar a assinatura: use só com tokens já autenticados"""
+        return jwt.get_unverified_claims(token).get("exp")
+
     @staticmethod
     def decode_token(token: str) -> dict:
         try:
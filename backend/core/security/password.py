@@ -1,14 +1,35 @@
 import bcrypt
 from fastapi import HTTPException, status
+from core.executors import run_cpu
+
+def _hashpw(password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 def hash_password(password: str) -> str:
         try:
-            return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+            return _hashpw(password)
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error hashing password: {e}")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
         try:
-            return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+            return _checkpw(plain_password, hashed_password)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error verifying password: {e}")
+
+async def hash_password_async(password: str) -> str:
+        """hash_password executado no pool de CPU, fora do event loop"""
+        try:
+            return await run_cpu(_hashpw, password)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error hashing password: {e}")
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """verify_password executado no pool de CPU, fora do event loop"""
+        try:
+            return await run_cpu(_checkpw, plain_password, hashed_password)
         except Exception as e:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error verifying password: {e}")
\ No newline at end of file
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error verifying password: {e}")
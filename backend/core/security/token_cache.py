@@ -0,0 +1,52 @@
+import hashlib
+import time
+from typing import Optional
+from core.cache import TTLCache, MISSING
+
+class VerifiedTokenCache:
+    """Tokens já verificados -> subject, para evitar refazer a verificação da assinatura
+
+    A chave é o SHA-256 do token, nunca o token em si. Cada entrada vive até o
+    menor entre o exp do token e o TTL configurado. Revogar um subject descarta
+    todas as entradas dele criadas até aquele momento.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self._tokens = TTLCache(max_entries, ttl_seconds)
+        # subject -> instante da revogação; basta guardá-lo pelo TTL das entradas
+        self._revoked = TTLCache(max_entries, ttl_seconds)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[str]:
+        """Subject do token se ele já foi verificado e continua válido"""
+        digest = self._digest(token)
+        entry = self._tokens.get(digest)
+        if entry is MISSING:
+            return None
+        subject, exp, cached_at = entry
+        revoked_at = self._revoked.get(subject)
+        if time.time() >= exp or (revoked_at is not MISSING and cached_at <= revoked_at):
+            self._tokens.invalidate(digest)
+            return None
+        return subject
+
+    def set(self, token: str, subject: str, exp: float) -> None:
+        ttl = exp - time.time()
+        if ttl > 0:
+            self._tokens.set(self._digest(token), (subject, exp, time.monotonic()), ttl_seconds=ttl)
+
+    def invalidate(self, token: str) -> None:
+        self._tokens.invalidate(self._digest(token))
+
+    def invalidate_subject(self, subject: str) -> None:
+        self._revoked.set(subject, time.monotonic())
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._revoked.clear()
+
+    def stats(self) -> dict:
+        return self._tokens.stats()
@@ -1,47 +1,368 @@
+import threading
+import time
+import uuid
+from pathlib import Path
 import pandas as pd
 import numpy as np
+from typing import Callable, Optional
 from core.logger import get_logger
-from core.config import DATA_PATH
-from core.ai.model import PanicDetectionModel
+from core.config import (
+    DATA_PATH, RETRAIN_DEBOUNCE_SECONDS, RETRAIN_MAX_BATCH,
+    MODEL_TRAINING_MODE, ONLINE_FULL_REFIT_EVERY,
+    FEEDBACK_LOG_PATH, FEEDBACK_LOG_COMPACT_ENTRIES, FEEDBACK_LOG_FSYNC,
+    MODEL_ARTIFACT_DIR, MODEL_ARTIFACT_KEEP, MODEL_ARTIFACT_WATCH_SECONDS, MODEL_REGISTRY_KEEP,
+    PROFILING_SAMPLE_RATE
+)
+from core.ai.model import PanicDetectionModel, fit_model_state
+from core.metrics import MODEL_TRAINING_DURATION
+from core.profiling import ProfileStore, profile_block
+from core.executors import run_cpu_sync
+from core.ai.feature_index import FeatureIndex, FEATURE_MAX_ABS
+from core.ai.data_store import TrainingDataStore
+from core.ai.registry import ModelRegistry, ModelVersion
+from core.ai.artifacts import (
+    data_hash, artifact_path, save_model, load_model, read_artifact, list_artifacts, prune_artifacts,
+    read_active_pointer, write_active_pointer
+)
+from core.services.retrain_worker import RetrainWorker
 
 logger = get_logger(__name__)
 
+def validate_feedback(features: dict, label: int, feature_order: list[str]) -> None:
+    """Recusa (ValueError) feedback que não pode entrar no dataset, antes de ir para a fila"""
+    missing = [col for col in feature_order if col not in features]
+    unknown = [key for key in features if key not in feature_order]
+    if missing or unknown:
+        raise ValueError(f"Feedback features must be exactly {feature_order} (missing {missing}, unknown {unknown})")
+    for col in feature_order:
+        value = features[col]
+        if not np.isfinite(value) or abs(value) > FEATURE_MAX_ABS:
+            raise ValueError(f"Feature {col} must be finite and within ±{FEATURE_MAX_ABS:g}")
+    if label not in (0, 1):
+        raise ValueError("Feedback label must be 0 or 1")
+
 class AIService:
-    def __init__(self) -> None:
-        self._data = pd.read_csv(DATA_PATH)
-        self._model = PanicDetectionModel(data=self._data)
-        self._model.start_model()
+    def __init__(
+        self,
+        profile_store: ProfileStore | None = None,
+        on_model_updated: Optional[Callable[[ModelRegistry], None]] = None,
+        watch_seconds: float = MODEL_ARTIFACT_WATCH_SECONDS
+    ) -> None:
+        # Retreinos amostrados vão para o mesmo armazenamento dos perfis de requisição
+        self._profile_store = profile_store
+        # Chamado após a inicialização e a cada troca de versão (ex.: publicar aos workers)
+        self._on_model_updated = on_model_updated
+        self._registry = ModelRegistry(MODEL_REGISTRY_KEEP)
+        # Serializa trocas de versão e o aviso correspondente ao hook
+        self._swap_lock = threading.Lock()
+        # Artefatos já conhecidos (nome -> mtime); os que surgirem depois são importados
+        self._artifact_lock = threading.Lock()
+        self._seen_artifacts = self._scan_artifacts()
+        self._store = TrainingDataStore(DATA_PATH, FEEDBACK_LOG_PATH, fsync=FEEDBACK_LOG_FSYNC)
+        data = self._store.frame()
+        # Linhas reais para aquecer cada modelo novo, sem materializar o dataset a cada troca
+        self._warmup_rows = data.head(32).copy()
+        self._index = self._build_index(data)
+        self._install(self._load_or_train(data))
+        self._retrain_worker = RetrainWorker(
+            apply_batch=self._apply_feedback_batch,
+            debounce_seconds=RETRAIN_DEBOUNCE_SECONDS,
+            max_batch=RETRAIN_MAX_BATCH
+        )
+        self._retrain_worker.start()
+        self._watch_seconds = watch_seconds
+        self._stop_watching = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        if watch_seconds > 0:
+            self._watcher = threading.Thread(target=self._watch_artifacts, name="artifact-watcher", daemon=True)
+            self._watcher.start()
         logger.info("AI Service initialized")
-    
+
+    @property
+    def _model(self) -> PanicDetectionModel:
+        return self._registry.active.model
+
+    @property
+    def feature_order(self) -> list[str]:
+        return self._model.feature_order
+
     def predict(self, info: dict) -> bool:
         """Faz predição baseada apenas nos dados vitais, sem UID"""
-        logger.info(f"Realizing prediction with data: {info}")
-        
         result = self._model.predict_information(info=info)
         
-        logger.info(f"Prediction result: {result}")
+        logger.debug("Prediction result: %s", result)
         return result
+
+    def predict_many(self, infos: list[dict]) -> list[bool]:
+        """Faz predição em lote com uma única chamada ao pipeline"""
+        logger.debug("Realizing batch prediction for %s readings", len(infos))
+
+        results = self._model.predict_batch(infos)
+
+        return [bool(result) for result in results]
     
     def set_feedback(self, features: dict, label: int):
-        """Recebe feedback sem vincular a usuário específico"""
-        logger.info(f"Receiving feedback: {features} -> {label}")
-        
-        input_df = pd.DataFrame([features])
-        match = self._data[
-            self._data[list(features.keys())].apply(
-            lambda row: np.all(np.isclose(row.values, input_df.values[0], atol=1e-4)),
-            axis=1
-        )]
-
-        if not match.empty:
-            self._data.loc[match.index, 'panic_attack'] = label
+        """Recebe feedback sem vincular a usuário específico e agenda o retreino
+
+        ValueError se as features não forem exatamente as do modelo ou estiverem fora da faixa.
+        """
+        validate_feedback(features, label, self.feature_order)
+        logger.debug("Receiving feedback with label %s", label)
+        self._retrain_worker.submit((features, label))
+
+    def wait_for_retrain(self, timeout: float | None = None) -> bool:
+        """Aguarda a aplicação de todos os feedbacks pendentes"""
+        return self._retrain_worker.wait_idle(timeout)
+
+    def models(self) -> list[dict]:
+        """Versões do modelo em memória com seus metadados, da mais recente à mais antiga"""
+        return self._registry.list()
+
+    def activate_model(self, version: int) -> dict:
+        """Volta (ou avança) para uma versão em memória, sem retreinar
+
+        A escolha vale após um reinício enquanto os dados não mudarem (ponteiro
+        ACTIVE_POINTER). O próximo retreino por feedback parte dela.
+        """
+        with self._swap_lock:
+            entry = self._registry.activate(version)
+            self._notify_model_updated()
+        logger.warning("Model version %s activated by request", version)
+        self._pin(entry)
+        return {**entry.describe(), "active": True}
+
+    def close(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=self._watch_seconds + 1)
+        self._retrain_worker.stop()
+        self._store.close()
+
+    def _notify_model_updated(self) -> None:
+        if self._on_model_updated is None:
+            return
+        try:
+            self._on_model_updated(self._registry)
+        except Exception as e:
+            logger.error("Error in model update hook: %s", e)
+
+    def _warm_up(self, model: PanicDetectionModel) -> None:
+        """Roda o kernel sobre algumas linhas reais antes da troca; KeyError se as colunas não batem"""
+        sample = self._warmup_rows[model.feature_order].to_numpy(dtype=np.float64)
+        model.kernel.predict(sample)
+        model.kernel.predict_proba(sample)
+
+    def _install(self, model: PanicDetectionModel, activate: bool = True) -> ModelVersion:
+        """Aquece o modelo e o registra como nova versão, ativa por padrão"""
+        self._warm_up(model)
+        model.metadata.setdefault("created_at", time.time())
+        # Troca atômica: predições em andamento continuam usando o modelo anterior
+        with self._swap_lock:
+            entry = self._registry.register(model, activate=activate)
+            self._notify_model_updated()
+        logger.info(
+            "Model version %s %s (%s)", entry.version, "active" if activate else "registered", model.metadata.get("source")
+        )
+        return entry
+
+    def _new_model(self, data: pd.DataFrame) -> PanicDetectionModel:
+        return PanicDetectionModel(
+            data=data,
+            online=MODEL_TRAINING_MODE == "online",
+            full_refit_every=ONLINE_FULL_REFIT_EVERY
+        )
+
+    def _load_or_train(self, data: pd.DataFrame) -> PanicDetectionModel:
+        """Carrega o artefato salvo para estes dados; treina apenas se o hash mudou"""
+        content_hash = data_hash(data, MODEL_TRAINING_MODE)
+        model = self._load_pinned(data, content_hash)
+        if model is not None:
+            return model
+        path = artifact_path(MODEL_ARTIFACT_DIR, content_hash)
+        model = load_model(path, data, content_hash, ONLINE_FULL_REFIT_EVERY)
+        if model is not None:
+            model.metadata.update(source="artifact", artifact=path.name, data_hash=content_hash)
+            model.metadata.setdefault("rows", len(data))
+            return model
+
+        logger.info("No model artifact for current data, training")
+        started = time.perf_counter()
+        model = self._new_model(data)
+        model.start_model()
+        model.metadata.update(
+            source="startup", data_hash=content_hash, fit_seconds=round(time.perf_counter() - started, 4)
+        )
+        self._save_artifact(model, data, content_hash)
+        return model
+
+    def _load_pinned(self, data: pd.DataFrame, content_hash: str) -> Optional[PanicDetectionModel]:
+        """Versão ativada pelo administrador, se os dados não mudaram desde a ativação"""
+        pointer = read_active_pointer(MODEL_ARTIFACT_DIR)
+        if pointer is None or pointer.get("data_hash") != content_hash:
+            return None
+        payload = read_artifact(Path(MODEL_ARTIFACT_DIR) / pointer["artifact"])
+        if payload is None:
+            return None
+        logger.info("Loading model %s activated by request", pointer["artifact"])
+        model = PanicDetectionModel.from_artifact(payload, data, ONLINE_FULL_REFIT_EVERY)
+        model.metadata.update(source="pinned", artifact=pointer["artifact"])
+        return model
+
+    def _pin(self, entry: ModelVersion) -> None:
+        """Grava o ponteiro da versão ativada, sem alterar os metadados nem o artefato dela"""
+        try:
+            artifact = entry.model.metadata.get("artifact")
+            if artifact is None or not (Path(MODEL_ARTIFACT_DIR) / artifact).exists():
+                # Versões incrementais não têm artefato: o ponteiro recebe um próprio
+                path = artifact_path(MODEL_ARTIFACT_DIR, uuid.uuid4().hex)
+                self._write_artifact(entry.model, path, entry.model.metadata.get("data_hash", ""))
+                artifact = path.name
+            write_active_pointer(MODEL_ARTIFACT_DIR, artifact, data_hash(self._store.frame(), MODEL_TRAINING_MODE))
+        except Exception as e:
+            logger.error("Error persisting the activated model version: %s", e)
+
+    def _save_artifact(self, model: PanicDetectionModel, data: pd.DataFrame, content_hash: str | None = None) -> None:
+        try:
+            content_hash = content_hash or data_hash(data, MODEL_TRAINING_MODE)
+            path = artifact_path(MODEL_ARTIFACT_DIR, content_hash)
+            model.metadata["artifact"] = path.name
+            self._write_artifact(model, path, content_hash)
+        except Exception as e:
+            logger.error("Error saving model artifact: %s", e)
+
+    def _write_artifact(self, model: PanicDetectionModel, path: Path, content_hash: str) -> None:
+        # Sob o lock o watcher não vê o arquivo antes de ele ser marcado como conhecido
+        with self._artifact_lock:
+            save_model(model, path, content_hash)
+            self._seen_artifacts[path.name] = path.stat().st_mtime
+        prune_artifacts(MODEL_ARTIFACT_DIR, MODEL_ARTIFACT_KEEP)
+
+    def _scan_artifacts(self) -> dict[str, float]:
+        seen = {}
+        for path in list_artifacts(MODEL_ARTIFACT_DIR):
+            try:
+                seen[path.name] = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+        return seen
+
+    def _watch_artifacts(self) -> None:
+        while not self._stop_watching.wait(self._watch_seconds):
+            try:
+                self._load_new_artifacts()
+            except Exception as e:
+                logger.error("Error watching model artifacts: %s", e)
+
+    def _load_new_artifacts(self) -> None:
+        """Importa artefatos gravados por outro processo (ex.: um treino offline) desde a última varredura
+
+        Só entra em uso o artefato treinado sobre os dados atuais (mesmo data_hash); os
+        demais viram versões inativas, promovidas apenas por activate_model.
+        """
+        with self._artifact_lock:
+            current = self._scan_artifacts()
+            new = [name for name, mtime in current.items() if self._seen_artifacts.get(name) != mtime]
+            self._seen_artifacts = current
+        if not new:
+            return
+
+        data = self._store.frame()
+        content_hash = data_hash(data, MODEL_TRAINING_MODE)
+        for name in sorted(new, key=current.get):
+            payload = read_artifact(Path(MODEL_ARTIFACT_DIR) / name)
+            if payload is None:
+                continue
+            model = PanicDetectionModel.from_artifact(payload, data, ONLINE_FULL_REFIT_EVERY)
+            model.metadata.update(source="watched", artifact=name, data_hash=payload.get("data_hash"))
+            matches = payload.get("data_hash") == content_hash
+            if not matches:
+                logger.warning("Model artifact %s was trained on other data, registering it as inactive", name)
+            try:
+                self._install(model, activate=matches)
+            except KeyError as e:
+                logger.warning("Model artifact %s does not match the training columns: %s", name, e)
+
+    def _build_index(self, data: pd.DataFrame) -> FeatureIndex:
+        feature_columns = data.columns[:-1]
+        index = FeatureIndex(feature_columns, atol=1e-4)
+        index.add_many(data[feature_columns].to_numpy(dtype=np.float64), range(len(data)))
+        return index
+
+    def _merge_feedback(self, batch: list[tuple[dict, int]]) -> list[tuple[dict, int]]:
+        """Registra cada feedback no log append-only e no índice de duplicatas
+
+        Um item inválido é descartado sozinho; retorna os itens efetivamente registrados.
+        """
+        merged = []
+        for features, label in batch:
+            if not self._index.accepts(features):
+                logger.warning("Discarding feedback with non-finite or out-of-range feature values")
+                continue
+            try:
+                self._merge_item(features, label)
+            except Exception as e:
+                logger.error("Discarding feedback item that could not be merged: %s", e)
+                continue
+            merged.append((features, label))
+        return merged
+
+    def _merge_item(self, features: dict, label: int) -> None:
+        # validate_feedback garante exatamente as colunas do índice
+        matches = self._index.lookup(features)
+        if matches:
+            for position in matches:
+                self._store.set_label(position, label)
             logger.info("Feedback added for existing data")
         else:
-            new_row = {**features, 'panic_attack': label}
-            self._data = pd.concat([self._data, pd.DataFrame([new_row])], ignore_index=True)
+            position = self._store.append({**features, self._store.label_column: label})
+            self._index.add(position, features)
             logger.info("New feedback data added")
 
-        self._data.to_csv(DATA_PATH, index=False)
-        self._model.update_data(self._data)
-        self._model.start_model()
-        logger.info("AI model retrained with new feedback")
\ No newline at end of file
+    def _update_incrementally(self, batch: list[tuple[dict, int]]) -> PanicDetectionModel:
+        """partial_fit só com o lote: custo proporcional ao lote, não ao dataset"""
+        with MODEL_TRAINING_DURATION.time("incremental"):
+            new_model = self._model.copy()
+            new_model.partial_update([features for features, _ in batch], [label for _, label in batch])
+        # Hash e artefato dependem do dataset inteiro e ficam para o próximo ajuste completo
+        new_model.metadata.pop("data_hash", None)
+        new_model.metadata.pop("artifact", None)
+        new_model.metadata["source"] = "incremental"
+        logger.info("AI model updated incrementally with %s feedback items", len(batch))
+        return new_model
+
+    def _refit(self, data: pd.DataFrame, batch: list[tuple[dict, int]]) -> PanicDetectionModel:
+        # Ajuste completo no pool de processos para não disputar o GIL com as requisições
+        with MODEL_TRAINING_DURATION.time("refit"):
+            state = run_cpu_sync(fit_model_state, data, MODEL_TRAINING_MODE == "online")
+        new_model = PanicDetectionModel.from_artifact(state, data, ONLINE_FULL_REFIT_EVERY)
+        new_model.metadata["source"] = "refit"
+        logger.info("AI model retrained with %s new feedback items", len(batch))
+        return new_model
+
+    def _apply_feedback_batch(self, batch: list[tuple[dict, int]]) -> None:
+        """Executado na thread de retreino: registra o lote, treina e troca o modelo
+
+        No modo online o lote só passa por partial_fit; o dataset é materializado,
+        hasheado e salvo como artefato apenas no ajuste completo periódico.
+        """
+        data = None
+        with profile_block(self._profile_store, PROFILING_SAMPLE_RATE, "retrain", batch_size=len(batch)):
+            batch = self._merge_feedback(batch)
+            if not batch:
+                return
+            started = time.perf_counter()
+            if self._model.online and not self._model.needs_full_refit:
+                new_model = self._update_incrementally(batch)
+            else:
+                data = self._store.frame()
+                new_model = self._refit(data, batch)
+            fit_seconds = time.perf_counter() - started
+
+        new_model.metadata.update(rows=len(self._store), fit_seconds=round(fit_seconds, 4), created_at=time.time())
+        if data is not None:
+            new_model.metadata["data_hash"] = data_hash(data, MODEL_TRAINING_MODE)
+        self._install(new_model)
+
+        if data is not None:
+            self._save_artifact(new_model, data, new_model.metadata["data_hash"])
+        self._store.maybe_compact(FEEDBACK_LOG_COMPACT_ENTRIES)
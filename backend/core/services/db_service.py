@@ -1,50 +1,321 @@
-from core.db.connector import RTDBConnector
-from core.config import USER_SENSOR_REF, USER_PERSONAL_REF
+import asyncio
+import copy
+import inspect
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Optional, Union
+from core.db.keys import generate_push_id, encode_key
+from core.config import (
+    USER_SENSOR_REF, USER_PERSONAL_REF, USER_INDEX_REF, USER_VITAL_HISTORY_REF,
+    DB_CACHE_TTL_SECONDS, DB_CACHE_MAX_ENTRIES, USER_EXISTS_CACHE_TTL_SECONDS, USER_EXISTS_CACHE_MAX_ENTRIES
+)
+from core.cache import TTLCache, MISSING
+from core.services.vital_history import bucket_key, bucket_range, flatten_buckets, to_millis
+from core.executors import run_io
+from core.metrics import DB_CACHE_HITS, DB_CACHE_MISSES, DB_CACHE_EVICTIONS
 from core.logger import get_logger
 
+if TYPE_CHECKING:
+    # Só para anotações: importar os conectores carrega o firebase_admin
+    from core.db.connector import RTDBConnector
+    from core.db.async_connector import AsyncRTDBConnector
 
 logger = get_logger(__name__)
 
 class DBService:
-    def __init__(self, connector: RTDBConnector) -> None:
+    """Acesso ao Realtime Database sobre um conector síncrono ou assíncrono
+
+    Chamadas de um conector síncrono rodam no pool de I/O; as de um conector
+    assíncrono são aguardadas diretamente no event loop.
+
+    Usuários e dados vitais passam por um cache LRU + TTL de leitura. As escritas
+    deste processo invalidam o cache; escritas de outros processos ficam visíveis
+    em no máximo DB_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(self, connector: Union["RTDBConnector", "AsyncRTDBConnector"]) -> None:
         self._connector = connector
+        self._user_cache = TTLCache(DB_CACHE_MAX_ENTRIES, DB_CACHE_TTL_SECONDS)
+        self._vital_cache = TTLCache(DB_CACHE_MAX_ENTRIES, DB_CACHE_TTL_SECONDS)
+        # Só o fato de o UID existir: entradas mínimas, muito mais usuários que o cache de leitura
+        self._known_users = TTLCache(USER_EXISTS_CACHE_MAX_ENTRIES, USER_EXISTS_CACHE_TTL_SECONDS)
+
+    async def _call(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await run_io(method, *args, **kwargs)
+
+    async def _cached_get(self, cache: TTLCache, key: str, db_ref: str):
+        cached = cache.get(key)
+        if cached is MISSING:
+            # Uma escrita concluída durante a leitura invalida a chave; o valor lido não entra no cache
+            generation = cache.generation()
+            cached = await self._call(self._connector.get_data, db_ref)
+            if cached is not None:
+                cache.set(key, cached, generation=generation)
+        # Cópia para que as rotas possam alterar o resultado (ex.: remover a senha)
+        return copy.deepcopy(cached)
+
+    async def _page(self, db_ref: str, limit: int, cursor: Optional[str] = None) -> tuple[dict, Optional[str]]:
+        """Uma página de filhos ordenados pela chave a partir de cursor (inclusive)
+
+        Lê limit + 1 filhos: o excedente vira o cursor da próxima página.
+        """
+        items = await self._call(
+            self._connector.query_data, db_ref, start_at=cursor, limit_to_first=limit + 1
+        ) or {}
+        next_cursor = None
+        if len(items) > limit:
+            next_cursor = list(items)[-1]
+            del items[next_cursor]
+        return items, next_cursor
+
+    async def _iter_pages(self, db_ref: str, page_size: int) -> AsyncIterator[dict]:
+        cursor = None
+        while True:
+            items, cursor = await self._page(db_ref, page_size, cursor)
+            if items:
+                yield items
+            if cursor is None:
+                return
+
+    async def _page_keys(self, db_ref: str, limit: int, cursor: Optional[str] = None) -> tuple[list[str], Optional[str]]:
+        """Página de chaves com a mesma consulta limitada de _page
+
+        A API não combina shallow com orderBy/startAt/limitToFirst; uma leitura shallow
+        traria todas as chaves do nó a cada página, então lemos só os filhos da página.
+        """
+        items, next_cursor = await self._page(db_ref, limit, cursor)
+        return list(items), next_cursor
+
+    def cache_stats(self) -> dict:
+        return {
+            "users": self._user_cache.stats(),
+            "vital_data": self._vital_cache.stats(),
+            "known_users": self._known_users.stats(),
+        }
+
+    def export_cache_metrics(self) -> None:
+        """Publica os contadores dos caches deste serviço nos db_cache_*_total de /metrics"""
+        for metric, field in ((DB_CACHE_HITS, "hits"), (DB_CACHE_MISSES, "misses"), (DB_CACHE_EVICTIONS, "evictions")):
+            metric.set_function(lambda field=field: {
+                (cache,): stats[field] for cache, stats in self.cache_stats().items()
+            })
         
-    def get_all_users(self):
-        logger.info("Getting all users")
-        return self._connector.get_data(USER_PERSONAL_REF)
+    async def get_all_users(self):
+        logger.debug("Getting all users")
+        return await self._call(self._connector.get_data, USER_PERSONAL_REF)
+
+    async def get_users_page(self, limit: int, cursor: Optional[str] = None) -> tuple[dict, Optional[str]]:
+        logger.debug("Getting users page (limit=%s, cursor=%s)", limit, cursor)
+        return await self._page(USER_PERSONAL_REF, limit, cursor)
+
+    async def get_user_ids(self, limit: int, cursor: Optional[str] = None) -> tuple[list[str], Optional[str]]:
+        logger.debug("Getting user ids (limit=%s, cursor=%s)", limit, cursor)
+        return await self._page_keys(USER_PERSONAL_REF, limit, cursor)
+
+    def iter_users(self, page_size: int) -> AsyncIterator[dict]:
+        """Todos os usuários, página a página, sem materializar o nó inteiro"""
+        return self._iter_pages(USER_PERSONAL_REF, page_size)
+
+    async def get_user(self, uid):
+        logger.debug("Getting user %s", uid)
+        generation = self._known_users.generation()
+        user = await self._cached_get(self._user_cache, uid, f"{USER_PERSONAL_REF}/{uid}")
+        if user is not None:
+            self._known_users.set(uid, True, generation=generation)
+        return user
+
+    async def user_exists(self, uid: str) -> bool:
+        """Se o usuário existe, sem ida ao banco quando o UID foi visto há pouco
 
-    def get_user(self, uid):
-        logger.info(f"Getting user {uid}")
-        return self._connector.get_data(f"{USER_PERSONAL_REF}/{uid}")
+        Remoções feitas por outros processos ficam visíveis em até USER_EXISTS_CACHE_TTL_SECONDS.
+        """
+        if self._known_users.get(uid) is not MISSING:
+            return True
+        return await self.get_user(uid) is not None
 
-    def create_user(self, uid, user_data):
-        logger.info(f"Creating user")
-        return self._connector.add_data(USER_PERSONAL_REF, user_data, uid)
+    @staticmethod
+    def _email_index_path(email: str) -> str:
+        return f"{USER_INDEX_REF}/emails/{encode_key(email)}"
+
+    @staticmethod
+    def _username_index_path(username: str) -> str:
+        return f"{USER_INDEX_REF}/usernames/{encode_key(username)}"
+
+    def _index_entries(self, uid: str, user_data: dict) -> dict:
+        entries = {}
+        if user_data.get("email"):
+            entries[self._email_index_path(user_data["email"])] = uid
+        if user_data.get("username"):
+            entries[self._username_index_path(user_data["username"])] = uid
+        return entries
+
+    async def find_uid_by_email(self, email: str):
+        logger.debug("Looking up user by email")
+        return await self._call(self._connector.get_data, self._email_index_path(email))
+
+    async def find_uid_by_username(self, username: str):
+        logger.debug("Looking up user by username")
+        return await self._call(self._connector.get_data, self._username_index_path(username))
+
+    async def create_user(self, uid, user_data):
+        """Cria o usuário e suas entradas de índice numa única atualização multi-caminho"""
+        logger.info("Creating user")
+        uid = uid or generate_push_id()
+        updates = {f"{USER_PERSONAL_REF}/{uid}": user_data, **self._index_entries(uid, user_data)}
+        await self._call(self._connector.multi_update, updates)
+        self._user_cache.invalidate(uid)
+        self._known_users.set(uid, True)
+        return {"message": "Data saved successfully", "uid": uid}
     
-    def update_user(self, uid, user_data):
-        logger.info(f"Updating user {uid}")
-        return self._connector.update_data(f"{USER_PERSONAL_REF}/{uid}", user_data)
+    async def update_user(self, uid, user_data, previous: dict | None = None):
+        """Atualiza os campos do usuário e, se email/username mudarem, o índice no mesmo write"""
+        logger.info("Updating user %s", uid)
+        updates = {
+            f"{USER_PERSONAL_REF}/{uid}/{field}": value
+            for field, value in user_data.items() if field != "uid"
+        }
+        previous = previous or {}
+        for field, index_path in (("email", self._email_index_path), ("username", self._username_index_path)):
+            if field in user_data and user_data[field] != previous.get(field):
+                if previous.get(field):
+                    updates[index_path(previous[field])] = None
+                updates[index_path(user_data[field])] = uid
+        try:
+            return await self._call(self._connector.multi_update, updates)
+        finally:
+            self._user_cache.invalidate(uid)
     
-    def delete_user(self, uid):
-        logger.info(f"Deleting user {uid}")
-        return self._connector.delete_data(f"{USER_PERSONAL_REF}/{uid}")
+    async def delete_user(self, uid, user: dict | None = None):
+        """Remove em cascata usuário, dados vitais e entradas de índice numa única atualização multi-caminho"""
+        logger.info("Deleting user %s", uid)
+        if user is None:
+            user = await self.get_user(uid) or {}
+        updates = {
+            f"{USER_PERSONAL_REF}/{uid}": None,
+            f"{USER_SENSOR_REF}/{uid}": None,
+            f"{USER_VITAL_HISTORY_REF}/{uid}": None,
+        }
+        updates.update({path: None for path in self._index_entries(uid, user)})
+        try:
+            await self._call(self._connector.multi_update, updates)
+        finally:
+            self._user_cache.invalidate(uid)
+            self._vital_cache.invalidate(uid)
+            self._known_users.invalidate(uid)
+        return {"message": "Data deleted successfully"}
+
+    async def backfill_user_index(self) -> int:
+        """Reconstrói o nó de índice a partir de todos os usuários; retorna quantos foram indexados"""
+        logger.info("Backfilling user index")
+        users = await self.get_all_users() or {}
+        index = {"emails": {}, "usernames": {}}
+        for uid, user in users.items():
+            for path, value in self._index_entries(uid, user).items():
+                _, kind, key = path.rsplit("/", 2)
+                index[kind][key] = value
+        await self._call(self._connector.multi_update, {USER_INDEX_REF: index})
+        return len(users)
+
+    async def get_all_vital_data(self):
+        logger.debug("Getting all vital data")
+        return await self._call(self._connector.get_data, USER_SENSOR_REF)
     
-    def get_user_vital_data(self, uid):
-        logger.info(f"Getting vital data for user {uid}")
-        return self._connector.get_data(f"{USER_SENSOR_REF}/{uid}")
+    async def get_vital_data_page(self, limit: int, cursor: Optional[str] = None) -> tuple[dict, Optional[str]]:
+        logger.debug("Getting vital data page (limit=%s, cursor=%s)", limit, cursor)
+        return await self._page(USER_SENSOR_REF, limit, cursor)
+
+    async def get_vital_data_ids(self, limit: int, cursor: Optional[str] = None) -> tuple[list[str], Optional[str]]:
+        logger.debug("Getting vital data ids (limit=%s, cursor=%s)", limit, cursor)
+        return await self._page_keys(USER_SENSOR_REF, limit, cursor)
+
+    def iter_vital_data(self, page_size: int) -> AsyncIterator[dict]:
+        """Todos os dados vitais, página a página, sem materializar o nó inteiro"""
+        return self._iter_pages(USER_SENSOR_REF, page_size)
+
+    async def get_user_vital_data(self, uid):
+        logger.debug("Getting vital data for user %s", uid)
+        return await self._cached_get(self._vital_cache, uid, f"{USER_SENSOR_REF}/{uid}")
     
-    def set_vital(self, uid: str, data: dict):
-        logger.info(f"Setting vital data for user {uid}")
-        return self._connector.add_data(USER_SENSOR_REF, data, uid=uid)
+    async def set_vital(self, uid: str, data: dict):
+        logger.info("Setting vital data for user %s", uid)
+        try:
+            return await self._call(self._connector.add_data, USER_SENSOR_REF, data, uid=uid)
+        finally:
+            self._vital_cache.invalidate(uid)
+
+    async def upsert_vital(self, uid: str, data: dict):
+        """Escrita cega: mescla o snapshot atual e acrescenta a leitura ao histórico, sem ler o estado atual"""
+        return await self.record_vitals(uid, [data])
+
+    async def upsert_vital_if_user_exists(self, uid: str, data: dict) -> bool:
+        """upsert_vital só para usuários existentes, sem ler antes de escrever; retorna se gravou
+
+        O RTDB não aceita pré-condição numa atualização multi-caminho. A escrita e a
+        verificação (quase sempre servida pelo cache de usuários conhecidos) correm em
+        paralelo; se o usuário não existe (token ainda válido de um usuário removido),
+        a escrita é desfeita como na remoção em cascata.
+        """
+        _, exists = await asyncio.gather(self.upsert_vital(uid, data), self.user_exists(uid))
+        if exists:
+            return True
+        logger.warning("Discarding vital data written for missing user %s", uid)
+        try:
+            await self._call(self._connector.multi_update, {
+                f"{USER_SENSOR_REF}/{uid}": None,
+                f"{USER_VITAL_HISTORY_REF}/{uid}": None,
+            })
+        finally:
+            self._vital_cache.invalidate(uid)
+        return False
+
+    async def record_vitals(self, uid: str, readings: list[dict], timestamps_ms: list[int] | None = None):
+        """Grava o snapshot mais recente e acrescenta as leituras aos buckets horários numa única escrita"""
+        if not readings:
+            return True
+        logger.debug("Recording %s vital readings for user %s", len(readings), uid)
+        now_ms = int(time.time() * 1000)
+        timestamps_ms = timestamps_ms or [now_ms] * len(readings)
+
+        updates = {
+            f"{USER_SENSOR_REF}/{uid}/{field}": value
+            for field, value in readings[-1].items() if field != "uid"
+        }
+        for reading, timestamp_ms in zip(readings, timestamps_ms):
+            entry_path = f"{USER_VITAL_HISTORY_REF}/{uid}/{bucket_key(timestamp_ms)}/{generate_push_id()}"
+            updates[entry_path] = {**{k: v for k, v in reading.items() if k != "uid"}, "ts": timestamp_ms}
+        try:
+            return await self._call(self._connector.multi_update, updates)
+        finally:
+            self._vital_cache.invalidate(uid)
+
+    async def get_vital_history(self, uid: str, start: datetime, end: datetime) -> list[dict]:
+        """Leituras entre start e end; lê apenas os buckets horários do intervalo, numa só consulta"""
+        logger.debug("Getting vital history for user %s", uid)
+        first_bucket, last_bucket = bucket_range(start, end)
+        buckets = await self._call(
+            self._connector.query_data,
+            f"{USER_VITAL_HISTORY_REF}/{uid}",
+            start_at=first_bucket,
+            end_at=last_bucket
+        )
+        return flatten_buckets(buckets or {}, to_millis(start), to_millis(end))
 
-    def update_vital(self, uid: str, data: dict):
-        logger.info(f"Updating vital data for user {uid}")
-        return self._connector.update_data(f"{USER_SENSOR_REF}/{uid}", data)
+    async def update_vital(self, uid: str, data: dict):
+        logger.info("Updating vital data for user %s", uid)
+        try:
+            return await self._call(self._connector.update_data, f"{USER_SENSOR_REF}/{uid}", data)
+        finally:
+            self._vital_cache.invalidate(uid)
     
-    def delete_vital(self, uid: str):
-        logger.info(f"Deleting vital data for user {uid}")
-        return self._connector.delete_data(f"{USER_SENSOR_REF}/{uid}")
+    async def delete_vital(self, uid: str):
+        logger.info("Deleting vital data for user %s", uid)
+        try:
+            return await self._call(self._connector.delete_data, f"{USER_SENSOR_REF}/{uid}")
+        finally:
+            self._vital_cache.invalidate(uid)
     
-    def close_connection(self):
+    async def close_connection(self):
         logger.info("Closing database connection")
-        self._connector.close_connection()
\ No newline at end of file
+        await self._call(self._connector.close_connection)
@@ -0,0 +1,80 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, List
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+class RetrainWorker:
+    """Thread em segundo plano que agrupa feedbacks e dispara um único retreino"""
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[Any]], None],
+        debounce_seconds: float,
+        max_batch: int
+    ) -> None:
+        self._apply_batch = apply_batch
+        self._debounce_seconds = debounce_seconds
+        self._max_batch = max(1, max_batch)
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="retrain-worker", daemon=True)
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def start(self) -> None:
+        if not self._thread.is_alive():
+            self._thread.start()
+            logger.info("Retrain worker started")
+
+    def submit(self, item: Any) -> None:
+        with self._idle:
+            self._pending += 1
+        self._queue.put(item)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Aguarda até que todos os feedbacks enfileirados tenham sido aplicados"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def stop(self, timeout: float | None = None) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+            logger.info("Retrain worker stopped")
+
+    def _collect(self, first: Any) -> tuple[List[Any], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self._debounce_seconds
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            # Cada novo feedback reinicia a janela de debounce
+            deadline = time.monotonic() + self._debounce_seconds
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch, stopping = self._collect(item)
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                logger.error("Error applying feedback batch of %s items: %s", len(batch), e)
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
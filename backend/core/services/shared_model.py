@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from core.ai.kernel import LinearKernel
+from core.ai.registry import ModelRegistry
+from core.config import (
+    MODEL_SHARED_DIR, MODEL_SHARED_POLL_SECONDS, MODEL_SHARED_WAIT_SECONDS, MODEL_SHARED_KEEP
+)
+from core.logger import get_logger
+from core.metrics import MODEL_INFERENCE_DURATION
+from core.profiling import ProfileStore
+from core.services.ai_service import AIService, validate_feedback
+
+try:
+    import fcntl
+except ImportError:  # Windows: o modo compartilhado depende de flock
+    fcntl = None
+
+logger = get_logger(__name__)
+
+class TrainerLock:
+    """Eleição do processo treinador: quem segura o flock do arquivo é o treinador
+
+    O lock é liberado pelo sistema quando o processo morre, e outro worker assume.
+    """
+
+    def __init__(self, path: Path) -> None:
+        if fcntl is None:
+            raise RuntimeError("MODEL_SERVING_MODE=shared requires a POSIX system (fcntl.flock)")
+        self._path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+class SharedModelStore:
+    """Versões do modelo em arquivos .npy e um ponteiro current.json trocado atomicamente
+
+    Só o treinador publica. Os workers leem o ponteiro e mapeiam o .npy da versão
+    em modo somente leitura, sem copiar os pesos.
+    """
+
+    def __init__(self, directory: Path, keep: int) -> None:
+        self._directory = directory
+        self._keep = max(1, keep)
+
+    @property
+    def pointer_path(self) -> Path:
+        return self._directory / "current.json"
+
+    def _model_path(self, version: int) -> Path:
+        return self._directory / f"model-{version:08d}.npy"
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self.pointer_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read shared model pointer: %s", e)
+            return None
+
+    def publish(self, kernel: LinearKernel, feature_order: Sequence[str], extra: Optional[dict] = None) -> int:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        current = self.current()
+        version = (current["version"] if current else 0) + 1
+
+        model_path = self._model_path(version)
+        temp_path = model_path.with_name(f".{model_path.name}.tmp")
+        with open(temp_path, "wb") as f:
+            np.save(f, kernel.to_array())
+        os.replace(temp_path, model_path)
+
+        pointer = {
+            "version": version,
+            "file": model_path.name,
+            "feature_order": list(feature_order),
+            "published_at": time.time(),
+            **(extra or {}),
+        }
+        temp_pointer = self.pointer_path.with_name(f".current.{os.getpid()}.tmp")
+        temp_pointer.write_text(json.dumps(pointer), encoding="utf-8")
+        os.replace(temp_pointer, self.pointer_path)
+        self._prune(model_path)
+        logger.info("Published shared model version %s", version)
+        return version
+
+    def load(self, pointer: Dict[str, Any]) -> LinearKernel:
+        array = np.load(self._directory / pointer["file"], mmap_mode="r")
+        return LinearKernel.from_array(array, len(pointer["feature_order"]))
+
+    def _prune(self, current: Path) -> None:
+        # Workers com uma versão antiga mapeada continuam lendo o arquivo após o unlink;
+        # a versão recém-publicada nunca é removida, qualquer que seja `keep`
+        for stale in sorted(self._directory.glob("model-*.npy"))[:-self._keep]:
+            if stale == current:
+                continue
+            try:
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+
+class FeedbackSpool:
+    """Fila de feedback (e pedidos de troca de versão) em arquivos: workers escrevem, só o treinador consome"""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    def _write(self, entry: dict) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        name = f"{time.time_ns()}-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        temp_path = self._directory / f".{name}.tmp"
+        temp_path.write_text(json.dumps(entry), encoding="utf-8")
+        os.replace(temp_path, self._directory / name)
+
+    def submit(self, features: dict, label: int) -> None:
+        self._write({"features": features, "label": label})
+
+    def request_activation(self, version: int) -> None:
+        self._write({"activate": version})
+
+    def drain(self) -> List[dict]:
+        """Lê e remove as mensagens pendentes, da mais antiga à mais nova"""
+        items = []
+        for path in sorted(self._directory.glob("[0-9]*.json")):
+            try:
+                items.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as e:
+                logger.error("Discarding unreadable feedback spool file %s: %s", path.name, e)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        return items
+
+class SharedAIService:
+    """AIService para vários workers do uvicorn com um único processo treinador
+
+    O worker que vence a eleição (TrainerLock) roda o AIService completo: é o único
+    que lê o CSV, grava o log de feedback e retreina, e publica cada modelo novo no
+    SharedModelStore. Os demais só servem predições com os pesos mapeados da versão
+    atual, recarregados por uma thread quando o ponteiro muda, e enviam feedback
+    pelo FeedbackSpool. Se o treinador morrer, o primeiro worker a obter o lock assume.
+    """
+
+    def __init__(
+        self,
+        directory: str = MODEL_SHARED_DIR,
+        profile_store: Optional[ProfileStore] = None,
+        poll_seconds: float = MODEL_SHARED_POLL_SECONDS,
+        wait_seconds: float = MODEL_SHARED_WAIT_SECONDS,
+        keep: int = MODEL_SHARED_KEEP
+    ) -> None:
+        root = Path(directory)
+        self._store = SharedModelStore(root / "models", keep)
+        self._spool = FeedbackSpool(root / "feedback-spool")
+        self._lock = TrainerLock(root / "trainer.lock")
+        self._profile_store = profile_store
+        self._poll_seconds = poll_seconds
+        self._trainer: Optional[AIService] = None
+        self._kernel: Optional[LinearKernel] = None
+        self._feature_order: List[str] = []
+        self._models: List[dict] = []
+        self._version = 0
+        self._stop = threading.Event()
+
+        if self._lock.try_acquire():
+            self._become_trainer()
+        else:
+            logger.info("Serving worker: waiting for the trainer's shared model")
+            self._wait_for_model(wait_seconds)
+
+        self._poller = threading.Thread(target=self._poll_loop, name="shared-model-poller", daemon=True)
+        self._poller.start()
+
+    @property
+    def is_trainer(self) -> bool:
+        return self._trainer is not None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def feature_order(self) -> list[str]:
+        if self._trainer is not None:
+            return self._trainer.feature_order
+        return self._feature_order
+
+    def _become_trainer(self) -> None:
+        logger.info("This worker (pid %s) is the model trainer", os.getpid())
+        self._trainer = AIService(profile_store=self._profile_store, on_model_updated=self._publish)
+
+    def _publish(self, registry: ModelRegistry) -> None:
+        # As versões do registro vão no ponteiro para os workers listarem sem falar com o treinador
+        active = registry.active
+        self._version = self._store.publish(active.model.kernel, active.model.feature_order, {
+            "model_version": active.version,
+            "models": registry.list(),
+        })
+
+    def _wait_for_model(self, wait_seconds: float) -> None:
+        deadline = time.monotonic() + wait_seconds
+        while not self._reload_if_changed():
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"No shared model published in {MODEL_SHARED_DIR} after {wait_seconds}s")
+            time.sleep(min(self._poll_seconds, 0.5))
+
+    def _reload_if_changed(self) -> bool:
+        """Mapeia a versão apontada por current.json se ela mudou; retorna se há modelo carregado"""
+        pointer = self._store.current()
+        if pointer is None:
+            return self._kernel is not None
+        if pointer["version"] != self._version:
+            try:
+                kernel = self._store.load(pointer)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load shared model version %s: %s", pointer["version"], e)
+                return self._kernel is not None
+            # Troca atômica: predições em andamento terminam com o kernel anterior
+            self._kernel, self._feature_order = kernel, list(pointer["feature_order"])
+            self._models = pointer.get("models", [])
+            self._version = pointer["version"]
+            logger.info("Loaded shared model version %s", self._version)
+        return True
+
+    def _poll_loop(self) -> None:
+        while not self._stop.wait(self._poll_seconds):
+            try:
+                if self._trainer is None:
+                    self._reload_if_changed()
+                    if self._lock.try_acquire():
+                        logger.warning("Trainer lock acquired, promoting this worker to trainer")
+                        self._become_trainer()
+                if self._trainer is not None:
+                    self._dispatch(self._spool.drain())
+            except Exception as e:
+                logger.error("Error in shared model poller: %s", e)
+
+    def _dispatch(self, entries: List[dict]) -> None:
+        for entry in entries:
+            try:
+                if "activate" in entry:
+                    self._trainer.activate_model(int(entry["activate"]))
+                else:
+                    self._trainer.set_feedback(entry["features"], int(entry["label"]))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Discarding invalid feedback spool entry: %s", e)
+
+    def _to_matrix(self, infos: Sequence[Dict[str, float]], feature_order: Sequence[str]) -> np.ndarray:
+        matrix = np.empty((len(infos), len(feature_order)), dtype=np.float64)
+        for row, info in enumerate(infos):
+            matrix[row] = [info[col] for col in feature_order]
+        return matrix
+
+    def predict(self, info: dict) -> bool:
+        if self._trainer is not None:
+            return self._trainer.predict(info)
+        kernel, feature_order = self._kernel, self._feature_order
+        with MODEL_INFERENCE_DURATION.time("predict"):
+            return kernel.predict(self._to_matrix([info], feature_order))[0]
+
+    def predict_many(self, infos: list[dict]) -> list[bool]:
+        if self._trainer is not None:
+            return self._trainer.predict_many(infos)
+        if not infos:
+            return []
+        kernel, feature_order = self._kernel, self._feature_order
+        with MODEL_INFERENCE_DURATION.time("predict_batch"):
+            results = kernel.predict(self._to_matrix(infos, feature_order))
+        return [bool(result) for result in results]
+
+    def set_feedback(self, features: dict, label: int):
+        """No treinador entra direto na fila de retreino; nos workers vai para o spool"""
+        if self._trainer is not None:
+            self._trainer.set_feedback(features, label)
+        else:
+            validate_feedback(features, label, self._feature_order)
+            self._spool.submit(features, label)
+
+    def wait_for_retrain(self, timeout: float | None = None) -> bool:
+        """Só o treinador sabe quando o retreino terminou; workers retornam imediatamente"""
+        if self._trainer is not None:
+            return self._trainer.wait_for_retrain(timeout)
+        return True
+
+    def models(self) -> list[dict]:
+        """Versões em memória no treinador; nos workers, a lista publicada junto com o modelo"""
+        if self._trainer is not None:
+            return self._trainer.models()
+        return self._models
+
+    def activate_model(self, version: int) -> dict:
+        """No treinador troca na hora; nos workers o pedido segue pelo spool e vale na próxima publicação"""
+        if self._trainer is not None:
+            return self._trainer.activate_model(version)
+        entry = next((model for model in self._models if model["version"] == version), None)
+        if entry is None:
+            raise KeyError(version)
+        self._spool.request_activation(version)
+        return {**entry, "active": False, "requested": True}
+
+    def close(self) -> None:
+        self._stop.set()
+        self._poller.join(timeout=self._poll_seconds + 1)
+        if self._trainer is not None:
+            self._trainer.close()
+        self._lock.release()
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING
+from core.ai.features import FeatureEngine
+from core.services.db_service import DBService
+from core.logger import get_logger
+
+if TYPE_CHECKING:
+    from core.services.ai_service import AIService
+
+logger = get_logger(__name__)
+
+class VitalStreamSession:
+    """Sessão de streaming de um usuário: prediz cada leitura e grava em lotes periódicos"""
+
+    def __init__(
+        self,
+        uid: str,
+        ai_service: "AIService",
+        db_service: DBService,
+        flush_interval: float,
+        max_buffer: int
+    ) -> None:
+        self._uid = uid
+        self._ai_service = ai_service
+        self._db_service = db_service
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._readings: list[dict] = []
+        self._timestamps: list[int] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self.received = 0
+
+    def start(self) -> None:
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def ingest(self, readings: list[dict], timestamps_ms: list[int | None]) -> list[bool]:
+        """Prediz as leituras recebidas e as enfileira para a próxima gravação"""
+        results = self._ai_service.predict_many(readings)
+
+        now_ms = int(time.time() * 1000)
+        self._readings.extend(readings)
+        self._timestamps.extend(ts or now_ms for ts in timestamps_ms)
+        self.received += len(readings)
+
+        if len(self._readings) >= self._max_buffer:
+            await self.flush()
+        return results
+
+    async def ingest_samples(self, engine: FeatureEngine, samples: list[dict], timestamps_ms: list[int | None]) -> list[bool]:
+        """Passa amostras brutas pelo extrator de features e prediz cada janela completa"""
+        features, feature_timestamps = [], []
+        for sample, ts in zip(samples, timestamps_ms):
+            window_features = engine.push(self._uid, sample)
+            if window_features is not None:
+                features.append({name: window_features[name] for name in engine.feature_order})
+                feature_timestamps.append(ts)
+        if not features:
+            return []
+        return await self.ingest(features, feature_timestamps)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._readings:
+                return
+            readings, timestamps = self._readings, self._timestamps
+            self._readings, self._timestamps = [], []
+            try:
+                await self._db_service.record_vitals(self._uid, readings, timestamps)
+            except Exception as e:
+                logger.error("Error flushing %s streamed readings for user %s: %s", len(readings), self._uid, e)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+import numpy as np
+
+# Campos numéricos agregados no downsampling (os mesmos de UserVitalData)
+VITAL_FIELDS = ["heart_rate", "respiration_rate", "accel_std", "spo2", "stress_level"]
+
+def to_millis(moment: datetime) -> int:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+def bucket_key(timestamp_ms: int) -> str:
+    """Chave do bucket horário (UTC) de uma leitura, ordenável lexicograficamente"""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime("%Y%m%d%H")
+
+def bucket_range(start: datetime, end: datetime) -> tuple[str, str]:
+    return bucket_key(to_millis(start)), bucket_key(to_millis(end))
+
+def flatten_buckets(buckets: Dict[str, Dict[str, Any]], start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+    """Junta as leituras dos buckets, filtradas para [start_ms, end_ms] e ordenadas por ts"""
+    readings = [
+        reading
+        for bucket in buckets.values() if isinstance(bucket, dict)
+        for reading in bucket.values()
+        if start_ms <= reading.get("ts", -1) <= end_ms
+    ]
+    readings.sort(key=lambda reading: reading["ts"])
+    return readings
+
+def downsample(readings: Iterable[Dict[str, Any]], start_ms: int, step_seconds: int) -> List[Dict[str, Any]]:
+    """Agrega as leituras em intervalos de step_seconds com min/mean/max por campo"""
+    readings = list(readings)
+    if not readings:
+        return []
+
+    step_ms = step_seconds * 1000
+    timestamps = np.fromiter((reading["ts"] for reading in readings), dtype=np.int64, count=len(readings))
+    values = np.array(
+        [[reading.get(field, np.nan) for field in VITAL_FIELDS] for reading in readings],
+        dtype=np.float64
+    )
+
+    order = np.argsort(timestamps, kind="stable")
+    timestamps, values = timestamps[order], values[order]
+    intervals = (timestamps - start_ms) // step_ms
+    interval_ids, starts, counts = np.unique(intervals, return_index=True, return_counts=True)
+
+    minimums = np.fmin.reduceat(values, starts, axis=0)
+    maximums = np.fmax.reduceat(values, starts, axis=0)
+    sums = np.add.reduceat(np.nan_to_num(values), starts, axis=0)
+    present = np.add.reduceat(~np.isnan(values), starts, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / present
+
+    points = []
+    for i, interval in enumerate(interval_ids.tolist()):
+        point: Dict[str, Any] = {
+            "start": datetime.fromtimestamp((start_ms + interval * step_ms) / 1000, tz=timezone.utc).isoformat(),
+            "count": int(counts[i]),
+        }
+        for j, field in enumerate(VITAL_FIELDS):
+            if present[i, j]:
+                point[field] = {
+                    "min": float(minimums[i, j]),
+                    "mean": float(means[i, j]),
+                    "max": float(maximums[i, j]),
+                }
+        points.append(point)
+    return points
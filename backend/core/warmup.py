@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.executors import run_io
+from core.logger import get_logger
+from core.metrics import APP_READY, APP_TIME_TO_READY, APP_WARMUP_DURATION
+
+logger = get_logger(__name__)
+
+class Warmup:
+    """Inicialização dos serviços pesados (conexão com o Firebase, modelo) com estado para /ready
+
+    Cada passo roda no pool de I/O, em paralelo com os demais, e o event loop
+    continua livre para responder enquanto isso. Os tempos são medidos a partir
+    de `boot_started` (time.perf_counter() no início do processo).
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]], boot_started: float) -> None:
+        self._steps = steps
+        self._boot_started = boot_started
+        self._task: Optional[asyncio.Task] = None
+        self.components: Dict[str, str] = {name: "pending" for name, _ in steps}
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.time_to_ready: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.time_to_ready is not None
+
+    def start(self) -> None:
+        """Dispara o warmup em segundo plano; falhas ficam registradas no status"""
+        self._task = asyncio.create_task(self.run(raise_errors=False))
+
+    async def run(self, raise_errors: bool = True) -> None:
+        results = await asyncio.gather(
+            *(self._run_step(name, step) for name, step in self._steps), return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            if raise_errors:
+                raise failures[0]
+            return
+        self.time_to_ready = time.perf_counter() - self._boot_started
+        APP_READY.set(1)
+        APP_TIME_TO_READY.set(self.time_to_ready)
+        logger.info("Application ready %.3f s after start", self.time_to_ready)
+
+    async def _run_step(self, name: str, step: Callable[[], Any]) -> None:
+        self.components[name] = "running"
+        started = time.perf_counter()
+        try:
+            await run_io(step)
+        except Exception as e:
+            self.components[name] = "failed"
+            self.errors[name] = str(e)
+            logger.error("Warmup of %s failed: %s", name, e)
+            raise
+        self.durations[name] = round(time.perf_counter() - started, 4)
+        self.components[name] = "ready"
+        APP_WARMUP_DURATION.set(self.durations[name], name)
+        logger.info("%s ready in %.3f s", name, self.durations[name])
+
+    async def cancel(self) -> None:
+        """Interrompe a espera pelo warmup no encerramento (os passos já iniciados terminam no pool)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "failed" if self.errors else "warming_up",
+            "components": dict(self.components),
+            "durations_seconds": dict(self.durations),
+            "errors": dict(self.errors),
+            "time_to_ready_seconds": round(self.time_to_ready, 4) if self.ready else None,
+            "uptime_seconds": round(time.perf_counter() - self._boot_started, 4),
+        }
@@ -1,36 +1,55 @@
+import os
+import time
+
+# Início do processo para o tempo até ficar pronto, medido antes dos imports pesados
+BOOT_STARTED = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from core.logger import get_logger
-from core.routes import users, feedback, ai, vital, auth
+from fastapi.responses import JSONResponse, PlainTextResponse
+from core.config import BOOT_MODE, METRICS_ENABLED, PROFILING_SAMPLE_RATE, PROFILING_ALLOW_HEADER
+from core.metrics import REGISTRY, MetricsMiddleware
+from core.logger import get_logger, shutdown_logging
+from core.routes import users, feedback, ai, vital, auth, admin
+from core.profiling import ProfilingMiddleware
+from core.security.auth_middleware import is_admin_token
 from contextlib import asynccontextmanager
-from core.dependencies import get_db_service, get_ai_service
+from core.dependencies import get_db_service, get_ai_service, get_profile_store, close_services
+from core.executors import shutdown_executors
+from core.warmup import Warmup
 
 logger = get_logger(__name__)
 
+warmup = Warmup([("database", get_db_service), ("model", get_ai_service)], BOOT_STARTED)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
-    global db_service, ai_service
-    
-    logger.info("Starting the application")
+    logger.info("Starting the application (%s boot)", BOOT_MODE)
 
-    try:
-        logger.info("Initializing services")
-        db_service = get_db_service()
-        ai_service = get_ai_service()
-        logger.info("All services initialized")
-    except Exception as e:
-        logger.error(f"Error initializing services: {e}")
-        raise
+    if BOOT_MODE == "lazy":
+        # A porta abre já; requisições que precisarem de um serviço aguardam o warmup dele
+        warmup.start()
+    else:
+        try:
+            logger.info("Initializing services")
+            await warmup.run()
+            logger.info("All services initialized")
+        except Exception as e:
+            logger.error("Error initializing services: %s", e)
+            raise
 
     yield
 
     logger.info("Shutting down the application...")
     try:
-        db_service.close_connection()
-        logger.info("Firebase connection closed")
+        await warmup.cancel()
+        await close_services()
+        shutdown_executors()
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
+    finally:
+        shutdown_logging()
 
 app = FastAPI(
     title='Panic Attack Detection API',
@@ -47,12 +66,25 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type"],
 )
 
+if PROFILING_SAMPLE_RATE > 0 or PROFILING_ALLOW_HEADER:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=get_profile_store(),
+        sample_rate=PROFILING_SAMPLE_RATE,
+        allow_header=PROFILING_ALLOW_HEADER,
+        is_admin_token=is_admin_token
+    )
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Incluir routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
 app.include_router(feedback.router, prefix="/feedback", tags=["Feedback"])
 app.include_router(ai.router, prefix="/ai", tags=["AI"])
 app.include_router(vital.router, prefix="/vital-data", tags=["Vital Data"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 @app.get("/", tags=["Health"])
 async def root() -> dict:
@@ -60,9 +92,20 @@ async def root() -> dict:
 
     Returns a JSON object with a single key-value pair, where the key is "status" and the value is "running".
     """
-    logger.info("Health check")
+    logger.debug("Health check")
     return {"status": "running"}
 
+@app.get("/ready", tags=["Health"])
+async def ready() -> JSONResponse:
+    """Readiness probe: 200 com banco e modelo prontos, 503 durante o warmup ou após uma falha"""
+    return JSONResponse(warmup.status(), status_code=200 if warmup.ready else 503)
+
+if METRICS_ENABLED:
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        """Métricas no formato texto do Prometheus"""
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
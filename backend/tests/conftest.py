@@ -0,0 +1,31 @@
+import sys
+import uuid
+from pathlib import Path
+import pytest
+
+# Permite rodar `pytest` de qualquer diretório: os testes importam o pacote core de backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.harness import build_app, configure_env
+
+# core.config exige as variáveis do .env; os testes usam o mesmo ambiente temporário dos benchmarks
+configure_env()
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Aplicação completa sobre o RTDB em memória; uma por sessão, pois o lifespan encerra os serviços"""
+    from fastapi.testclient import TestClient
+
+    app, connector = build_app()
+    with TestClient(app) as client:
+        yield client, connector
+
+@pytest.fixture
+def user(app_client) -> str:
+    """UID de um usuário novo gravado no RTDB em memória da sessão"""
+    from core.config import USER_PERSONAL_REF
+
+    _, connector = app_client
+    uid = f"user-{uuid.uuid4().hex[:8]}"
+    connector.tree.set(f"{USER_PERSONAL_REF}/{uid}", {"username": uid})
+    return uid
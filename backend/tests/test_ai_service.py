@@ -0,0 +1,161 @@
+"""AIService sobre arquivos temporários: retreino por feedback, versões e recarga de artefatos"""
+import time
+from pathlib import Path
+import pytest
+import core.security.auth_middleware as auth_middleware
+import core.services.ai_service as ai_service
+from core.ai.artifacts import ACTIVE_POINTER, artifact_path, data_hash, save_model
+from core.ai.data_store import TrainingDataStore
+from core.ai.model import PanicDetectionModel
+from core.security.jwt_handler import JWTHandler
+from core.services.ai_service import AIService
+from tests.test_kernel import FEATURES, synthetic_data
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    """Fábrica de AIService com dataset, log e artefatos próprios em tmp_path"""
+    services = []
+
+    def make(rows: int = 400, mode: str = "online", refit_every: int = 500, name: str = "data") -> AIService:
+        data_path = tmp_path / f"{name}.csv"
+        synthetic_data(rows).to_csv(data_path, index=False)
+        monkeypatch.setattr(ai_service, "DATA_PATH", str(data_path))
+        monkeypatch.setattr(ai_service, "FEEDBACK_LOG_PATH", str(tmp_path / f"{name}.log.jsonl"))
+        monkeypatch.setattr(ai_service, "MODEL_ARTIFACT_DIR", str(tmp_path / "artifacts"))
+        monkeypatch.setattr(ai_service, "MODEL_TRAINING_MODE", mode)
+        monkeypatch.setattr(ai_service, "ONLINE_FULL_REFIT_EVERY", refit_every)
+        monkeypatch.setattr(ai_service, "RETRAIN_DEBOUNCE_SECONDS", 0)
+        monkeypatch.setattr(ai_service, "FEEDBACK_LOG_FSYNC", False)
+        service = AIService(watch_seconds=0)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.close()
+
+def feedback_batch(size: int, seed: int) -> list[tuple[dict, int]]:
+    data = synthetic_data(rows=size, seed=seed)
+    return list(zip(data[FEATURES].to_dict("records"), data["panic_attack"].tolist()))
+
+def test_incremental_batch_does_not_touch_the_whole_dataset(make_service, monkeypatch):
+    service = make_service()
+    calls = []
+    frame = TrainingDataStore.frame
+    monkeypatch.setattr(TrainingDataStore, "frame", lambda store: calls.append("frame") or frame(store))
+    monkeypatch.setattr(ai_service, "data_hash", lambda *args: calls.append("data_hash") or "x")
+    monkeypatch.setattr(ai_service, "save_model", lambda *args: calls.append("save_model"))
+
+    service._apply_feedback_batch(feedback_batch(10, seed=1))
+
+    assert calls == []
+    active = service.models()[0]
+    assert active["source"] == "incremental"
+    assert active["rows"] == 410
+    assert "data_hash" not in active and "artifact" not in active
+
+def test_incremental_batch_cost_is_flat_in_dataset_size(make_service):
+    def median_batch_seconds(service: AIService) -> float:
+        timings = []
+        for seed in range(7):
+            batch = feedback_batch(10, seed=100 + seed)
+            started = time.perf_counter()
+            service._apply_feedback_batch(batch)
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+
+    small = median_batch_seconds(make_service(rows=1_000, name="small"))
+    large = median_batch_seconds(make_service(rows=300_000, name="large"))
+    # Com 300x mais linhas, um caminho O(dataset) (concat, hash, joblib) fica ~6x mais lento
+    assert large < 2 * small + 0.005
+
+def test_full_refit_hashes_and_saves_the_dataset(make_service):
+    service = make_service(refit_every=10)
+    service._apply_feedback_batch(feedback_batch(10, seed=1))
+    assert service.models()[0]["source"] == "incremental"
+
+    service._apply_feedback_batch(feedback_batch(5, seed=2))
+    active = service.models()[0]
+    assert active["source"] == "refit"
+    assert active["rows"] == 415
+    assert active["data_hash"] and active["artifact"]
+
+def test_full_refit_every_n_incremental_rows(make_service):
+    service = make_service(refit_every=10)
+    sources = []
+    for seed in range(5):
+        service._apply_feedback_batch(feedback_batch(4, seed=10 + seed))
+        sources.append(service.models()[0]["source"])
+    # 4, 8 e 12 linhas incrementais; o lote seguinte ao limite refaz o ajuste e zera a contagem
+    assert sources == ["incremental", "incremental", "incremental", "refit", "incremental"]
+
+def inverted_model() -> PanicDetectionModel:
+    """Modelo com os rótulos trocados: discorda do original em quase todas as leituras"""
+    data = synthetic_data()
+    data["panic_attack"] = 1 - data["panic_attack"]
+    model = PanicDetectionModel(data=data)
+    model.start_model()
+    return model
+
+SAMPLE = synthetic_data(rows=50, seed=7)[FEATURES].to_dict("records")
+
+def test_activate_model_switches_predictions_and_survives_restart(make_service):
+    service = make_service(mode="batch")
+    original = service.predict_many(SAMPLE)
+    first = service.models()[0]
+    service._install(inverted_model())
+    assert service.predict_many(SAMPLE) != original
+
+    activated = service.activate_model(first["version"])
+
+    assert activated["active"] and service.predict_many(SAMPLE) == original
+    # Os metadados da versão não mudam; a escolha fica num ponteiro ao lado dos artefatos
+    assert {**service.models()[-1], "active": False} == {**first, "active": False}
+    assert (Path(ai_service.MODEL_ARTIFACT_DIR) / ACTIVE_POINTER).exists()
+    restarted = make_service(mode="batch")
+    assert restarted.predict_many(SAMPLE) == original
+    assert restarted.models()[0]["source"] == "pinned"
+
+def test_activated_incremental_version_survives_restart(make_service):
+    service = make_service()
+    service._apply_feedback_batch(feedback_batch(10, seed=1))
+    incremental = service.predict_many(SAMPLE)
+    service._install(inverted_model())
+
+    service.activate_model(service.models()[1]["version"])
+
+    assert "artifact" not in service.models()[1]
+    assert make_service().predict_many(SAMPLE) == incremental
+
+def test_activate_unknown_version_is_404(app_client, user, monkeypatch):
+    client, _ = app_client
+    monkeypatch.setattr(auth_middleware, "ADMIN_UIDS", {user})
+    headers = {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': user})}"}
+    response = client.post("/admin/models/999999/activate", headers=headers)
+    assert response.status_code == 404
+
+def test_watcher_installs_artifact_trained_on_current_data(make_service):
+    service = make_service(mode="batch")
+    content_hash = data_hash(service._store.frame(), "batch")
+    model = inverted_model()
+    save_model(model, artifact_path(ai_service.MODEL_ARTIFACT_DIR, "offline" + content_hash), content_hash)
+
+    service._load_new_artifacts()
+
+    active = service.models()[0]
+    assert active["active"] and active["source"] == "watched"
+    assert service.predict_many(SAMPLE) == model.predict_batch(SAMPLE).astype(bool).tolist()
+
+def test_watcher_registers_artifact_for_other_data_as_inactive(make_service):
+    service = make_service(mode="batch")
+    original = service.predict_many(SAMPLE)
+    save_model(inverted_model(), artifact_path(ai_service.MODEL_ARTIFACT_DIR, "0" * 64), "0" * 64)
+
+    service._load_new_artifacts()
+
+    watched, current = service.models()[:2]
+    assert watched["source"] == "watched" and not watched["active"]
+    assert current["active"]
+    assert service.predict_many(SAMPLE) == original
+    service.activate_model(watched["version"])
+    assert service.predict_many(SAMPLE) != original
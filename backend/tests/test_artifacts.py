@@ -0,0 +1,22 @@
+"""O artefato guarda só o estado aprendido; parâmetros operacionais vêm de quem carrega"""
+from core.ai.artifacts import data_hash, artifact_path, save_model, load_model
+from core.ai.model import PanicDetectionModel
+from tests.test_kernel import FEATURES, synthetic_data
+
+def test_full_refit_every_comes_from_the_loader(tmp_path):
+    data = synthetic_data()
+    model = PanicDetectionModel(data=data, online=True, full_refit_every=500)
+    model.start_model()
+    update = synthetic_data(rows=10, seed=1)
+    model.partial_update(update[FEATURES].to_dict("records"), update["panic_attack"].tolist())
+    assert "full_refit_every" not in model.to_artifact()
+
+    content_hash = data_hash(data, "online")
+    path = artifact_path(str(tmp_path), content_hash)
+    save_model(model, path, content_hash)
+
+    # Limite reduzido na configuração atual: as 10 atualizações já exigem ajuste completo
+    loaded = load_model(path, data, content_hash, full_refit_every=10)
+    assert loaded.online
+    assert loaded.needs_full_refit
+    assert not load_model(path, data, content_hash, full_refit_every=500).needs_full_refit
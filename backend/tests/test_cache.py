@@ -0,0 +1,116 @@
+"""TTLCache (expiração, LRU, gerações) e o cache de leitura do DBService"""
+import asyncio
+import threading
+import time
+from benchmarks.rtdb_memory import MemoryRTDBConnector
+from core.cache import TTLCache, MISSING
+from core.config import USER_PERSONAL_REF, USER_SENSOR_REF
+from core.services.db_service import DBService
+
+VITALS = {"heart_rate": 80.0, "spo2": 97.0}
+
+def test_entries_expire_after_ttl():
+    cache = TTLCache(10, 0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl_seconds=10)  # limitado ao TTL do cache
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is MISSING
+    assert cache.get("b") is MISSING
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 2, "evictions": 0}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(2, 60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+def test_disabled_cache_stores_nothing():
+    for cache in (TTLCache(0, 60), TTLCache(10, 0)):
+        cache.set("a", 1)
+        assert cache.get("a") is MISSING
+
+def test_set_is_skipped_when_key_was_invalidated_since_generation():
+    cache = TTLCache(10, 60)
+    generation = cache.generation()
+    cache.invalidate("a")
+    cache.set("a", "stale", generation=generation)
+    cache.set("b", "fresh", generation=generation)
+    assert cache.get("a") is MISSING
+    assert cache.get("b") == "fresh"
+
+    cache.set("a", "fresh", generation=cache.generation())
+    assert cache.get("a") == "fresh"
+
+def test_generation_survives_clear_and_forgotten_keys():
+    cache = TTLCache(2, 60)
+    generation = cache.generation()
+    cache.clear()
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is MISSING
+
+    # Mais invalidações que max_entries: a chave esquecida conta como invalidada
+    generation = cache.generation()
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is MISSING
+
+def service_with(connector: MemoryRTDBConnector) -> DBService:
+    connector.tree.set(f"{USER_PERSONAL_REF}/u1", {"username": "u1"})
+    connector.tree.set(f"{USER_SENSOR_REF}/u1", VITALS)
+    return DBService(connector)
+
+def test_reads_are_cached_and_writes_invalidate():
+    connector = MemoryRTDBConnector()
+    service = service_with(connector)
+
+    async def scenario():
+        assert await service.get_user("u1") == {"username": "u1"}
+        assert await service.get_user("u1") == {"username": "u1"}
+        assert connector.calls == {"get_data": 1}
+
+        await service.update_user("u1", {"username": "renamed"})
+        assert (await service.get_user("u1"))["username"] == "renamed"
+
+        await service.upsert_vital("u1", {"heart_rate": 90.0})
+        assert (await service.get_user_vital_data("u1"))["heart_rate"] == 90.0
+
+        await service.delete_user("u1")
+        assert await service.get_user("u1") is None
+        assert await service.get_user_vital_data("u1") is None
+
+    asyncio.run(scenario())
+
+class GatedConnector(MemoryRTDBConnector):
+    """get_data lê a árvore e só devolve o valor (já velho) quando o teste liberar"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.read_done = threading.Event()
+        self.release = threading.Event()
+
+    def get_data(self, db_ref: str):
+        value = super().get_data(db_ref)
+        self.read_done.set()
+        self.release.wait(5)
+        return value
+
+def test_slow_read_does_not_cache_value_overwritten_during_it():
+    connector = GatedConnector()
+    service = service_with(connector)
+
+    async def scenario():
+        read = asyncio.create_task(service.get_user_vital_data("u1"))
+        await asyncio.to_thread(connector.read_done.wait, 5)
+        await service.upsert_vital("u1", {"heart_rate": 120.0})
+        connector.release.set()
+
+        assert (await read)["heart_rate"] == 80.0
+        assert (await service.get_user_vital_data("u1"))["heart_rate"] == 120.0
+
+    asyncio.run(scenario())
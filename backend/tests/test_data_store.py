@@ -0,0 +1,90 @@
+"""TrainingDataStore: reaplicação do log, entradas inválidas e compactação"""
+import json
+import pandas as pd
+import pytest
+from core.ai.artifacts import data_hash
+from core.ai.data_store import TrainingDataStore
+from tests.test_kernel import FEATURES, synthetic_data
+
+@pytest.fixture
+def paths(tmp_path):
+    snapshot, log = tmp_path / "data.csv", tmp_path / "data.log.jsonl"
+    synthetic_data(rows=20).to_csv(snapshot, index=False)
+    return str(snapshot), str(log)
+
+def open_store(paths) -> TrainingDataStore:
+    return TrainingDataStore(*paths, fsync=False)
+
+def row(seed: int) -> dict:
+    data = synthetic_data(rows=1, seed=seed)
+    return {**data[FEATURES].iloc[0].to_dict(), "panic_attack": int(data["panic_attack"].iloc[0])}
+
+def fill(store: TrainingDataStore) -> pd.DataFrame:
+    """Adições e trocas de rótulo no snapshot e nas linhas novas; retorna o estado esperado"""
+    store.append(row(1))
+    store.append(row(2))
+    store.set_label(3, 1 - int(store.frame()["panic_attack"].iloc[3]))
+    store.set_label(21, 0)
+    store.append(row(3))
+    return store.frame().copy()
+
+def test_replay_restores_appends_and_labels(paths):
+    store = open_store(paths)
+    expected = fill(store)
+    store.close()
+
+    replayed = open_store(paths)
+    assert replayed.log_entries == 5
+    pd.testing.assert_frame_equal(replayed.frame(), expected)
+    replayed.close()
+
+def test_replay_skips_invalid_entries(paths):
+    store = open_store(paths)
+    expected = fill(store)
+    store.close()
+    entries = [
+        {"op": "label", "position": 999, "label": 1},
+        {"op": "label", "position": 2, "label": 7},
+        {"op": "label", "position": -1, "label": 1},
+        {"op": "append", "position": 999, "row": row(4)},
+        {"op": "label", "label": 1},
+        {"op": "drop", "position": 0},
+        ["not", "an", "entry"],
+    ]
+    with open(paths[1], "a", encoding="utf-8") as log:
+        log.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        log.write('{"op": "append", "posit')
+
+    replayed = open_store(paths)
+    assert replayed.log_entries == 5
+    pd.testing.assert_frame_equal(replayed.frame(), expected)
+    replayed.close()
+
+def test_crash_between_snapshot_and_log_truncation(paths):
+    store = open_store(paths)
+    expected = fill(store)
+    with open(paths[1], encoding="utf-8") as log:
+        pending_log = log.read()
+    store.compact()
+    store.close()
+    # O novo snapshot já contém as linhas, mas o log não chegou a ser esvaziado
+    with open(paths[1], "w", encoding="utf-8") as log:
+        log.write(pending_log)
+
+    replayed = open_store(paths)
+    assert len(replayed) == len(expected)
+    pd.testing.assert_frame_equal(replayed.frame(), expected)
+    replayed.close()
+
+def test_compaction_preserves_data_hash(paths):
+    store = open_store(paths)
+    content_hash = data_hash(fill(store), "online")
+    store.compact()
+    assert store.log_entries == 0
+    assert data_hash(store.frame(), "online") == content_hash
+    store.close()
+
+    reopened = open_store(paths)
+    assert reopened.log_entries == 0
+    assert data_hash(reopened.frame(), "online") == content_hash
+    reopened.close()
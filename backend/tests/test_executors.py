@@ -0,0 +1,42 @@
+"""Pool de processos de CPU: recriado e a chamada repetida quando um processo morre"""
+import asyncio
+import os
+from pathlib import Path
+import pytest
+import core.executors as executors
+
+def die_once(marker: str) -> int:
+    """Mata o processo do pool na primeira chamada; nas seguintes devolve o pid"""
+    if not os.path.exists(marker):
+        Path(marker).touch()
+        os._exit(1)
+    return os.getpid()
+
+def always_die() -> None:
+    os._exit(1)
+
+@pytest.fixture
+def cpu_pool(monkeypatch):
+    """Pool de CPU próprio do teste, sem afetar o da aplicação"""
+    monkeypatch.setattr(executors, "CPU_POOL_SIZE", 1)
+    monkeypatch.setattr(executors, "_cpu_executor", None)
+    yield
+    if executors._cpu_executor is not None:
+        executors._cpu_executor.shutdown(wait=True, cancel_futures=True)
+
+def test_run_cpu_sync_recreates_a_broken_pool(cpu_pool, tmp_path):
+    assert executors.run_cpu_sync(die_once, str(tmp_path / "marker")) != os.getpid()
+    assert (tmp_path / "marker").exists()
+
+def test_run_cpu_recreates_a_broken_pool(cpu_pool, tmp_path):
+    broken = executors.get_cpu_executor()
+    pid = asyncio.run(executors.run_cpu(die_once, str(tmp_path / "marker")))
+
+    assert pid != os.getpid()
+    assert executors.get_cpu_executor() is not broken
+
+def test_retries_only_once(cpu_pool):
+    with pytest.raises(executors.BrokenProcessPool):
+        executors.run_cpu_sync(always_die)
+    # O pool quebrado pela segunda tentativa também é substituído na próxima chamada
+    assert executors.run_cpu_sync(os.getpid) != os.getpid()
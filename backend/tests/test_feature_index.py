@@ -0,0 +1,48 @@
+"""FeatureIndex deve encontrar exatamente as linhas de uma varredura com np.isclose"""
+import numpy as np
+import pytest
+from core.ai.feature_index import FeatureIndex
+
+COLUMNS = ["a", "b", "c"]
+ATOL, RTOL = 1e-4, 1e-5
+
+def brute_force(rows: np.ndarray, query: np.ndarray) -> list[int]:
+    return np.flatnonzero(np.all(np.isclose(rows, query, atol=ATOL, rtol=RTOL), axis=1)).tolist()
+
+def random_case(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Linhas espalhadas, vizinhas da consulta e exatamente na borda da tolerância"""
+    scale = rng.choice([1.0, 100.0, 1e5])
+    query = rng.uniform(-scale, scale, len(COLUMNS)).round(rng.integers(0, 6))
+    tolerance = ATOL + RTOL * np.abs(query)
+    far = rng.uniform(-scale, scale, (50, len(COLUMNS)))
+    near = query + rng.uniform(-2, 2, (50, len(COLUMNS))) * tolerance
+    edge = query + rng.choice([-1.0, 1.0], (20, len(COLUMNS))) * tolerance * rng.choice([1 - 1e-12, 1.0, 1 + 1e-12], (20, 1))
+    rows = np.vstack([far, near, edge, np.tile(query, (3, 1))])
+    return rng.permutation(rows), query
+
+def test_lookup_matches_brute_force_scan():
+    for seed in range(200):
+        rng = np.random.default_rng(seed)
+        rows, query = random_case(rng)
+        # max_cells=1 força a varredura vetorizada usada para valores grandes
+        index = FeatureIndex(COLUMNS, atol=ATOL, rtol=RTOL, max_cells=int(rng.choice([1, 4096])))
+        index.add_many(rows, range(len(rows)))
+
+        assert index.lookup(dict(zip(COLUMNS, query))) == brute_force(rows, query), f"seed {seed}"
+
+def test_rows_added_one_by_one_are_found():
+    rng = np.random.default_rng(0)
+    rows, query = random_case(rng)
+    index = FeatureIndex(COLUMNS, atol=ATOL, rtol=RTOL)
+    for position, row in enumerate(rows):
+        index.add(position, dict(zip(COLUMNS, row)))
+
+    assert len(index) == len(rows)
+    assert index.lookup(dict(zip(COLUMNS, query))) == brute_force(rows, query)
+
+def test_out_of_range_values_are_rejected():
+    index = FeatureIndex(COLUMNS)
+    for value in (np.nan, np.inf, 2e6):
+        assert not index.accepts({"a": value, "b": 0.0, "c": 0.0})
+        with pytest.raises(ValueError):
+            index.lookup({"a": value, "b": 0.0, "c": 0.0})
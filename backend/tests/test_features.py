@@ -0,0 +1,64 @@
+"""FeatureEngine: as somas correntes do ring buffer contra o cálculo direto em NumPy"""
+import numpy as np
+import pytest
+from core.ai.features import FeatureEngine
+
+MAX_ERROR = 1e-12
+
+def reference(window: dict) -> dict:
+    """Estatísticas da janela calculadas do zero"""
+    positions = np.arange(len(window["heart_rate"]), dtype=np.float64)
+
+    def slope(values: np.ndarray) -> float:
+        centered = positions - positions.mean()
+        return float(np.dot(centered, values - values.mean()) / np.dot(centered, centered))
+
+    return {
+        "heart_rate": window["heart_rate"].mean(),
+        "respiration_rate": window["respiration_rate"].mean(),
+        "accel_std": window["accel"].std(),
+        "spo2": window["spo2"].min(),
+        "stress_level": window["stress_level"].mean(),
+        "heart_rate_slope": slope(window["heart_rate"]),
+        "respiration_rate_slope": slope(window["respiration_rate"]),
+    }
+
+def stream(rows: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    # Aceleração em repouso: ~9,8 da gravidade com variações pequenas em cada eixo
+    accel_xyz = rng.normal([0.0, 0.0, 9.81], 0.05, (rows, 3))
+    return {
+        "heart_rate": rng.uniform(50, 160, rows) + np.linspace(0, 40, rows),
+        "respiration_rate": rng.uniform(10, 35, rows),
+        "accel_x": accel_xyz[:, 0],
+        "accel_y": accel_xyz[:, 1],
+        "accel_z": accel_xyz[:, 2],
+        "accel": np.linalg.norm(accel_xyz, axis=1),
+        "spo2": rng.uniform(85, 100, rows),
+        "stress_level": rng.uniform(0, 100, rows),
+    }
+
+@pytest.mark.parametrize("window", [10, 60, 257])
+def test_window_stats_match_numpy(window):
+    samples = stream(rows=20 * window + 7, seed=window)
+    engine = FeatureEngine([], window=window, min_samples=2)
+    worst = 0.0
+    keys = ["heart_rate", "respiration_rate", "accel_x", "accel_y", "accel_z", "spo2", "stress_level"]
+    for k in range(len(samples["heart_rate"])):
+        features = engine.push("user", {key: float(samples[key][k]) for key in keys})
+        if k == 0:
+            assert features is None
+            continue
+        first = max(0, k + 1 - window)
+        expected = reference({key: values[first:k + 1] for key, values in samples.items()})
+        worst = max(worst, max(abs(features[name] - value) for name, value in expected.items()))
+    assert worst <= MAX_ERROR
+
+def test_features_wait_for_min_samples_and_users_are_independent():
+    samples = stream(rows=20, seed=1)
+    engine = FeatureEngine([], window=8, min_samples=5)
+    sample = lambda k: {key: float(samples[key][k]) for key in ("heart_rate", "respiration_rate", "accel", "spo2", "stress_level")}
+    results = [engine.push("a", sample(k)) for k in range(5)]
+    assert results[:4] == [None] * 4 and results[4] is not None
+    assert engine.push("b", sample(0)) is None
+    assert len(engine) == 2
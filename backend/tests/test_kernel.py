@@ -0,0 +1,60 @@
+"""O LinearKernel fundido deve reproduzir o pipeline sklearn (StandardScaler + classificador linear)"""
+import numpy as np
+import pandas as pd
+import pytest
+from core.ai.model import PanicDetectionModel
+
+FEATURES = ["heart_rate", "respiration_rate", "accel_std", "spo2", "stress_level"]
+
+def synthetic_data(rows: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "heart_rate": rng.uniform(50, 160, rows),
+        "respiration_rate": rng.uniform(10, 35, rows),
+        "accel_std": rng.uniform(0, 3, rows),
+        "spo2": rng.uniform(85, 100, rows),
+        "stress_level": rng.uniform(0, 100, rows),
+    })
+    score = (data["heart_rate"] - 100) / 30 + (data["stress_level"] - 50) / 25 - (data["spo2"] - 93) / 4
+    data["panic_attack"] = (score + rng.normal(0, 0.5, rows) > 0).astype(int)
+    return data
+
+def assert_matches_pipeline(model: PanicDetectionModel, X: np.ndarray) -> None:
+    kernel, pipeline = model.kernel, model.pipeline
+    np.testing.assert_array_equal(kernel.predict(X), pipeline.predict(X))
+    np.testing.assert_allclose(kernel.predict_proba(X), pipeline.predict_proba(X)[:, 1], rtol=1e-9, atol=1e-12)
+
+@pytest.fixture(params=[False, True], ids=["logistic_regression", "sgd"])
+def model(request) -> PanicDetectionModel:
+    model = PanicDetectionModel(data=synthetic_data(), online=request.param)
+    model.start_model()
+    return model
+
+def test_batch_matches_pipeline(model):
+    X = synthetic_data(seed=1)[FEATURES].to_numpy(dtype=np.float64)
+    assert_matches_pipeline(model, X)
+
+def test_single_row_matches_pipeline(model):
+    X = synthetic_data(rows=20, seed=2)[FEATURES].to_numpy(dtype=np.float64)
+    for row in X:
+        assert_matches_pipeline(model, row.reshape(1, -1))
+
+def test_model_helpers_use_kernel(model):
+    data = synthetic_data(rows=50, seed=3)
+    infos = data[FEATURES].to_dict("records")
+    X = data[FEATURES].to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(model.predict_batch(infos), model.pipeline.predict(X))
+    assert model.predict_information(infos[0]) == model.pipeline.predict(X[:1])[0]
+    np.testing.assert_allclose(model.predict_proba_batch(infos), model.pipeline.predict_proba(X)[:, 1], rtol=1e-9)
+
+def test_matches_pipeline_after_partial_fit():
+    model = PanicDetectionModel(data=synthetic_data(), online=True)
+    model.start_model()
+    before = model.kernel.weights.copy()
+    update = synthetic_data(rows=30, seed=4)
+    model.partial_update(update[FEATURES].to_dict("records"), update["panic_attack"].tolist())
+
+    assert not np.array_equal(before, model.kernel.weights)
+    X = synthetic_data(seed=5)[FEATURES].to_numpy(dtype=np.float64)
+    assert_matches_pipeline(model, X)
+    assert_matches_pipeline(model, X[:1])
@@ -0,0 +1,27 @@
+"""Logging assíncrono: a fila só recebe registros enquanto o listener existe"""
+import logging
+from logging.handlers import QueueHandler
+from core import logger as core_logger
+
+def root_handlers() -> list:
+    return list(logging.getLogger().handlers)
+
+def test_shutdown_restores_a_synchronous_handler():
+    core_logger.setup_logging()
+    handler = core_logger._handler
+    assert handler in root_handlers()
+
+    core_logger.shutdown_logging()
+    try:
+        assert not any(isinstance(h, QueueHandler) for h in root_handlers())
+        assert any(type(h) is logging.StreamHandler for h in root_handlers())
+        queued = handler.queue.qsize()
+        logging.getLogger("tests.logger").warning("logged after shutdown")
+        assert handler.queue.qsize() == queued
+        core_logger.shutdown_logging()
+    finally:
+        # Os demais testes continuam com o logging assíncrono
+        core_logger.setup_logging()
+
+    assert core_logger._handler in root_handlers()
+    assert not any(type(h) is logging.StreamHandler for h in root_handlers())
@@ -0,0 +1,24 @@
+"""/metrics expõe os contadores dos caches e do logging lidos na coleta"""
+import re
+from core.security.jwt_handler import JWTHandler
+
+def sample(text: str, series: str) -> float:
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.MULTILINE)
+    assert match, f"{series} not exported"
+    return float(match.group(1))
+
+def test_cache_and_logging_counters_are_exported(app_client, user):
+    client, _ = app_client
+    headers = {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': user})}"}
+    before = client.get("/metrics").text
+
+    for _ in range(2):
+        assert client.get(f"/vital-data/{user}", headers=headers).status_code in (200, 404)
+    after = client.get("/metrics").text
+
+    assert sample(after, "auth_token_cache_hits_total") == sample(before, "auth_token_cache_hits_total") + 1
+    assert sample(after, 'db_cache_misses_total{cache="users"}') > sample(before, 'db_cache_misses_total{cache="users"}')
+    for series in ('db_cache_evictions_total{cache="vital_data"}', "log_records_dropped_total",
+                   "log_records_suppressed_total"):
+        sample(after, series)
+    assert "# TYPE db_cache_hits_total counter" in after
@@ -0,0 +1,50 @@
+"""Modo online do PanicDetectionModel: partial_fit do scaler e do SGD e limite de deriva"""
+import numpy as np
+import pytest
+from core.ai.model import PanicDetectionModel
+from tests.test_kernel import FEATURES, synthetic_data
+
+def online_model(full_refit_every: int = 500) -> PanicDetectionModel:
+    model = PanicDetectionModel(data=synthetic_data(), online=True, full_refit_every=full_refit_every)
+    model.start_model()
+    return model
+
+def update(model: PanicDetectionModel, rows: int, seed: int) -> None:
+    data = synthetic_data(rows=rows, seed=seed)
+    model.partial_update(data[FEATURES].to_dict("records"), data["panic_attack"].tolist())
+
+def test_partial_update_moves_scaler_and_weights():
+    model = online_model()
+    scaler, classifier = model.pipeline.named_steps["scaler"], model.pipeline.named_steps["classifier"]
+    mean, samples, coef = scaler.mean_.copy(), scaler.n_samples_seen_, classifier.coef_.copy()
+    weights = model.kernel.weights.copy()
+
+    update(model, rows=20, seed=1)
+
+    assert scaler.n_samples_seen_ == samples + 20
+    assert not np.array_equal(mean, scaler.mean_)
+    assert not np.array_equal(coef, classifier.coef_)
+    assert not np.array_equal(weights, model.kernel.weights)
+
+def test_copy_keeps_the_original_untouched():
+    model = online_model()
+    weights = model.kernel.weights.copy()
+    clone = model.copy()
+    update(clone, rows=20, seed=1)
+    np.testing.assert_array_equal(model.kernel.weights, weights)
+
+def test_partial_update_requires_online_mode():
+    model = PanicDetectionModel(data=synthetic_data())
+    model.start_model()
+    with pytest.raises(RuntimeError):
+        update(model, rows=5, seed=1)
+
+def test_needs_full_refit_after_threshold():
+    model = online_model(full_refit_every=25)
+    update(model, rows=10, seed=1)
+    assert not model.needs_full_refit
+    update(model, rows=15, seed=2)
+    assert model.needs_full_refit
+
+    model.start_model()
+    assert not model.needs_full_refit
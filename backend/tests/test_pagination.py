@@ -0,0 +1,102 @@
+"""Listagens paginadas por cursor e transmitidas página a página"""
+import asyncio
+import json
+import pytest
+import core.routes.users as users_routes
+import core.routes.vital as vital_routes
+from benchmarks.rtdb_memory import MemoryRTDBConnector
+from core.config import USER_PERSONAL_REF, USER_SENSOR_REF
+from core.routes.streaming import json_object_response
+from core.security.jwt_handler import JWTHandler
+from core.services.db_service import DBService
+
+def service_with_items(count: int) -> DBService:
+    connector = MemoryRTDBConnector()
+    for item in range(count):
+        connector.tree.set(f"{USER_SENSOR_REF}/user{item:03d}", {"heart_rate": float(item)})
+    return DBService(connector)
+
+@pytest.mark.parametrize("count", [0, 1, 9, 10, 25, 30])
+def test_pages_cover_every_key_once_and_end_with_no_cursor(count):
+    service = service_with_items(count)
+
+    async def walk():
+        pages, cursor = [], None
+        while True:
+            items, cursor = await service._page(USER_SENSOR_REF, 10, cursor)
+            pages.append(list(items))
+            if cursor is None:
+                return pages
+            # O cursor é a primeira chave da próxima página, ainda não entregue
+            assert cursor not in items
+
+    pages = asyncio.run(walk())
+    keys = [key for page in pages for key in page]
+    assert keys == [f"user{item:03d}" for item in range(count)]
+    assert all(len(page) == 10 for page in pages[:-1])
+    assert len(pages) == max(1, -(-count // 10))
+
+@pytest.mark.parametrize("count", [0, 10, 25])
+def test_iter_pages_skips_empty_pages(count):
+    service = service_with_items(count)
+
+    async def collect():
+        return [page async for page in service._iter_pages(USER_SENSOR_REF, 10)]
+
+    pages = asyncio.run(collect())
+    assert all(pages)
+    assert sum(len(page) for page in pages) == count
+
+def test_streamed_object_is_valid_json():
+    async def pages():
+        for page in ({"a": 1, "b": {"x": "\"quoted\""}}, {}, {"c": [1, 2]}):
+            yield page
+
+    async def body(source) -> str:
+        response = await json_object_response(source, transform=lambda value: value)
+        return b"".join([chunk async for chunk in response.body_iterator]).decode("utf-8")
+
+    async def empty():
+        return
+        yield
+
+    assert json.loads(asyncio.run(body(pages()))) == {"a": 1, "b": {"x": "\"quoted\""}, "c": [1, 2]}
+    assert json.loads(asyncio.run(body(empty()))) == {}
+
+@pytest.fixture
+def listing(app_client, user):
+    client, connector = app_client
+    for item in range(5):
+        connector.tree.set(f"{USER_SENSOR_REF}/{user}-{item}", {"heart_rate": float(item)})
+        connector.tree.set(f"{USER_PERSONAL_REF}/{user}-{item}", {"username": f"{user}-{item}", "password": "hash"})
+    headers = {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': user})}"}
+    return client, connector, headers
+
+@pytest.mark.parametrize("path, ref", [("/vital-data/", USER_SENSOR_REF), ("/users/", USER_PERSONAL_REF)])
+def test_cursor_walk_over_routes_returns_every_key(listing, path, ref):
+    client, connector, headers = listing
+    for key, params in (("items", {}), ("uids", {"shallow": "true"})):
+        seen, cursor = [], None
+        while True:
+            page = client.get(path, params={**params, "limit": 2, **({"cursor": cursor} if cursor else {})}, headers=headers).json()
+            seen.extend(page[key])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == sorted(connector.tree.get(ref))
+
+@pytest.mark.parametrize("path, ref, module", [
+    ("/vital-data/", USER_SENSOR_REF, vital_routes),
+    ("/users/", USER_PERSONAL_REF, users_routes),
+])
+def test_streamed_listing_parses_as_the_whole_node(listing, monkeypatch, path, ref, module):
+    client, connector, headers = listing
+    monkeypatch.setattr(module, "LIST_STREAM_PAGE_SIZE", 2)
+
+    response = client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    expected = connector.tree.get(ref)
+    if ref == USER_PERSONAL_REF:
+        expected = {uid: {k: v for k, v in user.items() if k != "password"} for uid, user in expected.items()}
+    assert response.json() == expected
@@ -0,0 +1,81 @@
+"""RetrainWorker: debounce dos feedbacks num único retreino e parada sem perder itens"""
+import threading
+from core.services.retrain_worker import RetrainWorker
+
+def recording_worker(debounce_seconds: float = 0.2, max_batch: int = 50, apply=None):
+    batches = []
+
+    def apply_batch(batch):
+        batches.append(list(batch))
+        if apply is not None:
+            apply(batch)
+
+    worker = RetrainWorker(apply_batch, debounce_seconds=debounce_seconds, max_batch=max_batch)
+    worker.start()
+    return worker, batches
+
+def test_rapid_feedbacks_produce_a_single_retrain():
+    worker, batches = recording_worker()
+    for item in range(20):
+        worker.submit(item)
+
+    assert worker.wait_idle(5)
+    assert batches == [list(range(20))]
+    worker.stop(5)
+
+def test_batches_are_capped_at_max_batch():
+    worker, batches = recording_worker(max_batch=8)
+    for item in range(20):
+        worker.submit(item)
+
+    assert worker.wait_idle(5)
+    assert [len(batch) for batch in batches] == [8, 8, 4]
+    assert sum(batches, []) == list(range(20))
+    worker.stop(5)
+
+def test_stop_drains_queued_feedback():
+    release = threading.Event()
+    worker, batches = recording_worker(debounce_seconds=0, apply=lambda batch: release.wait(5))
+    worker.submit(0)
+    # Chegam enquanto o primeiro retreino ainda roda; stop() vem depois deles na fila
+    for item in range(1, 6):
+        worker.submit(item)
+    release.set()
+
+    worker.stop(5)
+
+    assert not worker._thread.is_alive()
+    assert sum(batches, []) == list(range(6))
+    assert worker.wait_idle(0)
+
+def test_stop_during_debounce_applies_the_open_batch():
+    worker, batches = recording_worker(debounce_seconds=30)
+    worker.submit("a")
+    worker.submit("b")
+
+    worker.stop(5)
+
+    assert not worker._thread.is_alive()
+    assert batches == [["a", "b"]]
+
+def test_failing_batch_does_not_kill_the_worker():
+    def apply(batch):
+        if batch == ["bad"]:
+            raise RuntimeError("boom")
+
+    worker, batches = recording_worker(debounce_seconds=0, apply=apply)
+    worker.submit("bad")
+    assert worker.wait_idle(5)
+    worker.submit("good")
+
+    assert worker.wait_idle(5)
+    assert batches == [["bad"], ["good"]]
+    worker.stop(5)
+
+def test_stop_is_idempotent_and_safe_before_start():
+    worker = RetrainWorker(lambda batch: None, debounce_seconds=0, max_batch=1)
+    worker.stop(1)
+    worker.start()
+    worker.stop(5)
+    worker.stop(1)
+    assert not worker._thread.is_alive()
@@ -0,0 +1,81 @@
+"""Modo compartilhado entre processos: um treinador eleito por flock publica, os demais mapeiam"""
+import multiprocessing
+import time
+import numpy as np
+import pytest
+from core.ai.model import PanicDetectionModel
+from core.services import shared_model
+from core.services.shared_model import SharedAIService
+from tests.test_kernel import FEATURES, synthetic_data
+
+pytestmark = pytest.mark.skipif(shared_model.fcntl is None, reason="shared mode requires fcntl.flock")
+
+SAMPLE = synthetic_data(rows=50, seed=7)[FEATURES].to_dict("records")
+
+def run_trainer(directory: str, results, stop) -> None:
+    """Processo treinador: o primeiro a pegar o lock; fica de pé até o teste mandar parar"""
+    service = SharedAIService(directory=directory, poll_seconds=0.1)
+    results.put(service.is_trainer)
+    stop.wait(120)
+    service.close()
+
+def wait_until(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+def test_follower_serves_and_feeds_the_elected_trainer(tmp_path, monkeypatch):
+    data = synthetic_data()
+    data.to_csv(tmp_path / "data.csv", index=False)
+    # O processo filho (spawn) lê a configuração do ambiente herdado
+    for key, value in {
+        "DATA_PATH": str(tmp_path / "data.csv"),
+        "FEEDBACK_LOG_PATH": str(tmp_path / "feedback.log.jsonl"),
+        "MODEL_ARTIFACT_DIR": str(tmp_path / "artifacts"),
+        "MODEL_ARTIFACT_WATCH_SECONDS": "0",
+        "MODEL_TRAINING_MODE": "batch",
+        "RETRAIN_DEBOUNCE_SECONDS": "0",
+        "FEEDBACK_LOG_FSYNC": "false",
+        "CPU_POOL_SIZE": "0",
+    }.items():
+        monkeypatch.setenv(key, value)
+    directory = str(tmp_path / "shared")
+
+    context = multiprocessing.get_context("spawn")
+    results, stop = context.Queue(), context.Event()
+    trainer = context.Process(target=run_trainer, args=(directory, results, stop), daemon=True)
+    trainer.start()
+    follower = None
+    try:
+        assert results.get(timeout=120) is True
+        follower = SharedAIService(directory=directory, poll_seconds=0.1, wait_seconds=60)
+        assert not follower.is_trainer
+
+        # Pesos mapeados do .npy publicado, só leitura, iguais aos de um treino local
+        expected = PanicDetectionModel(data=data)
+        expected.start_model()
+        assert not follower._kernel.weights.flags.writeable
+        np.testing.assert_allclose(follower._kernel.weights, expected.kernel.weights, rtol=1e-9)
+        assert follower.predict_many(SAMPLE) == [bool(p) for p in expected.predict_batch(SAMPLE)]
+        assert follower.models()[0]["rows"] == len(data)
+
+        version = follower.version
+        feedback = synthetic_data(rows=1, seed=99)[FEATURES].iloc[0].to_dict()
+        follower.set_feedback(feedback, 1)
+
+        # O treinador consome o spool, retreina e publica; o follower recarrega sozinho
+        assert wait_until(lambda: follower.version > version, timeout=60)
+        assert follower.models()[0]["rows"] == len(data) + 1
+        assert not list((tmp_path / "shared" / "feedback-spool").glob("*.json"))
+    finally:
+        # O follower sai antes: com o treinador morto ele assumiria o lock
+        if follower is not None:
+            follower.close()
+        stop.set()
+        trainer.join(60)
+        if trainer.is_alive():
+            trainer.kill()
+    assert trainer.exitcode == 0
@@ -0,0 +1,102 @@
+"""WebSocket /ai/stream: autenticação, janelas de amostras brutas e frames de erro"""
+import time
+import pytest
+from jose import jwt
+from starlette.websockets import WebSocketDisconnect
+from core.config import FEATURE_MIN_SAMPLES, JWT_ALGORITHM, JWT_SECRET_KEY
+from core.security.jwt_handler import JWTHandler
+
+READING = {"heart_rate": 120.0, "respiration_rate": 25.0, "accel_std": 1.0, "spo2": 92.0, "stress_level": 80.0}
+SAMPLE = {"heart_rate": 130.0, "respiration_rate": 28.0, "spo2": 91.0, "stress_level": 90.0,
+          "accel_x": 0.1, "accel_y": 0.2, "accel_z": 1.0}
+
+@pytest.fixture
+def client(app_client):
+    return app_client[0]
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+def rejection(client, url: str = "/ai/stream", headers: dict | None = None, first: dict = READING) -> WebSocketDisconnect:
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(url, headers=headers or {}) as ws:
+            ws.send_json(first)
+            ws.receive_json()
+    return closed.value
+
+def test_rejects_unauthenticated_connections(client, user):
+    token = JWTHandler.create_access_token({"sub": user})
+    assert rejection(client).code == 1008
+    assert rejection(client, headers=bearer("not-a-jwt")).code == 1008
+    assert rejection(client, headers={"Authorization": f"Basic {token}"}).code == 1008
+    assert rejection(client, first={"token": "not-a-jwt"}).code == 1008
+    # Token na URL vazaria nos logs de acesso: não é aceito
+    assert rejection(client, url=f"/ai/stream?token={token}").code == 1008
+
+def test_rejects_token_of_unknown_user(client):
+    closed = rejection(client, headers=bearer(JWTHandler.create_access_token({"sub": "ghost"})))
+    assert (closed.code, closed.reason) == (1008, "User not found")
+
+def test_header_and_first_frame_authentication(client, user):
+    token = JWTHandler.create_access_token({"sub": user})
+    with client.websocket_connect("/ai/stream", headers=bearer(token)) as ws:
+        ws.send_json(READING)
+        assert ws.receive_json() == {"seq": 1, "panic_attack_detected": True}
+
+    with client.websocket_connect("/ai/stream") as ws:
+        ws.send_json({"token": token})
+        assert ws.receive_json() == {"authenticated": True}
+        ws.send_json({"readings": [READING, {**READING, "heart_rate": 60.0, "stress_level": 10.0}]})
+        response = ws.receive_json()
+        assert response["seq"] == 2 and len(response["panic_attack_detected"]) == 2
+
+def test_complete_window_produces_prediction(client, user):
+    with client.websocket_connect("/ai/stream", headers=bearer(JWTHandler.create_access_token({"sub": user}))) as ws:
+        for _ in range(FEATURE_MIN_SAMPLES - 1):
+            ws.send_json({"samples": [SAMPLE]})
+            assert ws.receive_json() == {"seq": 0, "panic_attack_detected": []}
+        ws.send_json({"samples": [SAMPLE]})
+        response = ws.receive_json()
+        assert response["seq"] == 1
+        assert [type(result) for result in response["panic_attack_detected"]] == [bool]
+
+@pytest.mark.parametrize("message", [
+    "{not json",
+    {"samples": 5},
+    {"readings": "x"},
+    {"heart_rate": "fast"},
+    {"samples": [{"heart_rate": 80.0}]},
+])
+def test_malformed_readings_get_error_frame(client, user, message):
+    with client.websocket_connect("/ai/stream", headers=bearer(JWTHandler.create_access_token({"sub": user}))) as ws:
+        if isinstance(message, str):
+            ws.send_text(message)
+        else:
+            ws.send_json(message)
+        assert ws.receive_json()["error"].startswith("Invalid reading")
+        # A conexão continua aberta
+        ws.send_json(READING)
+        assert ws.receive_json()["seq"] == 1
+
+def test_closes_when_token_expires(client, user):
+    exp = int(time.time()) + 2
+    token = jwt.encode({"sub": user, "exp": exp}, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    with client.websocket_connect("/ai/stream", headers=bearer(token)) as ws:
+        ws.send_json(READING)
+        assert ws.receive_json()["seq"] == 1
+        time.sleep(exp - time.time() + 0.05)
+        ws.send_json(READING)
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert (closed.value.code, closed.value.reason) == (1008, "Token expired")
+
+def test_closes_when_user_is_deleted(client, user):
+    token = JWTHandler.create_access_token({"sub": user})
+    with client.websocket_connect("/ai/stream", headers=bearer(token)) as ws:
+        ws.send_json(READING)
+        assert ws.receive_json()["seq"] == 1
+        assert client.delete(f"/users/{user}", headers=bearer(token)).status_code == 200
+        ws.send_json(READING)
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert (closed.value.code, closed.value.reason) == (1008, "User not found")
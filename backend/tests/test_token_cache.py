@@ -0,0 +1,44 @@
+"""VerifiedTokenCache: TTL, exp do token como limite e revogação por subject"""
+import time
+from core.security.token_cache import VerifiedTokenCache
+
+def test_entry_expires_after_ttl():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=0.05)
+    cache.set("token", "user", exp=time.time() + 3600)
+    assert cache.get("token") == "user"
+    time.sleep(0.06)
+    assert cache.get("token") is None
+
+def test_token_exp_caps_the_lifetime():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=3600)
+    cache.set("token", "user", exp=time.time() + 0.05)
+    assert cache.get("token") == "user"
+    time.sleep(0.06)
+    assert cache.get("token") is None
+
+def test_already_expired_token_is_not_cached():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=3600)
+    cache.set("token", "user", exp=time.time() - 1)
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+def test_invalidate_subject_drops_only_entries_cached_before_it():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=3600)
+    exp = time.time() + 3600
+    cache.set("old-token", "user", exp)
+    cache.set("other-token", "other", exp)
+
+    cache.invalidate_subject("user")
+    cache.set("new-token", "user", exp)
+
+    assert cache.get("old-token") is None
+    assert cache.get("other-token") == "other"
+    # Um login depois da revogação volta a ser aceito
+    assert cache.get("new-token") == "user"
+
+def test_tokens_are_keyed_by_digest():
+    cache = VerifiedTokenCache(max_entries=10, ttl_seconds=3600)
+    cache.set("secret-token", "user", time.time() + 3600)
+    assert "secret-token" not in cache._tokens._entries
+    cache.invalidate("secret-token")
+    assert cache.get("secret-token") is None
@@ -0,0 +1,33 @@
+"""Rotas de escrita de /vital-data: uma ida ao banco por escrita, sem ler antes"""
+import pytest
+from core.config import USER_SENSOR_REF, USER_VITAL_HISTORY_REF
+from core.security.jwt_handler import JWTHandler
+
+VITALS = {"heart_rate": 80.0, "respiration_rate": 16.0, "accel_std": 0.5, "spo2": 97.0, "stress_level": 20.0}
+
+def bearer(uid: str) -> dict:
+    return {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': uid})}"}
+
+@pytest.mark.parametrize("method", ["post", "put"])
+def test_write_is_a_single_blind_upsert(app_client, user, method):
+    client, connector = app_client
+    # A primeira escrita confere a existência no banco, em paralelo; depois o UID fica no cache
+    assert client.request(method, f"/vital-data/{user}", json=VITALS, headers=bearer(user)).status_code == 200
+    connector.reset_counters()
+
+    response = client.request(method, f"/vital-data/{user}", json=VITALS, headers=bearer(user))
+
+    assert response.status_code == 200
+    assert connector.calls == {"multi_update": 1}
+    assert connector.tree.get(f"{USER_SENSOR_REF}/{user}") == VITALS
+
+@pytest.mark.parametrize("method", ["post", "put"])
+def test_write_for_missing_user_leaves_no_orphan_data(app_client, method):
+    client, connector = app_client
+    uid = "deleted-user"
+
+    response = client.request(method, f"/vital-data/{uid}", json=VITALS, headers=bearer(uid))
+
+    assert response.status_code == 404
+    assert connector.tree.get(f"{USER_SENSOR_REF}/{uid}") is None
+    assert connector.tree.get(f"{USER_VITAL_HISTORY_REF}/{uid}") is None
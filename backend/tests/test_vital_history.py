@@ -0,0 +1,100 @@
+"""Histórico de dados vitais em buckets horários: chaves, consulta por intervalo e downsampling"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import pytest
+from benchmarks.rtdb_memory import MemoryRTDBConnector
+from core.config import USER_VITAL_HISTORY_REF, VITAL_HISTORY_MAX_RANGE_DAYS
+from core.security.jwt_handler import JWTHandler
+from core.services.db_service import DBService
+from core.services.vital_history import bucket_key, downsample, to_millis
+
+START = datetime(2024, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+def at(**delta) -> int:
+    return to_millis(START + timedelta(**delta))
+
+class RecordingConnector(MemoryRTDBConnector):
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries = []
+
+    def query_data(self, db_ref, start_at=None, end_at=None, limit_to_first=None):
+        self.queries.append((db_ref, start_at, end_at))
+        return super().query_data(db_ref, start_at=start_at, end_at=end_at, limit_to_first=limit_to_first)
+
+def test_bucket_key_is_the_utc_hour():
+    assert bucket_key(at()) == "2024030110"
+    assert bucket_key(at(minutes=59, seconds=59, milliseconds=999)) == "2024030110"
+    assert bucket_key(at(hours=1)) == "2024030111"
+    assert bucket_key(at(hours=14)) == "2024030200"
+    # Datas sem fuso são tratadas como UTC
+    assert to_millis(START.replace(tzinfo=None)) == at()
+
+def test_readings_land_in_hourly_buckets_and_range_query_reads_only_them():
+    connector = RecordingConnector()
+    service = DBService(connector)
+    offsets = [dict(minutes=-1), dict(), dict(minutes=30), dict(hours=1, minutes=5), dict(hours=2), dict(hours=2, milliseconds=1)]
+    timestamps = [at(**offset) for offset in offsets]
+
+    async def scenario():
+        await service.record_vitals("u1", [{"heart_rate": float(i)} for i in range(len(timestamps))], timestamps)
+        return await service.get_vital_history("u1", START, START + timedelta(hours=2))
+
+    readings = asyncio.run(scenario())
+
+    assert sorted(connector.tree.get(f"{USER_VITAL_HISTORY_REF}/u1")) == ["2024030109", "2024030110", "2024030111", "2024030112"]
+    assert connector.queries == [(f"{USER_VITAL_HISTORY_REF}/u1", "2024030110", "2024030112")]
+    # Limites inclusivos no milissegundo: fica de fora a leitura antes de from e a depois de to
+    assert [reading["ts"] for reading in readings] == timestamps[1:5]
+    assert [reading["heart_rate"] for reading in readings] == [1.0, 2.0, 3.0, 4.0]
+
+def test_downsample_aggregates_per_interval_from_start():
+    readings = [
+        {"ts": at(seconds=1), "heart_rate": 60.0, "spo2": 97.0},
+        {"ts": at(seconds=59), "heart_rate": 80.0},
+        {"ts": at(minutes=2, seconds=30), "heart_rate": 100.0, "spo2": 95.0},
+        {"ts": at(seconds=30), "heart_rate": 70.0},
+    ]
+
+    points = downsample(readings, at(), 60)
+
+    assert [point["start"] for point in points] == [START.isoformat(), (START + timedelta(minutes=2)).isoformat()]
+    assert [point["count"] for point in points] == [3, 1]
+    assert points[0]["heart_rate"] == {"min": 60.0, "mean": 70.0, "max": 80.0}
+    assert points[0]["spo2"] == {"min": 97.0, "mean": 97.0, "max": 97.0}
+    assert "respiration_rate" not in points[0]
+    assert points[1]["heart_rate"] == {"min": 100.0, "mean": 100.0, "max": 100.0}
+    assert downsample([], at(), 60) == []
+
+@pytest.fixture
+def history(app_client, user):
+    client, _ = app_client
+    headers = {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': user})}"}
+
+    def get(start: datetime, end: datetime, **params):
+        params = {"from": start.isoformat(), "to": end.isoformat(), **params}
+        return client.get(f"/vital-data/{user}/history", params=params, headers=headers)
+
+    return get
+
+def test_range_is_capped(history):
+    cap = timedelta(days=VITAL_HISTORY_MAX_RANGE_DAYS)
+    assert history(START, START + cap).status_code == 200
+    assert history(START, START + cap + timedelta(seconds=1)).status_code == 400
+    assert history(START, START - timedelta(seconds=1)).status_code == 400
+
+def test_route_returns_readings_or_downsampled_points(history, app_client, user):
+    client, _ = app_client
+    headers = {"Authorization": f"Bearer {JWTHandler.create_access_token({'sub': user})}"}
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for heart_rate in (70.0, 90.0):
+        vitals = {"heart_rate": heart_rate, "respiration_rate": 16.0, "accel_std": 0.5, "spo2": 97.0, "stress_level": 20.0}
+        assert client.post(f"/vital-data/{user}", json=vitals, headers=headers).status_code == 200
+    start, end = now - timedelta(minutes=1), now + timedelta(minutes=1)
+
+    readings = history(start, end).json()["readings"]
+    points = history(start, end, step=3600).json()["points"]
+
+    assert [reading["heart_rate"] for reading in readings] == [70.0, 90.0]
+    assert len(points) == 1 and points[0]["count"] == 2
+    assert points[0]["heart_rate"] == {"min": 70.0, "mean": 80.0, "max": 90.0}